@@ -30,6 +30,15 @@ if not database_exists(engine.url):
     create_database(engine.url)
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    Exclude the full-text search tables (created by hand in a migration)
+    from autogeneration.
+    """
+
+    return not (type_ == 'table' and name.startswith('transactions_fts'))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -48,6 +57,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -69,7 +79,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,39 @@
+"""
+Add Transaction balance index
+
+Revision ID: 4129a5e7696c
+Revises: 967c681dfc46
+Create Date: 2026-10-17 09:12:44.531270
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4129a5e7696c'
+down_revision: str | None = '967c681dfc46'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_index(
+        'ix_transactions_account_id_date_amount',
+        'transactions',
+        ['account_id', 'date', 'amount'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index(
+        'ix_transactions_account_id_date_amount',
+        table_name='transactions',
+    )
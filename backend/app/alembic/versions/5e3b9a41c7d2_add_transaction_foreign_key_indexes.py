@@ -0,0 +1,62 @@
+"""
+Add Transaction foreign key indexes
+
+Revision ID: 5e3b9a41c7d2
+Revises: d2f81c6a0b57
+Create Date: 2026-10-17 13:05:52.618340
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e3b9a41c7d2'
+down_revision: str | None = 'd2f81c6a0b57'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_index('ix_transactions_bill_id_date', 'transactions', ['bill_id', 'date'], unique=False)
+    op.create_index('ix_transactions_expense_id_date', 'transactions', ['expense_id', 'date'], unique=False)
+    op.create_index('ix_transactions_income_id_date', 'transactions', ['income_id', 'date'], unique=False)
+    op.create_index('ix_transactions_transfer_id_date', 'transactions', ['transfer_id', 'date'], unique=False)
+    op.create_index(op.f('ix_transactions_upload_id'), 'transactions', ['upload_id'], unique=False)
+    op.create_index(
+        op.f('ix_transaction_relationships_related_transaction_id'),
+        'transaction_relationships',
+        ['related_transaction_id'],
+        unique=False,
+    )
+
+    # Only keep the Plaid ID of the first of any duplicated Transactions
+    op.execute(sa.text(
+        'UPDATE transactions SET plaid_transaction_id = NULL '
+        'WHERE plaid_transaction_id IS NOT NULL AND id NOT IN ('
+        'SELECT MIN(id) FROM transactions '
+        'WHERE plaid_transaction_id IS NOT NULL '
+        'GROUP BY plaid_transaction_id)'
+    ))
+    op.drop_index(op.f('ix_transactions_plaid_transaction_id'), table_name='transactions')
+    op.create_index(op.f('ix_transactions_plaid_transaction_id'), 'transactions', ['plaid_transaction_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index(op.f('ix_transactions_plaid_transaction_id'), table_name='transactions')
+    op.create_index(op.f('ix_transactions_plaid_transaction_id'), 'transactions', ['plaid_transaction_id'], unique=False)
+    op.drop_index(
+        op.f('ix_transaction_relationships_related_transaction_id'),
+        table_name='transaction_relationships',
+    )
+    op.drop_index(op.f('ix_transactions_upload_id'), table_name='transactions')
+    op.drop_index('ix_transactions_transfer_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_income_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_expense_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_bill_id_date', table_name='transactions')
@@ -0,0 +1,88 @@
+"""
+Add Transaction fingerprints
+
+Revision ID: a8c4e2f07b19
+Revises: 5e3b9a41c7d2
+Create Date: 2026-10-17 14:22:10.904117
+"""
+
+from datetime import date
+from hashlib import sha1
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c4e2f07b19'
+down_revision: str | None = '5e3b9a41c7d2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _fingerprint(
+    account_id: int | None,
+    date_: date,
+    amount: float,
+    description: str,
+) -> str:
+    """Frozen copy of `get_transaction_fingerprint` at this revision."""
+
+    description = ' '.join(description.casefold().split())
+
+    return sha1(
+        f'{account_id}|{date_.isoformat()}|{round(amount * 100)}|{description}'
+            .encode()
+    ).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.add_column(
+        'transactions',
+        sa.Column('fingerprint', sa.String(), nullable=True)
+    )
+    op.create_index(op.f('ix_transactions_fingerprint'), 'transactions', ['fingerprint'], unique=False)
+
+    # Fingerprint all existing Transactions
+    transactions = sa.table(
+        'transactions',
+        sa.column('id', sa.Integer()),
+        sa.column('account_id', sa.Integer()),
+        sa.column('date', sa.Date()),
+        sa.column('amount', sa.Float()),
+        sa.column('description', sa.String()),
+        sa.column('fingerprint', sa.String()),
+    )
+    connection = op.get_bind()
+    fingerprints = [
+        {
+            'transaction_id': row.id,
+            'fingerprint': _fingerprint(
+                row.account_id, row.date, row.amount, row.description
+            ),
+        }
+        for row in connection.execute(sa.select(
+            transactions.c.id,
+            transactions.c.account_id,
+            transactions.c.date,
+            transactions.c.amount,
+            transactions.c.description,
+        ))
+    ]
+    if fingerprints:
+        connection.execute(
+            transactions.update()
+                .where(transactions.c.id == sa.bindparam('transaction_id'))
+                .values(fingerprint=sa.bindparam('fingerprint')),
+            fingerprints,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index(op.f('ix_transactions_fingerprint'), table_name='transactions')
+    op.drop_column('transactions', 'fingerprint')
@@ -0,0 +1,58 @@
+"""
+Add Jobs and Upload ingest rows
+
+Revision ID: b6d0e4f2a813
+Revises: e7a9c3b5d142
+Create Date: 2026-10-17 19:31:08.527640
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d0e4f2a813'
+down_revision: str | None = 'e7a9c3b5d142'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_table('jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('arguments', sa.JSON(), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('transaction_ids', sa.JSON(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('create_date', sa.DateTime(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_id'), 'jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_jobs_type'), 'jobs', ['type'], unique=False)
+
+    op.add_column(
+        'uploads',
+        sa.Column('ingest_rows', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    with op.batch_alter_table('uploads') as batch_op:
+        batch_op.drop_column('ingest_rows')
+
+    op.drop_index(op.f('ix_jobs_type'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_status'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_id'), table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,38 @@
+"""
+Add unique Balance dates
+
+Revision ID: c3d71f5a94e0
+Revises: a8c4e2f07b19
+Create Date: 2026-10-17 15:21:08.402917
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d71f5a94e0'
+down_revision: str | None = 'a8c4e2f07b19'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    # Only keep the latest of any Balances on the same date, which is
+    # the one the starting balance was already computed from
+    op.execute(sa.text(
+        'DELETE FROM balances WHERE id NOT IN ('
+        'SELECT MAX(id) FROM balances GROUP BY account_id, date)'
+    ))
+    op.execute(sa.text('DELETE FROM daily_balances'))
+    op.create_index('ix_balances_account_id_date', 'balances', ['account_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index('ix_balances_account_id_date', table_name='balances')
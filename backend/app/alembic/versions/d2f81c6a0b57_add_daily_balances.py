@@ -0,0 +1,37 @@
+"""
+Add DailyBalance
+
+Revision ID: d2f81c6a0b57
+Revises: 4129a5e7696c
+Create Date: 2026-10-17 10:41:08.226913
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f81c6a0b57'
+down_revision: str | None = '4129a5e7696c'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_table('daily_balances',
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('balance', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='cascade'),
+        sa.PrimaryKeyConstraint('account_id', 'date')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_table('daily_balances')
@@ -0,0 +1,114 @@
+"""
+Move Upload data to the upload store
+
+Revision ID: e7a9c3b5d142
+Revises: f4b2e6d81a37
+Create Date: 2026-10-17 18:05:47.316208
+"""
+
+from gzip import compress, decompress
+from hashlib import sha256 as sha256_hash
+from pathlib import Path
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9c3b5d142'
+down_revision: str | None = 'f4b2e6d81a37'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _get_path(sha256: str) -> Path:
+    """Frozen copy of `get_upload_path` at this revision."""
+
+    return Path(settings.UPLOAD_DIRECTORY) / sha256[:2] / f'{sha256}.gz'
+
+
+def _store(data: bytes) -> str:
+    """Frozen copy of `store_upload_data` (for bytes) at this revision."""
+
+    sha256 = sha256_hash(data).hexdigest()
+    path = _get_path(sha256)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_bytes(compress(data, mtime=0))
+        temporary.replace(path)
+
+    return sha256
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.add_column('uploads', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.add_column('uploads', sa.Column('size', sa.Integer(), nullable=True))
+    op.add_column('uploads', sa.Column('ingest_date', sa.DateTime(), nullable=True))
+
+    # Move the data of all existing Uploads to the upload store, one
+    # Upload at a time, which were all ingested when they were uploaded
+    uploads = sa.table(
+        'uploads',
+        sa.column('id', sa.Integer()),
+        sa.column('data', sa.LargeBinary()),
+        sa.column('upload_date', sa.DateTime()),
+        sa.column('sha256', sa.String()),
+        sa.column('size', sa.Integer()),
+        sa.column('ingest_date', sa.DateTime()),
+    )
+    connection = op.get_bind()
+    for upload_id in connection.scalars(sa.select(uploads.c.id)).all():
+        data = connection.scalar(
+            sa.select(uploads.c.data).where(uploads.c.id == upload_id)
+        ) or b''
+        connection.execute(
+            uploads.update()
+                .where(uploads.c.id == upload_id)
+                .values(
+                    sha256=_store(data),
+                    size=len(data),
+                    ingest_date=uploads.c.upload_date,
+                )
+        )
+
+    with op.batch_alter_table('uploads') as batch_op:
+        batch_op.alter_column('sha256', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('size', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('data')
+    op.create_index(op.f('ix_uploads_sha256'), 'uploads', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.add_column('uploads', sa.Column('data', sa.LargeBinary(), nullable=True))
+
+    # Move the data of all Uploads back from the upload store
+    uploads = sa.table(
+        'uploads',
+        sa.column('id', sa.Integer()),
+        sa.column('data', sa.LargeBinary()),
+        sa.column('sha256', sa.String()),
+    )
+    connection = op.get_bind()
+    for upload_id, sha256 in connection.execute(
+        sa.select(uploads.c.id, uploads.c.sha256)
+    ).all():
+        connection.execute(
+            uploads.update()
+                .where(uploads.c.id == upload_id)
+                .values(data=decompress(_get_path(sha256).read_bytes()))
+        )
+
+    op.drop_index(op.f('ix_uploads_sha256'), table_name='uploads')
+    with op.batch_alter_table('uploads') as batch_op:
+        batch_op.alter_column('data', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('ingest_date')
+        batch_op.drop_column('size')
+        batch_op.drop_column('sha256')
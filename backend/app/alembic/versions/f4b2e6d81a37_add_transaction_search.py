@@ -0,0 +1,76 @@
+"""
+Add Transaction full-text search
+
+Revision ID: f4b2e6d81a37
+Revises: c3d71f5a94e0
+Create Date: 2026-10-17 16:42:31.905113
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b2e6d81a37'
+down_revision: str | None = 'c3d71f5a94e0'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    # Other databases search with LIKE instead
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # External content table, so only the index itself is stored
+    op.execute(sa.text(
+        'CREATE VIRTUAL TABLE transactions_fts USING fts5('
+        'description, note, '
+        "content='transactions', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    op.execute(sa.text(
+        'CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions '
+        'BEGIN '
+        'INSERT INTO transactions_fts(rowid, description, note) '
+        'VALUES (new.id, new.description, new.note); '
+        'END'
+    ))
+    op.execute(sa.text(
+        'CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions '
+        'BEGIN '
+        'INSERT INTO transactions_fts(transactions_fts, rowid, description, note) '
+        "VALUES ('delete', old.id, old.description, old.note); "
+        'END'
+    ))
+    op.execute(sa.text(
+        'CREATE TRIGGER transactions_fts_update '
+        'AFTER UPDATE OF description, note ON transactions '
+        'BEGIN '
+        'INSERT INTO transactions_fts(transactions_fts, rowid, description, note) '
+        "VALUES ('delete', old.id, old.description, old.note); "
+        'INSERT INTO transactions_fts(rowid, description, note) '
+        'VALUES (new.id, new.description, new.note); '
+        'END'
+    ))
+
+    # Index all existing Transactions
+    op.execute(sa.text(
+        "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(sa.text('DROP TRIGGER transactions_fts_update'))
+    op.execute(sa.text('DROP TRIGGER transactions_fts_delete'))
+    op.execute(sa.text('DROP TRIGGER transactions_fts_insert'))
+    op.execute(sa.text('DROP TABLE transactions_fts'))
@@ -7,6 +7,7 @@ from .bills import bill_router
 from .cashflow import cashflow_router
 from .expenses import expense_router
 from .income import income_router
+from .jobs import job_router
 from .plaid import router as plaid_router
 from .transactions import transaction_router
 from .transfers import transfers_router
@@ -21,6 +22,7 @@ v1_router.include_router(bill_router)
 v1_router.include_router(cashflow_router)
 v1_router.include_router(expense_router)
 v1_router.include_router(income_router)
+v1_router.include_router(job_router)
 v1_router.include_router(plaid_router)
 v1_router.include_router(transaction_router)
 v1_router.include_router(transfers_router)
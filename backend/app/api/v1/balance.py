@@ -1,29 +1,33 @@
 from datetime import date
 
 from fastapi import APIRouter, Body, Depends, Query
-from sqlalchemy import or_
-from sqlalchemy.orm import load_only
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm.session import Session
 
 from app.core.auth import get_current_user
 from app.db.deps import get_database
 from app.core.balance import (
-    get_projected_balance,
-    get_starting_balance,
+    get_account_daily_balances,
+    get_daily_projected_net_worth,
+    iter_daily_balances_ndjson,
+    set_balance,
     sync_plaid_balance,
 )
-from app.core.dates import date_range
+from app.core.downsample import SampledBalances, apply_sampling, get_sampling
+from app.core.scenario import simulate_balances
 from app.db.query import require_account, require_balance
 from app.models.account import Account
 from app.models.balance import Balance
-from app.models.bill import Bill
-from app.models.income import Income
-from app.models.transfer import Transfer
 from app.models.user import User
 from app.schemas.balance import (
+    BalanceResolution,
     NewBalanceSchema,
+    NewScenarioSchema,
+    ReturnAccountDailyBalancesSchema,
     ReturnBalanceSchema,
     ReturnDailyBalanceSchema,
+    ReturnNetWorthSchema,
+    ReturnScenarioBalanceSchema,
 )
 
 
@@ -47,9 +51,8 @@ async def create_balance(
     # Verify that the associated Account exists
     require_account(db, new_balance.account_id, raise_exception=True)
 
-    # Add to the database
-    balance = Balance(**new_balance.model_dump())
-    db.add(balance)
+    # Add to the database, replacing any Balance on the same date
+    balance = set_balance(new_balance, db)
     db.commit()
 
     return balance
@@ -84,120 +87,171 @@ async def get_account_balances(
     return db.query(Balance).filter(Balance.account_id == account_id).all() # type: ignore
 
 
-@balance_router.get('/account/{account_id}/daily')
+def to_daily_balance_schemas(
+    sampled: SampledBalances,
+    resolution: BalanceResolution,
+) -> list[ReturnDailyBalanceSchema]:
+    """
+    Convert downsampled balances into schemas. The minimum and maximum
+    balances are only included when days are grouped into buckets.
+    """
+
+    if resolution == 'day':
+        return [
+            ReturnDailyBalanceSchema(date=date_, balance=balance)
+            for date_, balance in zip(
+                sampled.dates.tolist(), sampled.balances.tolist()
+            )
+        ]
+
+    return [
+        ReturnDailyBalanceSchema(
+            date=date_,
+            balance=balance,
+            min_balance=min_balance,
+            max_balance=max_balance,
+        )
+        for date_, balance, min_balance, max_balance in zip(
+            sampled.dates.tolist(),
+            sampled.balances.tolist(),
+            sampled.minimums.tolist(),
+            sampled.maximums.tolist(),
+        )
+    ]
+
+
+@balance_router.get(
+    '/account/{account_id}/daily',
+    response_model_exclude_none=True,
+)
 async def get_daily_balances(
     account_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
+    resolution: BalanceResolution = Query(default='day'),
+    max_points: int | None = Query(default=None, ge=3),
+    stream: bool = Query(default=False),
     db: Session = Depends(get_database),
 ) -> list[ReturnDailyBalanceSchema]:
     """
     Get or project daily balances for a given Account between start and end dates.
-    If a balance doesn't exist for a particular date, it will project the balance
-    using the Account's bills and the most recent known balance.
+    Balances up to today are read from the Account's Balances and
+    Transactions; later balances are projected using the Account's bills
+    and the most recent known balance.
 
     - account_id: The ID of the Account to get the balances for
     - start_date: The start date for the balance range (inclusive)
     - end_date: The end date for the balance range (inclusive)
+    - resolution: The period to group days into. For weeks and months,
+    each point is the closing balance of the period, along with the
+    minimum and maximum balance within it.
+    - max_points: The maximum number of points to return. If there are
+    more periods than this, the periods which best preserve the shape of
+    the series are returned (Largest-Triangle-Three-Buckets).
+    - stream: Whether to stream the balances as newline-delimited JSON
+    (one balance per line) rather than return a single JSON list.
     """
 
-    return [
-        ReturnDailyBalanceSchema(date=date, balance=balance)
-        for date, balance in
-        get_projected_balance(
-            account_id,
-            list(date_range(start_date, end_date)),
-            db,
-        )
-    ]
+    dates, balances = get_account_daily_balances(
+        account_id, start_date, end_date, db
+    )
+    sampled = apply_sampling(
+        get_sampling(dates, balances, resolution, max_points),
+        dates,
+        balances,
+    )
 
-    # Get all Balances for the Account up to the end date
-    balances = (
-        db.query(Balance)
-        .filter(
-            Balance.account_id == account_id,
-            Balance.date <= end_date
+    if stream:
+        return StreamingResponse( # type: ignore
+            iter_daily_balances_ndjson(
+                sampled.dates,
+                sampled.balances,
+                minimums=None if resolution == 'day' else sampled.minimums,
+                maximums=None if resolution == 'day' else sampled.maximums,
+            ),
+            media_type='application/x-ndjson',
         )
-        .order_by(Balance.date.desc())
-        .options(load_only(Balance.account_id, Balance.date, Balance.balance))
-        .all()
-    )
 
-    if not balances:
-        return []
-
-    # Get all Bills, Transfers, and Incomes for this Account
-    bills = (
-        db.query(Bill)
-            .filter(
-                Bill.account_id == account_id,
-                Bill.start_date <= end_date,
-                or_(
-                    Bill.end_date >= start_date,
-                    Bill.end_date.is_(None),
-                )
-            )
-            .all()
-    )
+    return to_daily_balance_schemas(sampled, resolution)
 
-    transfers = (
-        db.query(Transfer)
-            .filter(
-                or_(
-                    Transfer.from_account_id == account_id,
-                    Transfer.to_account_id == account_id,
-                ),
-                Transfer.start_date <= end_date,
-                (Transfer.end_date >= start_date) | (Transfer.end_date.is_(None))
-            )
-            .all()
+
+@balance_router.get('/daily', response_model_exclude_none=True)
+async def get_daily_net_worth(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    account_ids: list[int] | None = Query(default=None),
+    resolution: BalanceResolution = Query(default='day'),
+    max_points: int | None = Query(default=None, ge=3),
+    db: Session = Depends(get_database),
+) -> ReturnNetWorthSchema:
+    """
+    Get or project the daily balances of multiple Accounts between start
+    and end dates, as well as their total (net worth) on each day. Each
+    Account's balances match `/account/{account_id}/daily`; balances
+    after today are projected for all Accounts together in a single pass.
+
+    - start_date: The start date for the balance range (inclusive)
+    - end_date: The end date for the balance range (inclusive)
+    - account_ids: The IDs of the Accounts to project. If omitted, all
+    Accounts are projected.
+    - resolution: The period to group days into. For weeks and months,
+    each point is the closing balance of the period, along with the
+    minimum and maximum balance within it.
+    - max_points: The maximum number of points to return. If there are
+    more periods than this, the periods which best preserve the shape of
+    the total are returned for every Account.
+    """
+
+    dates, balances, total = get_daily_projected_net_worth(
+        account_ids, start_date, end_date, db
     )
 
-    incomes = (
-        db.query(Income)
-            .filter(
-                Income.account_id == account_id,
-                Income.start_date <= end_date,
-                (Income.end_date >= start_date) | (Income.end_date.is_(None))
+    # Sample every Account on the same dates as the total
+    sampling = get_sampling(dates, total, resolution, max_points)
+
+    return ReturnNetWorthSchema(
+        accounts=[
+            ReturnAccountDailyBalancesSchema(
+                account_id=account_id,
+                balances=to_daily_balance_schemas(
+                    apply_sampling(sampling, dates, account_balances),
+                    resolution,
+                ),
             )
-            .all()
+            for account_id, account_balances in balances.items()
+        ],
+        total=to_daily_balance_schemas(
+            apply_sampling(sampling, dates, total), resolution
+        ),
     )
 
-    # Create a dictionary of date -> Balance for quick lookup
-    balance_dict = {b.date: b for b in balances}
 
-    # Apply net Transactions to the balance between current and start date
-    current_balance, start = get_starting_balance(account_id, start_date, db)
-
-    # Now project forward from start date to end date
-    daily_balances = []
-    for date_ in date_range(start, end_date):
-        # Use actual Balance if it exists
-        if date_ in balance_dict:
-            current_balance = balance_dict[date_].balance
-            continue
+@balance_router.post('/account/{account_id}/scenario')
+def simulate_account_balances(
+    account_id: int,
+    scenario: NewScenarioSchema = Body(...),
+    db: Session = Depends(get_database),
+) -> list[ReturnScenarioBalanceSchema]:
+    """
+    Simulate many stochastic paths of the daily balances of an Account
+    by perturbing its Bills and Incomes, and get the 5th, 50th, and 95th
+    percentile balance on each day.
 
-        # Project the balance using known Bills
-        for bill in bills:
-            current_balance += bill.get_effective_amount(date_)
-            # print(f'[{date_.strftime("%Y-%m-%d")}] {bill.name} {bill.get_effective_amount(date_):+,}')
-        for income in incomes:
-            current_balance += income.get_effective_amount(date_)
-        for transfer in transfers:
-            print(f'[{date_.strftime("%Y-%m-%d")}] {transfer.name} {transfer.get_effective_amount(date_, account_id):+,}')
-            current_balance += transfer.get_effective_amount(date_, account_id)
+    - account_id: The ID of the Account to simulate the balances of.
+    - scenario: The date range, number of paths, and volatilities to
+    simulate.
+    """
 
-        if date_ >= start_date:
-            daily_balances.append(ReturnDailyBalanceSchema(
-                date=date_,
-                balance=current_balance,
-            ))
+    dates, percentiles = simulate_balances(account_id, scenario, db)
 
-    return daily_balances
+    return [
+        ReturnScenarioBalanceSchema(date=date_, p5=p5, p50=p50, p95=p95)
+        for date_, p5, p50, p95 in zip(dates.tolist(), *percentiles.tolist())
+    ]
 
 
 @balance_router.post('/account/{account_id}/sync')
-async def sync_account_plaid_balance(
+def sync_account_plaid_balance(
     account_id: int,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_database),
@@ -213,7 +267,7 @@ async def sync_account_plaid_balance(
 
 
 @balance_router.post('/accounts/sync')
-async def sync_all_plaid_balances(
+def sync_all_plaid_balances(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_database),
 ) -> list[ReturnBalanceSchema]:
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Body, Depends, Query
 from sqlalchemy import and_
 from sqlalchemy.orm.session import Session
 
+from app.core.rules import apply_transaction_rules, get_rule_key
 from app.db.deps import get_database
 from app.db.query import require_account, require_bill
 from app.models.bill import Bill
@@ -45,6 +46,9 @@ def create_bill(
     db.add(bill)
     db.commit()
 
+    # Associate unassociated Transactions by the Bill's filters
+    apply_transaction_rules(db, [bill])
+
     return bill
 
 
@@ -87,6 +91,7 @@ def update_bill(
 
     # Get the existing Bill
     bill = require_bill(db, bill_id, raise_exception=True)
+    rule = get_rule_key(bill)
 
     # Verify the source Account exists
     require_account(db, bill_update.account_id, raise_exception=True)
@@ -97,6 +102,11 @@ def update_bill(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Bill's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(bill) != rule:
+        apply_transaction_rules(db, [bill])
+
     return bill
 
 
@@ -109,6 +119,7 @@ def partially_update_bill(
 
     # Get the existing Bill
     bill = require_bill(db, bill_id, raise_exception=True)
+    rule = get_rule_key(bill)
     
     # Verify Account ID if it's being updated
     if ('account_id' in bill_update.model_fields_set
@@ -122,6 +133,11 @@ def partially_update_bill(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Bill's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(bill) != rule:
+        apply_transaction_rules(db, [bill])
+
     return bill
 
 
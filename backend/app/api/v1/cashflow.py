@@ -6,7 +6,7 @@ from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.db.deps import get_database
-from app.core.dates import get_month_start, get_month_end, date_meets_frequency
+from app.core.dates import get_month_start, get_month_end
 from app.models.account import Account
 from app.models.bill import Bill
 from app.models.expense import Expense
@@ -201,17 +201,9 @@ def get_monthly_account_snapshot(
     bill_items = []
     for bill in bills:
         # Calculate the effective budget amount for this month
-        budget_amount = 0.0
-        if bill.type == 'one_time':
-            # For one-time bills, only include if they occur in this month
-            if bill.start_date >= start_date:
-                budget_amount = bill.get_effective_amount(bill.start_date)
-        elif bill.frequency is not None:  # recurring bills
-            current_date = start_date
-            while current_date <= end_date:
-                if date_meets_frequency(current_date, bill.start_date, bill.frequency):
-                    budget_amount += bill.get_effective_amount(current_date)
-                current_date = current_date + timedelta(days=1)
+        budget_amount = sum(
+            amount for _, amount in bill.get_occurrences(start_date, end_date)
+        )
 
         if budget_amount < -0.01 or budget_amount > 0.01:
             bill_items.append(ReturnMonthlyAccountSnapshotSchema(
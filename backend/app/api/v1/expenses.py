@@ -5,6 +5,7 @@ from sqlalchemy import and_, or_
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 
+from app.core.rules import apply_transaction_rules, get_rule_key
 from app.db.deps import get_database
 from app.db.query import require_expense
 from app.models.expense import Expense
@@ -71,6 +72,9 @@ def create_expense(
     db.commit()
     db.refresh(expense)
 
+    # Associate unassociated Transactions by the Expense's filters
+    apply_transaction_rules(db, [expense])
+
     return expense
 
 
@@ -120,12 +124,18 @@ def update_expense(
     """
 
     expense = require_expense(db, expense_id)
+    rule = get_rule_key(expense)
     for key, value in updated_expense.model_dump().items():
         setattr(expense, key, value)
 
     db.commit()
     db.refresh(expense)
 
+    # Associate unassociated Transactions by the Expense's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(expense) != rule:
+        apply_transaction_rules(db, [expense])
+
     return expense
 
 
@@ -145,6 +155,7 @@ def partially_update_expense(
 
     # Update only the provided fields
     expense = require_expense(db, expense_id)
+    rule = get_rule_key(expense)
     for key, value in updated_expense.model_dump().items():
         if key in updated_expense.model_fields_set:
             setattr(expense, key, value)
@@ -152,6 +163,11 @@ def partially_update_expense(
     db.commit()
     db.refresh(expense)
 
+    # Associate unassociated Transactions by the Expense's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(expense) != rule:
+        apply_transaction_rules(db, [expense])
+
     return expense
 
 
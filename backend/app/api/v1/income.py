@@ -4,6 +4,7 @@ from fastapi import APIRouter, Body, Depends, Query
 from sqlalchemy import or_
 from sqlalchemy.orm.session import Session
 
+from app.core.rules import apply_transaction_rules, get_rule_key
 from app.db.deps import get_database
 from app.db.query import require_account, require_income
 from app.core.transactions import apply_transaction_filters
@@ -36,6 +37,9 @@ def create_income(
     db.add(income)
     db.commit()
 
+    # Associate unassociated Transactions by the Income's filters
+    apply_transaction_rules(db, [income])
+
     return income
 
 
@@ -82,6 +86,7 @@ def update_income(
 
     # Verify the income exists
     income = require_income(db, income_id, raise_exception=True)
+    rule = get_rule_key(income)
 
     # Verify the destination Account exists
     require_account(db, income_update.account_id, raise_exception=True)
@@ -92,6 +97,11 @@ def update_income(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Income's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(income) != rule:
+        apply_transaction_rules(db, [income])
+
     return income
 
 
@@ -104,6 +114,7 @@ def patch_income(
 
     # Verify the income exists
     income = require_income(db, income_id, raise_exception=True)
+    rule = get_rule_key(income)
 
     # Verify the new Account exists if it's being updated
     if ('account_id' in income_update.model_fields_set
@@ -117,6 +128,11 @@ def patch_income(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Income's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(income) != rule:
+        apply_transaction_rules(db, [income])
+
     return income
 
 
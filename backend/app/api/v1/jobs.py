@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm.session import Session
+
+from app.core.jobs import get_job_transactions
+from app.db.deps import get_database
+from app.db.query import require_job
+from app.schemas.job import ReturnJobSchema
+from app.schemas.transaction import ReturnTransactionSchema
+
+
+job_router = APIRouter(
+    prefix='/jobs',
+    tags=['Jobs'],
+)
+
+
+@job_router.get('/job/{job_id}')
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_database),
+) -> ReturnJobSchema:
+    """
+    Get the status and progress of a Job. Poll this until the status is
+    complete or failed.
+
+    - job_id: The ID of the Job to get.
+    """
+
+    return require_job(db, job_id) # type: ignore
+
+
+@job_router.get('/job/{job_id}/transactions')
+def get_job_transactions_by_id(
+    job_id: int,
+    db: Session = Depends(get_database),
+) -> list[ReturnTransactionSchema]:
+    """
+    Get the Transactions which were added by a Job.
+
+    - job_id: The ID of the Job to get the Transactions of.
+    """
+
+    return get_job_transactions(require_job(db, job_id), db) # type: ignore
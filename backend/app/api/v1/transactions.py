@@ -1,22 +1,25 @@
-from collections import defaultdict
 from datetime import date, timedelta, datetime
 from typing import Literal
 
-from app.core.upload import (
-    add_transactions_to_database,
-    remove_redundant_transactions,
-)
-from fastapi import APIRouter, Body, Depends, Query, HTTPException
+from fastapi import APIRouter, Body, Depends, Query, HTTPException, Response
 from fastapi_pagination import Page
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import and_, or_, true
-from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 
 from app.core.auth import get_current_user
+from app.core.dates import get_frequency_dates
+from app.core.jobs import submit_job
 from app.db.deps import get_database
-from app.core.dates import date_range
-from app.core.transactions import apply_transaction_filters
+from app.core.projection import ProjectionContext
+from app.core.rules import apply_transaction_rules
+from app.core.transactions import (
+    apply_transaction_filters,
+    get_bill_breakdown,
+    get_transaction_loader_options,
+    paginate_transactions_by_cursor,
+    query_transactions,
+)
 from app.db.query import (
     require_account,
     require_bill,
@@ -33,17 +36,20 @@ from app.models.transfer import Transfer
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.core import TransactionFilter
+from app.schemas.job import ReturnJobSchema
 from app.schemas.transaction import (
     NewSplitTransactionSchema,
     NewTransactionSchema,
+    ReturnTransactionCursorPageSchema,
     ReturnTransactionSchema,
     ReturnTransactionSchemaNoAccount,
     ReturnUpcomingTransactionSchema,
     UpdateTransactionSchema,
+    BillBreakdownMatrixResponse,
     BillBreakdownResponse,
-    BillBreakdownItem
+    BillBreakdownItem,
+    BillBreakdownSeries,
 )
-from app.services.plaid import PlaidService
 from app.utils.logging import log
 
 
@@ -58,45 +64,67 @@ async def get_transactions(
     account_ids: list[int] | None = Query(default=None),
     contains: str | None = Query(default=None),
     unassigned_only: bool = Query(default=False),
+    rank: bool = Query(default=False),
     db: Session = Depends(get_database),
 ) -> Page[ReturnTransactionSchema]:
     """
     Get all Transactions which match the provided filters.
 
     - account_ids: Optional Account IDs to filter by.
-    - contains: Optional string to filter by in the Transaction's
-    description or note.
+    - contains: Optional string to search for in the Transaction's
+    description or note. Matches words starting with each of its words.
     - unassigned_only: Whether to only include Transactions which are not
     associated with an Bill or Income.
+    - rank: Whether to order searched Transactions by relevance first.
     """ 
 
-    filters = []
-    if account_ids is not None:
-        filters.append(Transaction.account_id.in_(account_ids))
-    if contains is not None:
-        filters.append(or_(
-            Transaction.description.contains(contains),
-            Transaction.note.contains(contains),
-        ))
-    if unassigned_only:
-        filters.append(and_(
-            Transaction.bill_id.is_(None),
-            Transaction.expense_id.is_(None),
-            Transaction.income_id.is_(None),
-            Transaction.transfer_id.is_(None),
-        ))
-
     return paginate(
-        db.query(Transaction)
-            .filter(and_(*filters))
+        query_transactions(
+            account_ids, contains, unassigned_only, db, rank=rank
+        )
             .order_by(Transaction.date.desc())
-            .options(
-                joinedload(Transaction.account),
-                joinedload(Transaction.bill),
-                joinedload(Transaction.income),
-            )
+            .options(*get_transaction_loader_options())
+    )
+
+
+@transaction_router.get('/all/cursor')
+async def get_transactions_by_cursor(
+    account_ids: list[int] | None = Query(default=None),
+    contains: str | None = Query(default=None),
+    unassigned_only: bool = Query(default=False),
+    cursor: str | None = Query(default=None),
+    size: int = Query(default=50, ge=1, le=100),
+    include_total: bool = Query(default=False),
+    db: Session = Depends(get_database),
+) -> ReturnTransactionCursorPageSchema:
+    """
+    Get a page of the Transactions which match the provided filters,
+    newest first. Each page is as fast to get as the first, so this is
+    suited to infinite scrolling.
+
+    - account_ids: Optional Account IDs to filter by.
+    - contains: Optional string to search for in the Transaction's
+    description or note. Matches words starting with each of its words.
+    - unassigned_only: Whether to only include Transactions which are not
+    associated with an Bill or Income.
+    - cursor: The next_cursor of the previous page, or None for the first.
+    - size: The maximum number of Transactions in the page.
+    - include_total: Whether to count the total number of Transactions.
+    """
+
+    transactions, next_cursor, total = paginate_transactions_by_cursor(
+        query_transactions(account_ids, contains, unassigned_only, db),
+        cursor,
+        size,
+        include_total=include_total,
     )
 
+    return {
+        'items': transactions,
+        'next_cursor': next_cursor,
+        'total': total,
+    } # type: ignore
+
 
 @transaction_router.put('/filters')
 async def query_transactions_from_filters(
@@ -132,18 +160,28 @@ async def query_transactions_from_filters(
             include_currently_selected=True,
         )
         .order_by(Transaction.date.desc())
+        .options(*get_transaction_loader_options())
         .all()
     ) # type: ignore
 
 
 @transaction_router.post('/filters')
-async def apply_all_transaction_filters(
+def apply_all_transaction_filters(
+    mode: Literal['rules', 'sql'] = Query('rules'),
     db: Session = Depends(get_database),
 ) -> None:
     """
     Apply all Transaction filters to all Transactions in the database.
+
+    - mode: Whether to match all filters at once in a single pass over
+    the Transactions, or to run an UPDATE per Bill, Expense, Income, and
+    Transfer.
     """
 
+    if mode == 'rules':
+        apply_transaction_rules(db)
+        return None
+
     for model, field in [
         (Bill, Transaction.bill_id),
         (Expense, Transaction.expense_id),
@@ -377,9 +415,9 @@ async def get_upcoming_account_transactions(
     )
 
     upcoming_bills = []
-    for date_ in date_range(start, end):
-        for bill in bills:
-            if (amount := bill.get_effective_amount(date_)) != 0.0:
+    for bill in bills:
+        for date_, amount in bill.get_occurrences(start, end):
+            if amount != 0.0:
                 upcoming_bills.append(
                     ReturnUpcomingTransactionSchema(
                         name=bill.name,
@@ -388,8 +426,9 @@ async def get_upcoming_account_transactions(
                         bill_id=bill.id,
                     )
                 )
-        for income in incomes:
-            if (amount := income.get_effective_amount(date_)) != 0.0:
+    for income in incomes:
+        for date_, amount in income.get_occurrences(start, end):
+            if amount != 0.0:
                 upcoming_bills.append(
                     ReturnUpcomingTransactionSchema(
                         name=income.name,
@@ -398,8 +437,12 @@ async def get_upcoming_account_transactions(
                         income_id=income.id,
                     )
                 )
-        for transfer in transfers:
-            if (amount := transfer.get_effective_amount(date_, account_id)):
+    context = ProjectionContext()
+    for transfer in transfers:
+        for date_, amount in transfer.get_occurrences(
+            start, end, account_id, context
+        ):
+            if amount:
                 amount *= -1 if account_id == transfer.from_account_id else 1
                 upcoming_bills.append(
                     ReturnUpcomingTransactionSchema(
@@ -410,6 +453,10 @@ async def get_upcoming_account_transactions(
                     )
                 )
 
+    # Sort chronologically; the sort is stable so same-day Bills still
+    # come before Incomes and Transfers
+    upcoming_bills.sort(key=lambda upcoming: upcoming.date)
+
     return upcoming_bills
 
 
@@ -424,6 +471,7 @@ async def get_bill_transactions(
         db.query(Transaction)
             .filter(Transaction.bill_id == bill_id)
             .order_by(Transaction.date.desc())
+            .options(*get_transaction_loader_options(account=False))
             .all()
     ) # type: ignore
 
@@ -439,6 +487,7 @@ async def get_expense_transactions(
         db.query(Transaction)
             .filter(Transaction.expense_id == expense_id)
             .order_by(Transaction.date.desc())
+            .options(*get_transaction_loader_options(account=False))
             .all()
     ) # type: ignore
 
@@ -454,6 +503,7 @@ async def get_income_transactions(
         db.query(Transaction)
             .filter(Transaction.income_id == income_id)
             .order_by(Transaction.date.desc())
+            .options(*get_transaction_loader_options(account=False))
             .all()
     ) # type: ignore
 
@@ -473,108 +523,74 @@ async def get_account_bill_breakdown(
     - end_date: The end date of the period to analyze
     """
 
-    # Ignore Transfers to Credit Accounts if getting all Acount details
-    ignore_transfer_ids: list[int] = []
-    if account_id == 'all':
-        ignore_transfer_ids = [
-            transfer.id
-            for transfer in
-            db.query(Transfer)
-                .filter(Transfer.to_account_id.in_([
-                    account.id
-                    for account in
-                    db.query(Account).filter(Account.type == 'credit').all()
-                ]))
-                .all()
-        ]
+    breakdown = [
+        BillBreakdownItem(
+            bill_name=name,
+            total_amount=total,
+            transaction_count=count,
+        )
+        for _, name, total, count in get_bill_breakdown(
+            account_id, start_date, end_date, db
+        )
+    ]
 
-    # Get all transactions for the account in the date range
-    transactions = (
-        db.query(Transaction)
-            .filter(
-                (
-                    true()
-                    if account_id == 'all'
-                    else Transaction.account_id == account_id
-                ),
-                Transaction.date >= start_date,
-                Transaction.date <= end_date,
-                Transaction.amount < 0, # Only include Bills
-                or_(
-                    Transaction.transfer_id.is_(None),
-                    Transaction.transfer_id.not_in(ignore_transfer_ids),
-                )
-            )
-            .options(
-                joinedload(Transaction.bill),
-                joinedload(Transaction.expense),
-            )
-            .all()
+    return BillBreakdownResponse(
+        total_bill=sum(item.total_amount for item in breakdown),
+        breakdown=breakdown
     )
 
-    transfers = {
-        transaction.id: require_transfer(
-            db, transaction.transfer_id
-        ).to_account.name
-        for transaction in db.query(Transaction).filter(
-            Transaction.transfer_id.in_([
-                transfer.id
-                for transfer in db.query(Transfer).filter(
-                    (
-                        true()
-                        if account_id == 'all'
-                        else Transfer.from_account_id == account_id
-                    ),
-                    Transfer.start_date <= end_date,
-                    or_(
-                        Transfer.end_date.is_(None),
-                        Transfer.end_date >= start_date,
-                    ),
-                ).all()
-            ]),
-            (
-                true()
-                if account_id == 'all'
-                else Transaction.account_id == account_id
-            ),
-            Transaction.date >= start_date,
-            Transaction.date <= end_date,
-        ).all()
-        if transaction.transfer_id is not None
-    }
-
-    # Group Transactions by Bill/Expense/Transfer name and calculate totals
-    bill_totals = defaultdict(lambda: {'total': 0.0, 'count': 0})
-    for transaction in transactions:
-        bill_name = 'Uncategorized'
-        if transaction.bill:
-            bill_name = transaction.bill.name
-        elif transaction.expense:
-            bill_name = transaction.expense.name
-        elif transaction.id in transfers:
-            bill_name = f'Transfer to {transfers[transaction.id]}'
-        else:
-            print(f'{transaction.date} "{transaction.description}" is not a bill, expense, or transfer')
-            print(f'  {transaction.transfer_id=} {ignore_transfer_ids}')
-        bill_totals[bill_name]['total'] += abs(transaction.amount)
-        bill_totals[bill_name]['count'] += 1
-
-    # Convert to response format
-    breakdown = sorted(
-        [
-            BillBreakdownItem(
+
+@transaction_router.get('/account/{account_id}/bill-breakdown/monthly')
+async def get_account_monthly_bill_breakdown(
+    account_id: int | Literal['all'],
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(get_database),
+) -> BillBreakdownMatrixResponse:
+    """
+    Get a breakdown of bills for an account for every month within a
+    date range. Each month is the same as the breakdown of that month
+    (clipped to the date range).
+
+    - account_id: The ID of the account to get bill breakdown for
+    - start_date: The start date of the period to analyze
+    - end_date: The end date of the period to analyze
+    """
+
+    months = [
+        month.strftime('%Y-%m')
+        for month in get_frequency_dates(
+            start_date.replace(day=1),
+            {'value': 1, 'unit': 'months'},
+            start_date.replace(day=1),
+            end_date,
+        )
+    ]
+    columns = {month: index for index, month in enumerate(months)}
+
+    # Each row is the totals of one name in every month
+    rows: dict[str, BillBreakdownSeries] = {}
+    for month, name, total, count in get_bill_breakdown(
+        account_id, start_date, end_date, db, monthly=True
+    ):
+        if name not in rows:
+            rows[name] = BillBreakdownSeries(
                 bill_name=name,
-                total_amount=data['total'],
-                transaction_count=data['count'] # type: ignore
+                total_amounts=[0.0] * len(months),
+                transaction_counts=[0] * len(months),
             )
-            for name, data in bill_totals.items()
+        rows[name].total_amounts[columns[month]] = total
+        rows[name].transaction_counts[columns[month]] = count
+
+    return BillBreakdownMatrixResponse(
+        months=months,
+        total_bills=[
+            sum(row.total_amounts[index] for row in rows.values())
+            for index in range(len(months))
         ],
-        key=lambda x: x.total_amount, reverse=True
-    )
-
-    return BillBreakdownResponse(
-        total_bill=sum(item.total_amount for item in breakdown),
-        breakdown=breakdown
+        breakdown=sorted(
+            rows.values(), key=lambda row: sum(row.total_amounts), reverse=True
+        ),
     )
 
 
@@ -589,6 +605,7 @@ async def get_transfer_transactions(
         db.query(Transaction)
             .filter(Transaction.transfer_id == transfer_id)
             .order_by(Transaction.date.desc())
+            .options(*get_transaction_loader_options(account=False))
             .all()
     ) # type: ignore
 
@@ -629,16 +646,17 @@ async def split_transaction(
     return new_transactions # type: ignore
 
 
-@transaction_router.post('/account/{account_id}/sync')
-async def sync_account_transactions(
+@transaction_router.post('/account/{account_id}/sync', status_code=202)
+def sync_account_transactions(
     account_id: int,
     start_date: datetime | None = Query(default=None),
     end_date: datetime | None = Query(default=None),
     db: Session = Depends(get_database),
     user: User = Depends(get_current_user),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Sync all Transactions from Plaid for a given Account..
+    Sync all Transactions from Plaid for a given Account. The
+    Transactions are synced in the background by the returned Job.
 
     - account_id: The ID of the Account to sync transactions for.
     - start_date: The start date of the time period to sync transactions
@@ -663,57 +681,33 @@ async def sync_account_transactions(
             detail='Plaid item does not belong to the current User'
         )
 
-    # Create new transactions in our database; remove redundant ones
-    plaid_service = PlaidService()
-    new_transactions = remove_redundant_transactions(
-        [
-            NewTransactionSchema(
-                account_id=account_id,
-                date=transaction['date'],
-                description=transaction['name'],
-                amount=transaction['amount'],
-                plaid_transaction_id=transaction['id']
-            )
-            for transaction in plaid_service.get_transactions(
-                access_token=plaid_item.access_token,
-                account_ids=[account.plaid_account_id],
-                start_date=start_date or plaid_item.last_refresh,
-                end_date=end_date,
-            )
-        ],
-        db
+    return submit_job( # type: ignore
+        'plaid_sync',
+        {
+            'account_ids': [account_id],
+            'start_date': start_date and start_date.isoformat(),
+            'end_date': end_date and end_date.isoformat(),
+        },
+        db,
     )
 
-    # Add the new Transactions to the database
-    transactions = add_transactions_to_database(new_transactions, db)
-
-    # Update last refresh time to the most recent Transaction date
-    if account.most_recent_transaction is None:
-        plaid_item.last_refresh = datetime.now()
-    else:
-        plaid_item.last_refresh = datetime.combine(
-            account.most_recent_transaction.date, datetime.min.time()
-        )
-    db.commit()
-
-    return transactions # type: ignore
 
-
-@transaction_router.post('/sync')
-async def sync_all_account_transactions(
+@transaction_router.post('/sync', status_code=202)
+def sync_all_account_transactions(
     start_date: datetime | None = Query(default=None),
     db: Session = Depends(get_database),
     user: User = Depends(get_current_user),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Sync all transactions for all accounts.
+    Sync all transactions for all accounts. The Transactions are synced
+    in the background by the returned Job. If no Accounts are linked to
+    Plaid, no Job is created and the response is empty (204).
 
     - start_date: The start date of the time period to sync transactions
     for. If not provided, the date of the last sync will be used.
     """
 
-    plaid_service = PlaidService()
-    transactions: list[ReturnTransactionSchema] = []
+    account_ids = []
     for account in db.query(Account).all():
         # Skip this Account if it not linked to Plaid
         if ((plaid_item := account.plaid_item) is None
@@ -724,43 +718,17 @@ async def sync_all_account_transactions(
             )
             continue
 
-        # Create new Transactions in the database; remove redundant ones
-        log.debug(
-            f'Syncing Transactions from '
-            f'{start_date or plaid_item.last_refresh} to today'
-        )
-        new_transactions = remove_redundant_transactions(
-            [
-                NewTransactionSchema(
-                    account_id=account.id,
-                    date=transaction['date'],
-                    description=transaction['name'],
-                    amount=transaction['amount'],
-                    plaid_transaction_id=transaction['id']
-                )
-                for transaction in plaid_service.get_transactions(
-                    access_token=plaid_item.access_token,
-                    account_ids=[account.plaid_account_id],
-                    start_date=start_date or plaid_item.last_refresh,
-                )
-            ],
-            db
-        )
-        log.debug(
-            f'Synced {len(new_transactions)} transactions for account {account.id}'
-        )
+        account_ids.append(account.id)
 
-        # Add the new Transactions to the database
-        transactions.extend(add_transactions_to_database(new_transactions, db))
+    if not account_ids:
+        return Response(status_code=204) # type: ignore
 
-        # Update last refresh time to the most recent Transaction date
-        if account.most_recent_transaction is None:
-            plaid_item.last_refresh = datetime.now()
-        else:
-            plaid_item.last_refresh = datetime.combine(
-                account.most_recent_transaction.date, datetime.min.time()
-            )
-
-        db.commit()
-
-    return transactions # type: ignore
+    return submit_job( # type: ignore
+        'plaid_sync',
+        {
+            'account_ids': account_ids,
+            'start_date': start_date and start_date.isoformat(),
+            'end_date': None,
+        },
+        db,
+    )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 
+from app.core.rules import apply_transaction_rules, get_rule_key
 from app.db.deps import get_database
 from app.db.query import require_account, require_transfer
 from app.models.transfer import Transfer
@@ -64,6 +65,9 @@ def create_new_transfer(
     db.add(transfer)
     db.commit()
 
+    # Associate unassociated Transactions by the Transfer's filters
+    apply_transaction_rules(db, [transfer])
+
     return transfer
 
 
@@ -95,6 +99,7 @@ def update_transfer(
     """
 
     transfer = require_transfer(db, transfer_id)
+    rule = get_rule_key(transfer)
 
     for key, value in update_transfer.model_dump().items():
         if key != 'related_transaction_ids':
@@ -102,6 +107,11 @@ def update_transfer(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Transfer's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(transfer) != rule:
+        apply_transaction_rules(db, [transfer])
+
     return transfer
 
 
@@ -120,6 +130,7 @@ def patch_transfer(
 
     # Get the existing Transfer
     transfer = require_transfer(db, transfer_id)
+    rule = get_rule_key(transfer)
     
     # Verify IDs if they're being updated
     if 'from_account_id' in update_transfer.model_fields_set:
@@ -134,6 +145,11 @@ def patch_transfer(
 
     db.commit()
 
+    # Associate unassociated Transactions by the Transfer's filters, only if
+    # its filters, Account, or dates changed
+    if get_rule_key(transfer) != rule:
+        apply_transaction_rules(db, [transfer])
+
     return transfer
 
 
@@ -1,22 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from fastapi.datastructures import UploadFile
 from sqlalchemy.orm.session import Session
 
 from app.db.deps import get_database
-from app.core.upload import (
-    add_balances_to_database,
-    add_transactions_to_database,
-    create_upload,
-    parse_generic_upload,
-)
-from app.schemas.transaction import ReturnTransactionSchema
-from app.services.apple import parse_apple_upload
-from app.services.capital_one import parse_capital_one_upload
-from app.services.chase import parse_chase_upload
-from app.services.citi import parse_citi_upload
-from app.services.iccu import parse_iccu_upload
-from app.services.vanguard import parse_vanguard_upload
-from app.utils.logging import log
+from app.core.jobs import submit_job
+from app.core.upload import create_upload
+from app.schemas.job import ReturnJobSchema
 
 
 upload_router = APIRouter(
@@ -25,180 +14,153 @@ upload_router = APIRouter(
 )
 
 
-@upload_router.post('/new/generic')
+def _submit_upload_job(
+    parser: str,
+    files: list[UploadFile],
+    account_id: int,
+    db: Session,
+) -> ReturnJobSchema:
+    """
+    Store each file as an Upload, and submit a Job to parse and add the
+    Transactions of those which were not already ingested. If every file
+    was already ingested, no Job is created and the response is empty
+    (204).
+    """
+
+    upload_ids = []
+    for file in files:
+        upload = create_upload(file, account_id, db)
+        if upload.ingest_date is None:
+            upload_ids.append(upload.id)
+
+    if not upload_ids:
+        return Response(status_code=204) # type: ignore
+
+    return submit_job( # type: ignore
+        'upload', {'parser': parser, 'upload_ids': upload_ids}, db
+    )
+
+
+@upload_router.post('/new/generic', status_code=202)
 def upload_generic_transactions(
     file: UploadFile,
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
     Upload a generic Transaction file. This needs to be a CSV file with
-    the format as:
-
-    date, description, note, amount, expense_id, income_id
+    the format as: date, description, note, amount, expense_id,
+    income_id The file is parsed in the background by the returned Job,
+    and is skipped if it was already uploaded to the Account.
 
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    upload = create_upload(file, account_id, db)
-
-    transactions = parse_generic_upload(upload)
-
-    return add_transactions_to_database(transactions, db, upload.id) # type: ignore
+    return _submit_upload_job('generic', [file], account_id, db)
 
 
-@upload_router.post('/new/apple')
+@upload_router.post('/new/apple', status_code=202)
 def upload_apple_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Upload Apple Card Transaction .csv file(s).
+    Upload Apple Card Transaction .csv file(s). The files are parsed in
+    the background by the returned Job, and files which were already
+    uploaded to the Account are skipped.
 
     - files: A list of Apple Card Transaction .csv files.
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        raw_transactions = parse_apple_upload(upload)
-
-        transactions.extend(
-            add_transactions_to_database(raw_transactions, db, upload.id)
-        )
-
-    return transactions
+    return _submit_upload_job('apple', files, account_id, db)
 
 
-@upload_router.post('/new/capital-one')
+@upload_router.post('/new/capital-one', status_code=202)
 def upload_capital_one_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Upload Capital One Transaction .csv file(s).
+    Upload Capital One Transaction .csv file(s). The files are parsed in
+    the background by the returned Job, and files which were already
+    uploaded to the Account are skipped.
 
     - files: A list of Capital One Transaction .csv files.
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        raw_transactions = parse_capital_one_upload(upload)
-
-        transactions.extend(
-            add_transactions_to_database(raw_transactions, db, upload.id)
-        )
-
-    return transactions
+    return _submit_upload_job('capital-one', files, account_id, db)
 
 
-@upload_router.post('/new/chase')
+@upload_router.post('/new/chase', status_code=202)
 def upload_chase_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Upload an Chase Bank Transaction .csv file.
+    Upload an Chase Bank Transaction .csv file. The files are parsed in
+    the background by the returned Job, and files which were already
+    uploaded to the Account are skipped.
 
     - files: A list of Chase Bank Transaction .csv files.
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        raw_transactions = parse_chase_upload(upload)
+    return _submit_upload_job('chase', files, account_id, db)
 
-        transactions.extend(
-            add_transactions_to_database(raw_transactions, db, upload.id)
-        )
 
-    return transactions
-
-
-@upload_router.post('/new/citi')
+@upload_router.post('/new/citi', status_code=202)
 def upload_citi_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Upload an Citi Bank Transaction .csv file.
+    Upload an Citi Bank Transaction .csv file. The files are parsed in
+    the background by the returned Job, and files which were already
+    uploaded to the Account are skipped.
 
     - files: A list of Citi Bank Transaction .csv files.
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        transactions.extend(
-            add_transactions_to_database(
-                parse_citi_upload(upload), db, upload.id
-            )
-        )
+    return _submit_upload_job('citi', files, account_id, db)
 
-    return transactions
 
-
-@upload_router.post('/new/iccu')
+@upload_router.post('/new/iccu', status_code=202)
 def upload_iccu_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
     Upload an Idaho Central Credit Union (ICCU) Transaction .csv file.
+    The files are parsed in the background by the returned Job, and
+    files which were already uploaded to the Account are skipped.
 
     - files: A list of ICCU Transaction .csv files.
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        balances, raw_transactions = parse_iccu_upload(upload)
-
-        add_balances_to_database(balances, db)
-        transactions.extend(
-            add_transactions_to_database(raw_transactions, db, upload.id)
-        )
+    return _submit_upload_job('iccu', files, account_id, db)
 
-    return transactions
 
-
-@upload_router.post('/new/vanguard')
+@upload_router.post('/new/vanguard', status_code=202)
 def upload_vanguard_transactions(
     files: list[UploadFile],
     account_id: int = Query(...),
     db: Session = Depends(get_database),
-) -> list[ReturnTransactionSchema]:
+) -> ReturnJobSchema:
     """
-    Upload a Vanguard Transaction .csv file.
+    Upload a Vanguard Transaction .csv file. The files are parsed in the
+    background by the returned Job, and files which were already
+    uploaded to the Account are skipped.
 
     - account_id: The ID of the Account to upload the Transactions to.
     """
 
-    transactions = []
-    for file in files:
-        upload = create_upload(file, account_id, db)
-
-        transactions.extend(
-            add_transactions_to_database(
-                parse_vanguard_upload(upload), db, upload.id
-            )
-        )
-        log.info(f'Uploaded {len(transactions)} transactions from {file.filename}')
-
-    return transactions
+    return _submit_upload_job('vanguard', files, account_id, db)
@@ -1,68 +1,120 @@
-from datetime import date
-from typing import Generator
+from collections import defaultdict
+from datetime import date, timedelta
+from json import dumps
+from typing import Generator, Iterable
 
+import numpy as np
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
 
-from app.core.dates import date_range
+from app.core.projection import ProjectionContext
 from app.db.query import require_account, require_plaid_item
+from app.models.account import Account
 from app.models.balance import Balance
+from app.models.daily_balance import DailyBalance
 from app.models.transaction import Transaction
+from app.models.transfer import Transfer
 from app.models.user import User
 from app.schemas.balance import NewBalanceSchema
 from app.services.plaid import PlaidService
 from app.utils.logging import log
 
 
+def get_starting_balances(
+    account_ids: Iterable[int],
+    date_: date,
+    db: Session,
+) -> dict[int, tuple[float, date]]:
+    """
+    Get the starting balances for multiple accounts at a given date. The
+    starting balance is the most recent Balance on or before the date,
+    plus all Transactions after that Balance (up to the date). This is
+    aggregated in the database in a single query.
+
+    Args:
+        account_ids: The IDs of the accounts to get the balances for.
+        date_: The date to get the starting balances at.
+        db: The database session.
+
+    Returns:
+        Dictionary of account IDs to a tuple of the starting balance and
+        the date of the latest Balance or Transaction it includes.
+        Accounts without a Balance on or before the date are given a
+        balance of 0.0 on the given date.
+    """
+
+    account_ids = list(account_ids)
+
+    # Rank each Account's Balances from most to least recent
+    balances = (
+        select(
+            Balance.account_id,
+            Balance.date,
+            Balance.balance,
+            func.row_number().over(
+                partition_by=Balance.account_id,
+                order_by=(Balance.date.desc(), Balance.id.desc()),
+            ).label('rank'),
+        )
+        .where(Balance.account_id.in_(account_ids), Balance.date <= date_)
+        .subquery()
+    )
+
+    # Total the Transactions after the most recent Balance
+    rows = db.execute(
+        select(
+            balances.c.account_id,
+            balances.c.date,
+            balances.c.balance,
+            func.coalesce(func.sum(Transaction.amount), 0.0),
+            func.max(Transaction.date),
+        )
+        .select_from(balances)
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.account_id == balances.c.account_id,
+                Transaction.date > balances.c.date,
+                Transaction.date <= date_,
+            ),
+        )
+        .where(balances.c.rank == 1)
+        .group_by(balances.c.account_id, balances.c.date, balances.c.balance)
+    ).all()
+
+    starting_balances = {
+        account_id: (0.0, date_) for account_id in account_ids
+    }
+    for account_id, balance_date, balance, total, last_date in rows:
+        starting_balances[account_id] = (
+            balance + total,
+            balance_date if last_date is None else last_date,
+        )
+
+    return starting_balances
+
+
 def get_starting_balance(
     account_id: int,
     date_: date,
     db: Session,
 ) -> tuple[float, date]:
-    """Get the starting balance for an account at a given date."""
-
-    # Get the most recent Balance for the Account
-    balance = (
-        db.query(Balance)
-            .filter(
-                Balance.account_id == account_id,
-                Balance.date <= date_,
-            )
-            .order_by(Balance.date.desc())
-            .first()
-    )
+    """
+    Get the starting balance for an account at a given date.
 
-    # No Balance found, return 0.0
-    if not balance:
-        return 0.0, date_
-
-    # If the Balance is for the given date, return the balance
-    if balance.date == date_:
-        return balance.balance, balance.date
-
-    # The balance is before the given date, apply Transactions from the
-    # balance date to the latest Transaction date
-    transactions = (
-        db.query(Transaction)
-            .filter(
-                Transaction.account_id == account_id,
-                Transaction.date > balance.date,
-            )
-            .order_by(Transaction.date.desc())
-            .options(
-                load_only(
-                    Transaction.account_id,
-                    Transaction.date,
-                    Transaction.amount,
-                ),
-            )
-            .all()
-    )
+    Args:
+        account_id: The ID of the account to get the balance for.
+        date_: The date to get the starting balance at.
+        db: The database session.
 
-    return (
-        balance.balance + sum(t.amount for t in transactions),
-        transactions[-1].date,
-    )
+    Returns:
+        Tuple of the starting balance and the date of the latest Balance
+        or Transaction it includes.
+    """
+
+    return get_starting_balances([account_id], date_, db)[account_id]
 
 
 def get_projected_balance(
@@ -90,51 +142,585 @@ def get_projected_balance(
     target_dates = sorted(target_dates)
 
     # Get the starting balance and date
-    starting_balance, start_date = get_starting_balance(
+    current_balance, current_date = get_starting_balance(
         account_id, target_dates[0], db
     )
-    log.info(f'Starting balance: {starting_balance} on {start_date}')
-
-    # If the first target date is before or equal to the start date,
-    # yield the starting balance
-    if target_dates[0] <= start_date:
-        yield target_dates[0], starting_balance
-        current_balance = starting_balance
-        current_date = start_date
-    else:
-        current_balance = starting_balance
-        current_date = start_date
+    log.info(f'Starting balance: {current_balance} on {current_date}')
 
     # Get all bills, transfers, and incomes for the account
     if not (account := require_account(db, account_id)):
         for target_date in target_dates:
-            yield target_date, starting_balance
+            yield target_date, current_balance
         return
 
-    # Project the balance forward by applying bills, transfers, and incomes
+    # Total the occurrences of all Bills, Incomes, and Transfers on each
+    # date after the starting balance
+    changes: dict[date, float] = defaultdict(float)
+    for date_, amount in account.get_occurrences(
+        current_date + timedelta(days=1), target_dates[-1], ProjectionContext()
+    ):
+        changes[date_] += amount
+
+    # Any real Balances after the starting balance override the projection
+    anchors = _get_balance_anchors(account, current_date, target_dates[-1])
+    change_dates = sorted(changes.keys() | anchors.keys())
+
+    # Project the balance forward by applying all changes up to each
+    # target date
+    index = 0
     for target_date in target_dates:
-        log.info(f'Processing {target_date}')
-        # Skip dates before the current date
-        if target_date <= current_date:
-            yield target_date, current_balance
+        while index < len(change_dates) and change_dates[index] <= target_date:
+            if (date_ := change_dates[index]) in anchors:
+                current_balance = anchors[date_]
+            else:
+                current_balance += changes[date_]
+            index += 1
+        yield target_date, current_balance
+
+
+def get_daily_projected_balances(
+    account_id: int,
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the projected balance for an account on every day between two
+    dates. This is the vectorized equivalent of `get_projected_balance`
+    for a contiguous range of dates: every Bill, Income, and Transfer
+    occurrence is scattered into an array of daily changes (in cents),
+    which is then cumulatively summed from the starting balance.
+
+    Args:
+        account_id: The ID of the account to get the balances for.
+        start_date: The first date to project the balance to.
+        end_date: The last date to project the balance to (inclusive).
+        db: The database session.
+
+    Returns:
+        Tuple of the dates (as `datetime64[D]`) and the balance on each
+        date.
+    """
+
+    dates = np.arange(
+        np.datetime64(start_date, 'D'),
+        np.datetime64(end_date, 'D') + 1,
+    )
+    if start_date > end_date:
+        return dates, np.zeros(0, dtype=np.float64)
+
+    # Get the starting balance and date
+    starting_balance, starting_date = get_starting_balance(
+        account_id, start_date, db
+    )
+    log.info(f'Starting balance: {starting_balance} on {starting_date}')
+    account = require_account(db, account_id)
+
+    # Index every day from the earliest relevant date by its ordinal
+    origin = min(starting_date, start_date).toordinal()
+    deltas = np.zeros(end_date.toordinal() - origin + 1, dtype=np.int64)
+
+    # Scatter the amount of each occurrence into its day
+    if (occurrences := list(account.get_occurrences(
+        starting_date + timedelta(days=1), end_date, ProjectionContext()
+    ))):
+        occurrence_dates, amounts = zip(*occurrences)
+        np.add.at(
+            deltas,
+            _to_indices(occurrence_dates, origin),
+            _to_cents(amounts),
+        )
+    balances = _to_cents([starting_balance])[0] + np.cumsum(deltas)
+
+    # Anchor each day after a real Balance on that Balance
+    if (anchors := _get_balance_anchors(account, starting_date, end_date)):
+        _apply_anchors(balances, anchors, origin)
+
+    return dates, balances[start_date.toordinal() - origin:] / 100
+
+
+def materialize_daily_balances(
+    account_ids: Iterable[int],
+    end_date: date,
+    db: Session,
+) -> None:
+    """
+    Materialize the DailyBalances for accounts up to the given date from
+    their Balances and Transactions. Only the days after the most recent
+    existing DailyBalance of each account are computed; days before the
+    first Balance of an account are never materialized. The DailyBalances
+    are written with their own session, so reading balances never commits
+    any pending changes of the caller.
+
+    Args:
+        account_ids: The IDs of the accounts to materialize the balances
+            of.
+        end_date: The last date to materialize (inclusive).
+        db: The database session.
+    """
+
+    account_ids = list(account_ids)
+
+    # Resume each account from its most recent DailyBalance; otherwise
+    # start from nothing on the day before its first Balance
+    latest = (
+        select(
+            DailyBalance.account_id,
+            func.max(DailyBalance.date).label('date'),
+        )
+        .where(DailyBalance.account_id.in_(account_ids))
+        .group_by(DailyBalance.account_id)
+        .subquery()
+    )
+    resume = {
+        account_id: (last_date, last_balance)
+        for account_id, last_date, last_balance in db.execute(
+            select(
+                DailyBalance.account_id,
+                DailyBalance.date,
+                DailyBalance.balance,
+            )
+            .join(latest, and_(
+                DailyBalance.account_id == latest.c.account_id,
+                DailyBalance.date == latest.c.date,
+            ))
+        )
+    }
+    if (unmaterialized := set(account_ids) - resume.keys()):
+        for account_id, first_date in db.execute(
+            select(Balance.account_id, func.min(Balance.date))
+                .where(Balance.account_id.in_(unmaterialized))
+                .group_by(Balance.account_id)
+        ):
+            resume[account_id] = (first_date - timedelta(days=1), 0.0)
+
+    rows = []
+    for account_id, (last_date, last_balance) in resume.items():
+        if last_date >= end_date:
             continue
+        start_date = last_date + timedelta(days=1)
+        origin = start_date.toordinal()
 
-        # Process each date up to the target date
-        for date_ in date_range(current_date, target_date):
-            # Apply bills
-            for bill in account.bills:
-                current_balance += bill.get_effective_amount(date_)
-
-            # Apply incomes
-            for income in account.incomes:
-                current_balance += income.get_effective_amount(date_)
-
-            # Apply both sets of Transfers
-            for transfer in account.outgoing_transfers + account.incoming_transfers:
-                current_balance += transfer.get_effective_amount(date_, account_id)
-        log.debug(f'Apply models for {current_date} -> {target_date} (${current_balance:,.2f})')
-        current_date = target_date
-        yield target_date, current_balance
+        # Total the Transactions on each day
+        deltas = np.zeros(end_date.toordinal() - origin + 1, dtype=np.int64)
+        if (totals := db.execute(
+            select(Transaction.date, func.sum(Transaction.amount))
+                .where(
+                    Transaction.account_id == account_id,
+                    Transaction.date >= start_date,
+                    Transaction.date <= end_date,
+                )
+                .group_by(Transaction.date)
+        ).all()):
+            dates, amounts = zip(*totals)
+            deltas[_to_indices(dates, origin)] = _to_cents(amounts)
+        balances = _to_cents([last_balance])[0] + np.cumsum(deltas)
+
+        # Each real Balance overrides the total on its date
+        if (anchors := {
+            balance_date: balance
+            for balance_date, balance in db.execute(
+                select(Balance.date, Balance.balance)
+                    .where(
+                        Balance.account_id == account_id,
+                        Balance.date >= start_date,
+                        Balance.date <= end_date,
+                    )
+                    .order_by(Balance.id)
+            )
+        }):
+            _apply_anchors(balances, anchors, origin)
+
+        rows.extend(
+            {
+                'account_id': account_id,
+                'date': date.fromordinal(origin + index),
+                'balance': balance,
+            }
+            for index, balance in enumerate((balances / 100).tolist())
+        )
+
+    if not rows:
+        return
+
+    with Session(db.get_bind()) as cache_db:
+        cache_db.execute(
+            sqlite_insert(DailyBalance).on_conflict_do_nothing(), rows
+        )
+        cache_db.commit()
+
+
+def get_account_daily_balances(
+    account_id: int,
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the balance for an account on every day between two dates.
+    Historical days (up to today) are read from the materialized
+    DailyBalances, and later days are projected from the balance at the
+    end of today.
+
+    Args:
+        account_id: The ID of the account to get the balances for.
+        start_date: The first date to get the balance for.
+        end_date: The last date to get the balance for (inclusive).
+        db: The database session.
+
+    Returns:
+        Tuple of the dates (as `datetime64[D]`) and the balance on each
+        date.
+    """
+
+    dates = np.arange(
+        np.datetime64(start_date, 'D'),
+        np.datetime64(end_date, 'D') + 1,
+    )
+    account = require_account(db, account_id, raise_exception=True)
+
+    return dates, _get_daily_balances([account], start_date, end_date, db)[0]
+
+
+def get_daily_projected_net_worth(
+    account_ids: Iterable[int] | None,
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> tuple[np.ndarray, dict[int, np.ndarray], np.ndarray]:
+    """
+    Get the balance of multiple accounts on every day between two dates,
+    in the same way as `get_account_daily_balances`. Historical days of
+    all accounts are read from their DailyBalances with a single query.
+    All accounts are projected together after today: their Bills,
+    Incomes, Transfers, and Balances are loaded once, every Transfer is
+    evaluated once for both of its accounts, and payoff Transfers share a
+    single projection context.
+
+    Args:
+        account_ids: The IDs of the accounts to project. If None, all
+            accounts are projected.
+        start_date: The first date to project the balances to.
+        end_date: The last date to project the balances to (inclusive).
+        db: The database session.
+
+    Returns:
+        Tuple of the dates (as `datetime64[D]`), a dictionary of account
+        IDs to the balance of that account on each date, and the total
+        balance of all accounts on each date.
+    """
+
+    dates = np.arange(
+        np.datetime64(start_date, 'D'),
+        np.datetime64(end_date, 'D') + 1,
+    )
+
+    query = db.query(Account).options(
+        selectinload(Account.bills),
+        selectinload(Account.incomes),
+        selectinload(Account.balances),
+        selectinload(Account.outgoing_transfers),
+        selectinload(Account.incoming_transfers),
+    )
+    if account_ids is not None:
+        query = query.filter(Account.id.in_(list(account_ids)))
+    accounts = query.order_by(Account.id).all()
+    balances = _get_daily_balances(accounts, start_date, end_date, db)
+
+    return (
+        dates,
+        {account.id: balances[row] for row, account in enumerate(accounts)},
+        balances.sum(axis=0),
+    )
+
+
+def _get_daily_balances(
+    accounts: list[Account],
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> np.ndarray:
+    """
+    Get the balance of each account on every day between two dates.
+    Historical days (up to today) are read from the DailyBalances, and
+    later days are projected together from the balance at the end of
+    today, so only the occurrences after today are applied.
+
+    Returns:
+        The balance of each account (rows, in the order of the accounts)
+        on each date (columns).
+    """
+
+    if not accounts or start_date > end_date:
+        return np.zeros((
+            len(accounts),
+            max(0, end_date.toordinal() - start_date.toordinal() + 1),
+        ))
+
+    today = date.today()
+    account_ids = [account.id for account in accounts]
+    parts = []
+    if start_date <= (historical_end := min(end_date, today)):
+        parts.append(_get_historical_daily_balances(
+            account_ids, start_date, historical_end, db
+        ))
+
+    if (projection_start := max(start_date, today + timedelta(days=1))) \
+            <= end_date:
+        today_balances = (
+            parts[0][:, -1]
+            if parts
+            else _get_historical_daily_balances(account_ids, today, today, db)[:, 0]
+        )
+        parts.append(_project_daily_balances(
+            accounts,
+            {
+                account_id: (balance, today)
+                for account_id, balance in zip(account_ids, today_balances)
+            },
+            projection_start,
+            end_date,
+        ) / 100)
+
+    return np.concatenate(parts, axis=1)
+
+
+def _get_historical_daily_balances(
+    account_ids: list[int],
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> np.ndarray:
+    """
+    Get the balance of each account on every day between two dates (up to
+    today) from the DailyBalances of all accounts, with a single query.
+    Days before the first Balance of an account are not materialized, so
+    they are projected instead.
+
+    Returns:
+        The balance of each account (rows, in the order of the account
+        IDs) on each date (columns).
+    """
+
+    materialize_daily_balances(account_ids, end_date, db)
+
+    origin = start_date.toordinal()
+    balances = np.full(
+        (len(account_ids), end_date.toordinal() - origin + 1), np.nan
+    )
+    if (rows := db.execute(
+        select(DailyBalance.account_id, DailyBalance.date, DailyBalance.balance)
+            .where(
+                DailyBalance.account_id.in_(account_ids),
+                DailyBalance.date >= start_date,
+                DailyBalance.date <= end_date,
+            )
+    ).all()):
+        indices = {account_id: row for row, account_id in enumerate(account_ids)}
+        ids, dates, values = zip(*rows)
+        balances[
+            [indices[account_id] for account_id in ids],
+            _to_indices(dates, origin),
+        ] = values
+
+    # DailyBalances start from the first Balance, so only a leading run
+    # of days of an account can be missing
+    for row, account_id in enumerate(account_ids):
+        if (missing := np.flatnonzero(np.isnan(balances[row]))).size:
+            last = int(missing[-1])
+            balances[row, :last + 1] = get_daily_projected_balances(
+                account_id, start_date, date.fromordinal(origin + last), db
+            )[1]
+
+    return balances
+
+
+def _project_daily_balances(
+    accounts: list[Account],
+    starting_balances: dict[int, tuple[float, date]],
+    start_date: date,
+    end_date: date,
+) -> np.ndarray:
+    """
+    Project the balance (in cents) of each account on every day between
+    two dates from its starting balance, applying every Bill, Income, and
+    Transfer occurrence after its starting date.
+
+    Args:
+        accounts: The accounts to project.
+        starting_balances: Dictionary of account IDs to the starting
+            balance and date of that account.
+        start_date: The first date to project the balances to.
+        end_date: The last date to project the balances to (inclusive).
+
+    Returns:
+        The balance of each account (rows, in the order of the accounts)
+        on each date (columns).
+    """
+
+    rows = {account.id: row for row, account in enumerate(accounts)}
+    starting_indices = np.array([
+        starting_balances[account.id][1].toordinal() for account in accounts
+    ])
+
+    # Index every day from the earliest relevant date by its ordinal
+    origin = min(int(starting_indices.min()), start_date.toordinal())
+    starting_indices -= origin
+    deltas = np.zeros(
+        (len(accounts), end_date.toordinal() - origin + 1), dtype=np.int64,
+    )
+
+    # Gather all occurrences of each account's Bills and Incomes, and of
+    # every Transfer (once) for both of its accounts
+    context = ProjectionContext()
+    first_date = date.fromordinal(origin) + timedelta(days=1)
+    occurrences: list[tuple[int, date, float]] = []
+    transfers: dict[int, Transfer] = {}
+    for account in accounts:
+        row = rows[account.id]
+        for model in account.bills + account.incomes:
+            occurrences.extend(
+                (row, date_, amount)
+                for date_, amount in model.get_occurrences(first_date, end_date)
+            )
+        for transfer in account.outgoing_transfers + account.incoming_transfers:
+            transfers[transfer.id] = transfer
+    for transfer in transfers.values():
+        from_row = rows.get(transfer.from_account_id)
+        to_row = rows.get(transfer.to_account_id)
+        for date_, amount in transfer.get_occurrences(
+            first_date, end_date, transfer.from_account_id, context,
+        ):
+            if from_row is not None:
+                occurrences.append((from_row, date_, amount))
+            if to_row is not None:
+                occurrences.append((to_row, date_, -amount))
+
+    # Scatter each occurrence after its account's starting date
+    if occurrences:
+        occurrence_rows, occurrence_dates, amounts = zip(*occurrences)
+        occurrence_rows = np.array(occurrence_rows, dtype=np.int64)
+        indices = _to_indices(occurrence_dates, origin)
+        mask = indices > starting_indices[occurrence_rows]
+        np.add.at(
+            deltas,
+            (occurrence_rows[mask], indices[mask]),
+            _to_cents(amounts)[mask],
+        )
+    balances = _to_cents(
+        starting_balances[account.id][0] for account in accounts
+    )[:, np.newaxis] + np.cumsum(deltas, axis=1)
+
+    # Anchor each account's days after a real Balance on that Balance
+    for account in accounts:
+        starting_date = starting_balances[account.id][1]
+        if (anchors := _get_balance_anchors(account, starting_date, end_date)):
+            _apply_anchors(balances[rows[account.id]], anchors, origin)
+
+    return balances[:, start_date.toordinal() - origin:]
+
+
+def iter_daily_balances_ndjson(
+    dates: np.ndarray,
+    balances: np.ndarray,
+    *,
+    minimums: np.ndarray | None = None,
+    maximums: np.ndarray | None = None,
+    chunk_size: int = 1_000,
+) -> Generator[bytes, None, None]:
+    """
+    Serialize daily balances as newline-delimited JSON objects of the
+    date and balance, a chunk of days at a time, so that long ranges
+    are never serialized all at once.
+
+    Args:
+        dates: The dates (as `datetime64[D]`) of the balances.
+        balances: The balance on each date.
+        minimums: The optional minimum balance of the period of each
+            date.
+        maximums: The optional maximum balance of the period of each
+            date.
+        chunk_size: How many days to serialize into each chunk.
+
+    Yields:
+        Encoded chunks of newline-delimited JSON.
+    """
+
+    for start in range(0, len(dates), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        columns = {
+            'date': np.datetime_as_string(dates[chunk]).tolist(),
+            'balance': balances[chunk].tolist(),
+        }
+        if minimums is not None:
+            columns['min_balance'] = minimums[chunk].tolist()
+        if maximums is not None:
+            columns['max_balance'] = maximums[chunk].tolist()
+
+        yield ''.join(
+            dumps(dict(zip(columns, row))) + '\n'
+            for row in zip(*columns.values())
+        ).encode()
+
+
+def _get_balance_anchors(
+    account: Account,
+    after: date,
+    end_date: date,
+) -> dict[date, float]:
+    """
+    Get the real Balances of the Account after the given date, and on or
+    before the end date.
+    """
+
+    return {
+        balance.date: balance.balance
+        for balance in account.balances
+        if after < balance.date <= end_date
+    }
+
+
+def _apply_anchors(
+    balances: np.ndarray,
+    anchors: dict[date, float],
+    origin: int,
+) -> None:
+    """
+    Anchor the given (cumulative) balances in cents on real Balances. The
+    balance of each day on or after a real Balance is offset by the
+    difference between the most recent real Balance and the cumulative
+    balance on that Balance's date.
+
+    Args:
+        balances: The cumulative daily balances to modify in place.
+        anchors: Dictionary of dates to real Balances (in dollars).
+        origin: The ordinal of the date at index 0 of the balances.
+    """
+
+    indices = _to_indices(anchors.keys(), origin)
+    offsets = np.zeros_like(balances)
+    offsets[indices] = _to_cents(anchors.values()) - balances[indices]
+    last_anchor = np.full(len(balances), -1, dtype=np.int64)
+    last_anchor[indices] = indices
+    last_anchor = np.maximum.accumulate(last_anchor)
+    anchored = last_anchor >= 0
+    balances[anchored] += offsets[last_anchor[anchored]]
+
+
+def _to_indices(dates: Iterable[date], origin: int, /) -> np.ndarray:
+    """Convert the given dates to indices relative to an ordinal."""
+
+    return np.fromiter(
+        (date_.toordinal() for date_ in dates), dtype=np.int64
+    ) - origin
+
+
+def _to_cents(amounts: Iterable[float], /) -> np.ndarray:
+    """Convert the given dollar amounts to integer cents."""
+
+    return np.rint(
+        np.fromiter(amounts, dtype=np.float64) * 100
+    ).astype(np.int64)
 
 
 def sync_plaid_balance(
@@ -178,8 +764,33 @@ def sync_plaid_balance(
         balance=matching_account['balances']['current'],
         date=date.today()
     )
-    balance = Balance(**new_balance.model_dump())
-    db.add(balance)
+    balance = set_balance(new_balance, db)
     db.commit()
 
     return balance
+
+
+def set_balance(new_balance: NewBalanceSchema, db: Session) -> Balance:
+    """
+    Set the Balance of an Account on a date, replacing the amount of any
+    existing Balance on that date. The session is not committed.
+
+    Args:
+        new_balance: The new Balance.
+        db: The database session.
+
+    Returns:
+        The new or updated Balance.
+    """
+
+    balance = db.query(Balance).filter(
+        Balance.account_id == new_balance.account_id,
+        Balance.date == new_balance.date,
+    ).one_or_none()
+    if balance is None:
+        balance = Balance(**new_balance.model_dump())
+        db.add(balance)
+    else:
+        balance.balance = new_balance.balance
+
+    return balance
@@ -10,6 +10,12 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///../config/budget.sqlite"
 
+    # Upload storage settings
+    UPLOAD_DIRECTORY: str = "../config/uploads"
+
+    # Background job settings - SQLite only allows a single writer
+    JOB_WORKERS: int = 1
+
     # Plaid API credentials
     PLAID_CLIENT_ID: str
     PLAID_SECRET: str
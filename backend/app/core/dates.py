@@ -38,6 +38,12 @@ def get_month_end(date: date) -> date:
     return date.replace(day=1, month=date.month + 1) - timedelta(days=1)
 
 
+def _month_index(date: date) -> int:
+    """Get the absolute number of months since year 0 for a given date."""
+
+    return date.year * 12 + date.month - 1
+
+
 def date_meets_frequency(
     date: date,
     start_date: date,
@@ -66,7 +72,7 @@ def date_meets_frequency(
     if (unit == 'months'
         and (
             date.day != start_date.day
-            or (date.month - start_date.month) % value != 0
+            or (_month_index(date) - _month_index(start_date)) % value != 0
         )):
         return False
 
@@ -79,3 +85,75 @@ def date_meets_frequency(
         return False
 
     return True
+
+
+def get_frequency_dates(
+    start_date: date,
+    frequency: FrequencyDict | None,
+    range_start: date,
+    range_end: date,
+    *,
+    end_date: date | None = None,
+) -> Generator[date, None, None]:
+    """
+    Generate all dates between range_start and range_end which are
+    aligned with the given frequency. This computes each occurrence
+    directly, rather than checking every day in the range with
+    `date_meets_frequency`.
+
+    Args:
+        start_date: The start date of the frequency.
+        frequency: The frequency. If None, then start_date is treated as
+            a single (one-time) occurrence.
+        range_start: The start of the range to generate dates for
+            (inclusive).
+        range_end: The end of the range to generate dates for
+            (inclusive).
+        end_date: The optional end date of the frequency (inclusive).
+
+    Returns:
+        A generator of (chronological) dates.
+    """
+
+    lower = max(start_date, range_start)
+    upper = range_end if end_date is None else min(end_date, range_end)
+    if lower > upper:
+        return
+
+    # One-time occurrences only happen on the start date
+    if frequency is None:
+        if start_date == lower:
+            yield start_date
+        return
+
+    unit, value = frequency['unit'], frequency['value']
+
+    # Day and week frequencies are a fixed number of days apart
+    if unit in ('days', 'weeks'):
+        step = value * 7 if unit == 'weeks' else value
+        # Round up to the first occurrence on or after the lower bound
+        current_date = start_date + timedelta(
+            days=-(-(lower - start_date).days // step) * step
+        )
+        while current_date <= upper:
+            yield current_date
+            current_date += timedelta(days=step)
+        return
+
+    # Month and year frequencies repeat on the same day of the month;
+    # a year is just twelve months
+    step = value * 12 if unit == 'years' else value
+    start_index = _month_index(start_date)
+    index = start_index + (
+        -(-(_month_index(lower) - start_index) // step) * step
+    )
+    while index <= _month_index(upper):
+        try:
+            current_date = date(index // 12, index % 12 + 1, start_date.day)
+        except ValueError:
+            # This month does not have this day (e.g. the 31st)
+            index += step
+            continue
+        if lower <= current_date <= upper:
+            yield current_date
+        index += step
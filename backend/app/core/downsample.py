@@ -0,0 +1,140 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from app.schemas.balance import BalanceResolution
+
+
+# 1970-01-05 (the first Monday after the epoch) is day 4
+_FIRST_MONDAY = 4
+
+
+class Sampling(NamedTuple):
+    """
+    Buckets of consecutive days which a daily balance series is reduced
+    to, and which of those buckets are kept.
+    """
+    starts: np.ndarray
+    kept: np.ndarray
+
+
+class SampledBalances(NamedTuple):
+    """Balances reduced to one point per kept bucket."""
+    dates: np.ndarray
+    balances: np.ndarray
+    minimums: np.ndarray
+    maximums: np.ndarray
+
+
+def get_sampling(
+    dates: np.ndarray,
+    balances: np.ndarray,
+    resolution: BalanceResolution = 'day',
+    max_points: int | None = None,
+) -> Sampling:
+    """
+    Determine how to downsample a daily balance series. Days are first
+    grouped into fixed buckets of the given resolution; if there are
+    still more than the maximum number of points, buckets are selected
+    with the Largest-Triangle-Three-Buckets algorithm on their closing
+    balances.
+
+    Args:
+        dates: The dates (as `datetime64[D]`) of the series.
+        balances: The balance on each date.
+        resolution: The size of the fixed buckets to group days into.
+        max_points: The maximum number of points to keep. If None, all
+            buckets are kept.
+
+    Returns:
+        The sampling to reduce the series (or any other series on the
+        same dates) with.
+    """
+
+    days = dates.astype(np.int64)
+    if resolution == 'week':
+        keys = days - (days - _FIRST_MONDAY) % 7
+    elif resolution == 'month':
+        keys = dates.astype('datetime64[M]').astype(np.int64)
+    else:
+        keys = days
+
+    # Each bucket starts where the key changes
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1))
+    kept = np.arange(len(starts))
+    if max_points is not None and len(starts) > max_points:
+        ends = np.append(starts[1:], len(days)) - 1
+        kept = _largest_triangle_three_buckets(
+            days[starts].astype(np.float64), balances[ends], max_points,
+        )
+
+    return Sampling(starts, kept)
+
+
+def apply_sampling(
+    sampling: Sampling,
+    dates: np.ndarray,
+    balances: np.ndarray,
+) -> SampledBalances:
+    """
+    Reduce a daily balance series to one point per kept bucket.
+
+    Args:
+        sampling: The sampling to reduce the series with.
+        dates: The dates (as `datetime64[D]`) of the series.
+        balances: The balance on each date.
+
+    Returns:
+        The first date, closing balance, and minimum and maximum balance
+        of each kept bucket.
+    """
+
+    if not len(dates):
+        return SampledBalances(dates, balances, balances, balances)
+
+    starts = sampling.starts
+    ends = np.append(starts[1:], len(dates)) - 1
+
+    return SampledBalances(
+        dates=dates[starts][sampling.kept],
+        balances=balances[ends][sampling.kept],
+        minimums=np.minimum.reduceat(balances, starts)[sampling.kept],
+        maximums=np.maximum.reduceat(balances, starts)[sampling.kept],
+    )
+
+
+def _largest_triangle_three_buckets(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int,
+) -> np.ndarray:
+    """
+    Select the indices of at most the given number of points which best
+    preserve the visual shape of a series. The first and last points
+    are always kept; the rest are divided into equal buckets, and from
+    each the point forming the largest triangle with the previously
+    selected point and the average of the next bucket is kept.
+    """
+
+    if max_points >= len(x) or max_points < 3:
+        return np.arange(min(len(x), max(max_points, 0)))
+
+    edges = np.linspace(1, len(x) - 1, max_points - 1).astype(np.int64)
+    selected = np.zeros(max_points, dtype=np.int64)
+    selected[-1] = len(x) - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        # Twice the area of each candidate triangle
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = selected[bucket + 1] = start + int(np.argmax(areas))
+
+    return selected
@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import monotonic
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, TypeVar
+
+from sqlalchemy import select, update
+from sqlalchemy.orm.session import Session
+
+from app.core.config import settings
+from app.core.plaid import sync_plaid_transactions
+from app.core.storage import open_upload_data
+from app.core.transactions import get_transaction_loader_options
+from app.core.upload import (
+    UPLOAD_PARSERS,
+    add_transaction_columns_to_database,
+    add_transactions_to_database,
+    parse_generic_upload,
+)
+from app.db.base import SessionLocal
+from app.db.query import require_account
+from app.models.job import Job
+from app.models.transaction import Transaction
+from app.models.upload import Upload
+from app.schemas.job import JobType
+from app.utils.logging import log
+
+
+_T = TypeVar('_T')
+
+# Minimum number of seconds between writes of the progress of a Job
+_PROGRESS_INTERVAL = 0.5
+
+# Number of Transactions of a Job which are loaded at a time
+_LOAD_CHUNK_SIZE = 10_000
+
+# Every Job is run on this pool, in the order they are submitted
+_executor = ThreadPoolExecutor(
+    max_workers=settings.JOB_WORKERS,
+    thread_name_prefix='job',
+)
+
+
+class JobProgress:
+    """
+    Records the progress of a running Job. The progress is written with
+    its own session (so it is visible while the Job is still running),
+    and at most once every `_PROGRESS_INTERVAL` seconds.
+    """
+
+    def __init__(self, job_id: int) -> None:
+        self.job_id = job_id
+        self._last_update = 0.0
+
+
+    def update(self, progress: int, total: int | None = None) -> None:
+        """Update the progress (and total) of the Job."""
+
+        if (now := monotonic()) - self._last_update < _PROGRESS_INTERVAL:
+            return
+
+        self._last_update = now
+        with SessionLocal() as db:
+            db.execute(
+                update(Job)
+                    .where(Job.id == self.job_id)
+                    .values(progress=progress, total=total)
+            )
+            db.commit()
+
+
+def _track_stream_progress(
+    items: Iterable[_T],
+    stream: BinaryIO,
+    report: Callable[[int], None],
+) -> Iterator[_T]:
+    """
+    Report the position of a stream each time an item parsed from it has
+    been consumed.
+    """
+
+    for item in items:
+        yield item
+        report(stream.tell())
+
+
+def _run_upload_job(
+    db: Session,
+    progress: JobProgress,
+    *,
+    parser: str,
+    upload_ids: list[int],
+) -> list[int]:
+    """
+    Parse and add the Transactions of each Upload. Progress is measured
+    in bytes of the Uploads. If the Job is resumed, Uploads which were
+    already ingested are skipped, and an Upload whose ingest was
+    interrupted only adds the rows after those it already added.
+    """
+
+    uploads = db.execute(
+        select(
+            Upload.id,
+            Upload.sha256,
+            Upload.size,
+            Upload.account_id,
+            Upload.ingest_date,
+        )
+            .where(Upload.id.in_(upload_ids))
+            .order_by(Upload.id)
+    ).all()
+
+    total = sum(upload.size for upload in uploads)
+    done, transaction_ids = 0, []
+    progress.update(done, total)
+    for upload in uploads:
+        if upload.ingest_date is not None:
+            done += upload.size
+            continue
+
+        report = lambda position: progress.update(done + position, total)
+        with open_upload_data(upload.sha256) as stream:
+            if parser == 'generic':
+                transactions = add_transactions_to_database(
+                    _track_stream_progress(
+                        parse_generic_upload(stream, upload.account_id),
+                        stream,
+                        report,
+                    ),
+                    db,
+                    upload.id,
+                )
+            else:
+                transactions = add_transaction_columns_to_database(
+                    _track_stream_progress(
+                        UPLOAD_PARSERS[parser](stream, upload.account_id),
+                        stream,
+                        report,
+                    ),
+                    db,
+                    upload.id,
+                )
+        transaction_ids.extend(transaction.id for transaction in transactions)
+        done += upload.size
+        log.info(
+            f'Uploaded {len(transactions)} transactions from Upload[{upload.id}]'
+        )
+
+    return transaction_ids
+
+
+def _run_plaid_sync_job(
+    db: Session,
+    progress: JobProgress,
+    *,
+    account_ids: list[int],
+    start_date: str | None,
+    end_date: str | None,
+) -> list[int]:
+    """
+    Sync the Transactions of each Account from Plaid. Progress is
+    measured in Accounts.
+    """
+
+    transaction_ids = []
+    for index, account_id in enumerate(account_ids):
+        progress.update(index, len(account_ids))
+        account = require_account(db, account_id)
+        log.debug(
+            f'Syncing Transactions from '
+            f'{start_date or account.plaid_item.last_refresh} to today'
+        )
+        transactions = sync_plaid_transactions(
+            account,
+            datetime.fromisoformat(start_date) if start_date else None,
+            datetime.fromisoformat(end_date) if end_date else None,
+            db,
+        )
+        transaction_ids.extend(transaction.id for transaction in transactions)
+        log.debug(
+            f'Synced {len(transactions)} transactions for account {account_id}'
+        )
+
+    return transaction_ids
+
+
+# Handler of each type of Job, which is called with the arguments of
+# the Job and returns the IDs of the Transactions it added
+_JOB_HANDLERS: dict[JobType, Callable[..., list[int]]] = {
+    'upload': _run_upload_job,
+    'plaid_sync': _run_plaid_sync_job,
+}
+
+
+def _run_job(job_id: int) -> None:
+    """Run a Job, recording its result (or error) once it finishes."""
+
+    with SessionLocal() as db:
+        if (job := db.get(Job, job_id)) is None:
+            return
+
+        job.status = 'running'
+        job.start_date = datetime.now()
+        db.commit()
+
+        try:
+            transaction_ids = _JOB_HANDLERS[job.type](
+                db, JobProgress(job_id), **job.arguments
+            )
+        except Exception as e:
+            log.exception(f'{job!r} failed')
+            db.rollback()
+            job.status = 'failed'
+            job.error = str(e)
+        else:
+            # The progress was written by another session
+            db.refresh(job)
+            job.status = 'complete'
+            job.transaction_ids = transaction_ids
+            if job.total is not None:
+                job.progress = job.total
+        job.end_date = datetime.now()
+        db.commit()
+
+
+def submit_job(type_: JobType, arguments: dict[str, Any], db: Session) -> Job:
+    """
+    Create a new Job, and submit it to be run in the background.
+
+    Args:
+        type_: The type of Job to create.
+        arguments: The (JSON serializable) keyword arguments of the
+            handler of the type of Job.
+        db: The database session.
+
+    Returns:
+        The created (pending) Job.
+    """
+
+    job = Job(type=type_, arguments=arguments, create_date=datetime.now())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _executor.submit(_run_job, job.id)
+
+    return job
+
+
+def resume_jobs(db: Session) -> None:
+    """
+    Resubmit all Jobs which were not finished when the app last stopped.
+    Each type of Job skips any work it already finished.
+
+    Args:
+        db: The database session.
+    """
+
+    for job in db.scalars(
+        select(Job)
+            .where(Job.status.in_(('pending', 'running')))
+            .order_by(Job.id)
+    ):
+        log.info(f'Resuming {job!r}')
+        _executor.submit(_run_job, job.id)
+
+
+def shutdown_jobs() -> None:
+    """
+    Stop starting new Jobs. Jobs which are not started remain pending,
+    and are resumed on the next startup.
+    """
+
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_job_transactions(job: Job, db: Session) -> list[Transaction]:
+    """
+    Get the Transactions added by a Job, loading everything they
+    serialize.
+
+    Args:
+        job: The Job to get the Transactions of.
+        db: The database session.
+
+    Returns:
+        A list of Transactions.
+    """
+
+    transactions = []
+    for start in range(0, len(job.transaction_ids), _LOAD_CHUNK_SIZE):
+        transactions.extend(db.scalars(
+            select(Transaction)
+                .where(Transaction.id.in_(
+                    job.transaction_ids[start:start + _LOAD_CHUNK_SIZE]
+                ))
+                .order_by(Transaction.id)
+                .options(*get_transaction_loader_options())
+        ))
+
+    return transactions
@@ -1,7 +1,15 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.core.upload import (
+    add_transactions_to_database,
+    remove_redundant_transactions,
+)
+from app.models.account import Account
 from app.models.plaid import PlaidItem
+from app.models.transaction import Transaction
+from app.schemas.transaction import NewTransactionSchema
+from app.services.plaid import PlaidService
 
 
 def store_access_token(
@@ -27,3 +35,60 @@ def store_access_token(
     db.refresh(plaid_item)
 
     return plaid_item
+
+
+def sync_plaid_transactions(
+    account: Account,
+    start_date: datetime | None,
+    end_date: datetime | None,
+    db: Session,
+) -> list[Transaction]:
+    """
+    Sync the Transactions of an Account (which is linked to Plaid) from
+    Plaid, and update the last refresh time of its PlaidItem.
+
+    Args:
+        account: The Account to sync Transactions for.
+        start_date: The start date of the time period to sync. If not
+            provided, the date of the last sync is used.
+        end_date: The end date of the time period to sync. If not
+            provided, the current date is used.
+        db: The database session.
+
+    Returns:
+        A list of the new Transactions.
+    """
+
+    plaid_item = account.plaid_item
+
+    # Create new Transactions in the database; remove redundant ones
+    new_transactions = remove_redundant_transactions(
+        [
+            NewTransactionSchema(
+                account_id=account.id,
+                date=transaction['date'],
+                description=transaction['name'],
+                amount=transaction['amount'],
+                plaid_transaction_id=transaction['id']
+            )
+            for transaction in PlaidService().get_transactions(
+                access_token=plaid_item.access_token,
+                account_ids=[account.plaid_account_id],
+                start_date=start_date or plaid_item.last_refresh,
+                end_date=end_date,
+            )
+        ],
+        db
+    )
+    transactions = add_transactions_to_database(new_transactions, db)
+
+    # Update last refresh time to the most recent Transaction date
+    if account.most_recent_transaction is None:
+        plaid_item.last_refresh = datetime.now()
+    else:
+        plaid_item.last_refresh = datetime.combine(
+            account.most_recent_transaction.date, datetime.min.time()
+        )
+    db.commit()
+
+    return transactions
@@ -0,0 +1,115 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from app.core.dates import get_frequency_dates
+
+if TYPE_CHECKING:
+    from app.models.account import Account
+
+
+class _CardCursor(NamedTuple):
+    """The last computed (end of day) balance of a credit card."""
+    date: date
+    balance: float
+
+
+class ProjectionContext:
+    """
+    Evaluation context shared by all models within a single projection.
+    This caches the running balance of credit card Accounts so that
+    payoff Transfers do not recompute the card balance from the most
+    recent Balance on every occurrence.
+    """
+
+    def __init__(self) -> None:
+        self._card_balances: dict[tuple[int, date], float] = {}
+        self._card_cursors: dict[int, _CardCursor] = {}
+
+
+    def get_card_balance(self, account: 'Account', target_date: date, /) -> float:
+        """
+        Get the balance of a (credit card) Account on a specific date.
+        This only accounts for Bills from the Account, not Incomes or
+        Transfers - except payoff Transfers, which reset the balance to
+        zero after they occur.
+
+        Args:
+            account: The Account to get the balance of.
+            target_date: The date to get the balance for.
+
+        Returns:
+            The projected balance for the Account on the given date,
+            before any payoff on that date.
+        """
+
+        if (key := (account.id, target_date)) in self._card_balances:
+            return self._card_balances[key]
+
+        # Advance from the last computed date if possible; otherwise
+        # start from the most recent Balance
+        cursor = self._card_cursors.get(account.id)
+        if cursor is None or cursor.date > target_date:
+            cursor = self._get_initial_cursor(account, target_date)
+
+        # Get all Bills, payoffs, and real Balances since the cursor
+        start = cursor.date + timedelta(days=1)
+        changes: dict[date, float] = defaultdict(float)
+        for bill in account.bills:
+            for date_, amount in bill.get_occurrences(start, target_date):
+                changes[date_] += amount
+        payoffs = {
+            date_
+            for transfer in account.incoming_transfers
+            if transfer.payoff_balance
+            for date_ in get_frequency_dates(
+                transfer.start_date,
+                transfer.frequency,
+                start,
+                target_date,
+                end_date=transfer.end_date,
+            )
+        }
+        anchors = {
+            balance.date: balance.balance
+            for balance in account.balances
+            if start <= balance.date <= target_date
+        }
+
+        # Walk each relevant date, caching the balance at each payoff
+        balance = cursor.balance
+        for date_ in sorted(changes.keys() | payoffs | anchors.keys()):
+            balance += changes.get(date_, 0.0)
+            if date_ in payoffs:
+                self._card_balances[(account.id, date_)] = balance
+                balance = 0.0
+            if date_ in anchors:
+                balance = anchors[date_]
+
+        self._card_balances.setdefault(key, balance)
+        self._card_cursors[account.id] = _CardCursor(target_date, balance)
+
+        return self._card_balances[key]
+
+
+    @staticmethod
+    def _get_initial_cursor(account: 'Account', target_date: date) -> _CardCursor:
+        """
+        Get the cursor to start computing the balance of the Account
+        from - this is the most recent Balance on or before the target
+        date.
+        """
+
+        # Balances are ordered by descending date
+        for balance in account.balances:
+            if balance.date <= target_date:
+                return _CardCursor(balance.date, balance.balance)
+
+        # No Balance, start at zero before the first Bill
+        first_date = min(
+            (bill.start_date for bill in account.bills), default=target_date
+        )
+
+        return _CardCursor(
+            min(first_date, target_date) - timedelta(days=1), 0.0
+        )
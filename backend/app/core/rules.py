@@ -0,0 +1,441 @@
+from collections import deque
+from datetime import date
+from re import (
+    DOTALL,
+    IGNORECASE,
+    Pattern,
+    compile as regex_compile,
+    error as RegexError,
+    escape,
+)
+from string import ascii_lowercase, ascii_uppercase
+from operator import attrgetter
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.bill import Bill
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.transaction import Transaction
+from app.models.transfer import Transfer
+from app.schemas.core import TransactionFilter
+from app.utils.logging import log
+
+
+RuleItem = Bill | Expense | Income | Transfer
+
+# Models are assigned in this order, so earlier types take precedence
+_RULE_FIELDS: dict[type[RuleItem], str] = {
+    Bill: 'bill_id',
+    Expense: 'expense_id',
+    Income: 'income_id',
+    Transfer: 'transfer_id',
+}
+
+# Fields associating a Transaction with a Bill/Expense/Income/Transfer
+ASSOCIATION_FIELDS = tuple(_RULE_FIELDS.values())
+
+# SQLite LIKE is only case insensitive for ASCII characters
+_ASCII_LOWER = str.maketrans(ascii_uppercase, ascii_lowercase)
+
+# Number of Transactions fetched from the database at a time
+_BATCH_SIZE = 10_000
+
+
+class _SubstringMatcher:
+    """
+    Aho-Corasick automaton which finds every one of a set of substrings
+    that occurs in a text in a single pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        # Trie of the patterns, with the patterns ending at each state
+        self._goto: list[dict[str, int]] = [{}]
+        self._outputs: list[frozenset[str]] = [frozenset()]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._outputs.append(frozenset())
+                state = self._goto[state][char]
+            self._outputs[state] |= {pattern}
+
+        # Add the failure transitions breadth first, so that each state
+        # has a transition for every character which leads anywhere but
+        # the root, and outputs every pattern which is a suffix of it.
+        # States one character deep fail to the root.
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in list(self._goto[state].items()):
+                queue.append(child)
+                # The failure state already has all of its transitions
+                fail[child] = self._goto[fail[state]].get(char, 0)
+                self._outputs[child] |= self._outputs[fail[child]]
+            for char, target in self._goto[fail[state]].items():
+                self._goto[state].setdefault(char, target)
+
+
+    def find(self, text: str, /) -> set[str]:
+        """Find every pattern which occurs in the given text."""
+
+        found = set()
+        goto, outputs = self._goto, self._outputs
+        state = 0
+        for char in text:
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+
+        return found
+
+
+class _Rule(NamedTuple):
+    """Account and date constraints of a Bill/Expense/Income/Transfer."""
+    field: str
+    id: int
+    account_ids: frozenset[int] | None
+    start_date: date | None
+    end_date: date | None
+
+
+    def accepts(self, account_id: int, date_: date, /) -> bool:
+        """Whether a Transaction is in the Account(s) and date range."""
+
+        return (
+            (self.account_ids is None or account_id in self.account_ids)
+            and (self.start_date is None or date_ >= self.start_date)
+            and (self.end_date is None or date_ <= self.end_date)
+        )
+
+
+class _Check(NamedTuple):
+    """
+    A single compiled Transaction filter. Substring filters are checked
+    against the matches found by the field's automaton; everything else
+    with a compiled pattern.
+    """
+    on: str
+    substring: str | None
+    pattern: Pattern[str] | None
+    # Whether the pattern is a LIKE pattern on the lowercased field
+    lowercase: bool
+
+
+class _Group(NamedTuple):
+    """Filters which must all match, for the rule in the given position."""
+    order: int
+    rule: _Rule
+    checks: tuple[_Check, ...]
+
+
+_get_order = attrgetter('order')
+
+
+class TransactionRuleEngine:
+    """
+    The Transaction filters of Bills, Expenses, Incomes, and Transfers
+    compiled into a single matcher, in their order of precedence. All
+    substring filters on a field are searched for at once, and each
+    filter group is only evaluated for Transactions in its Account(s)
+    when one of its substrings is found (or when it has none).
+    """
+
+    def __init__(self, items: Iterable[RuleItem]) -> None:
+        substrings: dict[str, set[str]] = {}
+        # Groups keyed by their Account (or None for any Account), and
+        # the field and substring which triggers them
+        self._triggers: dict[tuple[int | None, str, str], list[_Group]] = {}
+        self._untriggered: dict[int | None, list[_Group]] = {}
+
+        order = 0
+        for item in items:
+            if not item.transaction_filters:
+                continue
+            if isinstance(item, Expense) and not item.is_active:
+                continue
+
+            rule = _get_rule(item)
+            for filter_group in item.transaction_filters:
+                checks = tuple(
+                    _compile_check(TransactionFilter.model_validate(filter))
+                    for filter in filter_group
+                )
+                group = _Group(order, rule, checks)
+                order += 1
+                accounts = rule.account_ids or (None,)
+
+                # The longest substring is the least likely to occur
+                substring_checks = [
+                    check for check in checks if check.substring is not None
+                ]
+                if not substring_checks:
+                    for account in accounts:
+                        self._untriggered.setdefault(account, []).append(group)
+                    continue
+                trigger = max(
+                    substring_checks, key=lambda check: len(check.substring)
+                )
+                for account in accounts:
+                    self._triggers.setdefault(
+                        (account, trigger.on, trigger.substring), []
+                    ).append(group)
+                for check in substring_checks:
+                    substrings.setdefault(check.on, set()).add(check.substring)
+
+        self._matchers = {
+            on: _SubstringMatcher(patterns)
+            for on, patterns in substrings.items()
+        }
+        self._size = order
+
+
+    def __len__(self) -> int:
+        """The number of compiled filter groups."""
+
+        return self._size
+
+
+    @property
+    def account_ids(self) -> set[int] | None:
+        """
+        The IDs of all Accounts which any rule can match Transactions
+        in, or None if a rule can match Transactions in any Account.
+        """
+
+        accounts = {
+            account
+            for account, _, _ in self._triggers
+        } | self._untriggered.keys()
+
+        return None if None in accounts else accounts
+
+
+    def match(
+        self,
+        account_id: int,
+        date_: date,
+        amount: float,
+        description: str | None,
+        note: str | None,
+    ) -> _Rule | None:
+        """
+        Find the first rule whose filters match a Transaction.
+
+        Args:
+            account_id: The ID of the Account of the Transaction.
+            date_: The date of the Transaction.
+            amount: The amount of the Transaction.
+            description: The description of the Transaction.
+            note: The note of the Transaction.
+
+        Returns:
+            The matching rule (with the field and ID to associate the
+            Transaction with), or None if no rule matches.
+        """
+
+        values = {
+            'amount': _sqlite_text(amount),
+            'description': description,
+            'note': note,
+        }
+
+        # Lowercased values and their substrings are computed on demand
+        lowered: dict[str, str | None] = {}
+        found: dict[str, set[str]] = {}
+        for on, matcher in self._matchers.items():
+            if (value := values[on]) is not None:
+                lowered[on] = value.translate(_ASCII_LOWER)
+                found[on] = matcher.find(lowered[on])
+
+        candidates = [
+            *self._untriggered.get(account_id, ()),
+            *self._untriggered.get(None, ()),
+        ]
+        for on, substrings in found.items():
+            for substring in substrings:
+                for account in (account_id, None):
+                    candidates.extend(
+                        self._triggers.get((account, on, substring), ())
+                    )
+
+        # The first matching group has the highest precedence
+        candidates.sort(key=_get_order)
+        for group in candidates:
+            if (group.rule.accepts(account_id, date_)
+                and all(
+                    _matches(check, values, lowered, found)
+                    for check in group.checks
+                )):
+                return group.rule
+
+        return None
+
+
+def get_rule_items(db: Session) -> list[RuleItem]:
+    """
+    Get every Bill, Expense, Income, and Transfer in their order of
+    precedence for associating Transactions: Bills, then Expenses,
+    Incomes, and Transfers, each by ID.
+    """
+
+    return [
+        item
+        for model in _RULE_FIELDS
+        for item in db.query(model).order_by(model.id)
+    ]
+
+
+def apply_transaction_rules(
+    db: Session,
+    items: list[RuleItem] | None = None,
+) -> int:
+    """
+    Apply the Transaction filters of Bills, Expenses, Incomes, and
+    Transfers to all unassociated Transactions in a single pass. Each
+    Transaction is associated with the first matching item, in the same
+    order of precedence as applying each item's filters in turn.
+
+    Args:
+        db: The database session.
+        items: The items whose filters to apply, in order of precedence.
+            If None, the filters of every item are applied.
+
+    Returns:
+        The number of Transactions which were associated.
+    """
+
+    engine = TransactionRuleEngine(
+        get_rule_items(db) if items is None else items
+    )
+    if not engine:
+        return 0
+
+    # Only Transactions in Accounts which a rule can match are evaluated
+    unassociated = [
+        getattr(Transaction, field).is_(None) for field in ASSOCIATION_FIELDS
+    ]
+    if (account_ids := engine.account_ids) is not None:
+        unassociated.append(Transaction.account_id.in_(account_ids))
+
+    rows = db.execute(
+        select(
+            Transaction.id,
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.amount,
+            Transaction.description,
+            Transaction.note,
+        )
+        .where(*unassociated)
+        .execution_options(yield_per=_BATCH_SIZE)
+    )
+
+    assignments = []
+    for id_, account_id, date_, amount, description, note in rows:
+        rule = engine.match(account_id, date_, amount, description, note)
+        if rule is not None:
+            assignments.append(
+                dict.fromkeys(ASSOCIATION_FIELDS) | {'id': id_, rule.field: rule.id}
+            )
+
+    # Bulk UPDATE by primary key
+    if assignments:
+        db.execute(update(Transaction), assignments)
+    db.commit()
+
+    return len(assignments)
+
+
+def get_rule_key(model: RuleItem, /) -> tuple:
+    """
+    Get everything about a model which determines the Transactions its
+    filters match: the filters themselves, and its Account(s) and dates.
+    Transactions only need to be evaluated again when this changes.
+    """
+
+    return _get_rule(model), model.transaction_filters
+
+
+def _get_rule(model: RuleItem, /) -> _Rule:
+    """Get the Account and date constraints of a model."""
+
+    field = _RULE_FIELDS[type(model)]
+    if isinstance(model, Expense):
+        return _Rule(field, model.id, None, None, None)
+    if isinstance(model, Transfer):
+        account_ids = frozenset({model.from_account_id, model.to_account_id})
+    else:
+        account_ids = frozenset({model.account_id})
+
+    return _Rule(field, model.id, account_ids, model.start_date, model.end_date)
+
+
+def _compile_check(filter: TransactionFilter, /) -> _Check:
+    """
+    Compile a Transaction filter with the same semantics as the SQL
+    filter: regex filters match the start of the field ignoring case,
+    and all other filters are a LIKE '%value%' ignoring ASCII case.
+    """
+
+    if filter.type == 'regex':
+        try:
+            pattern = regex_compile(filter.value, IGNORECASE)
+        except RegexError as e:
+            log.warning(f'Invalid regex pattern {filter.value!r}: {e}')
+            pattern = None
+        return _Check(filter.on, None, pattern, lowercase=False)
+
+    value = filter.value.translate(_ASCII_LOWER)
+    if '%' not in value and '_' not in value:
+        return _Check(filter.on, value, None, lowercase=True)
+
+    # LIKE wildcards in the value are translated to a regex
+    pattern = ''.join(
+        '.*' if char == '%' else '.' if char == '_' else escape(char)
+        for char in value
+    )
+    return _Check(filter.on, None, regex_compile(pattern, DOTALL), lowercase=True)
+
+
+def _matches(
+    check: _Check,
+    values: dict[str, str | None],
+    lowered: dict[str, str | None],
+    found: dict[str, set[str]],
+) -> bool:
+    """Whether a compiled filter matches a Transaction's field values."""
+
+    if (value := values[check.on]) is None:
+        return False
+    if check.substring is not None:
+        return check.substring in found.get(check.on, ())
+    if check.pattern is None:
+        return False
+    if check.lowercase:
+        if (lowered_value := lowered.get(check.on)) is None:
+            lowered_value = lowered[check.on] = value.translate(_ASCII_LOWER)
+        return check.pattern.search(lowered_value) is not None
+
+    return check.pattern.match(value) is not None
+
+
+def _sqlite_text(value: float | None, /) -> str | None:
+    """Format a float the same way SQLite converts a REAL to text."""
+
+    if value is None:
+        return None
+
+    text = f'{value:.15g}'
+    if text in ('inf', '-inf', 'nan'):
+        return text
+    mantissa, exponent = (text.split('e') + [''])[:2]
+    if '.' not in mantissa:
+        mantissa += '.0'
+
+    return f'{mantissa}e{exponent}' if exponent else mantissa
@@ -0,0 +1,272 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.balance import get_starting_balance
+from app.core.projection import ProjectionContext
+from app.db.query import require_account
+from app.schemas.balance import NewScenarioSchema
+
+
+# Kinds of occurrences, which are perturbed differently
+_BILL, _INCOME, _TRANSFER = 0, 1, 2
+
+# Maximum number of (path, day) balances held in memory per chunk
+_CHUNK_CELLS = 4_000_000
+
+_PERCENTILES = (5, 50, 95)
+
+
+class _Paths(NamedTuple):
+    """Parameters shared by every chunk of a simulation."""
+    count: int
+    bill_volatility: float
+    income_volatility: float
+    # Annual growth of each Income on each path
+    growth: np.ndarray
+
+
+class _Chunk(NamedTuple):
+    """A contiguous range of simulated days and their occurrences."""
+    days: int
+    indices: np.ndarray
+    amounts: np.ndarray
+    kinds: np.ndarray
+    incomes: np.ndarray
+    years: np.ndarray
+    anchor_indices: np.ndarray
+    anchor_values: np.ndarray
+    seed: np.random.SeedSequence
+
+
+def simulate_balances(
+    account_id: int,
+    scenario: NewScenarioSchema,
+    db: Session,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate many stochastic paths of the daily balance of an account,
+    and get percentile bands of the balance on every day. This follows
+    the semantics of `get_projected_balance`, except that every Bill and
+    Income occurrence is scaled by random (mean-preserving, lognormal)
+    noise, and every Income grows at a random rate on each path.
+    Transfers are not perturbed.
+
+    Days are simulated in chunks of all paths, so memory is bounded by
+    the chunk size rather than the number of days. If the scenario has
+    multiple workers, chunks are simulated in a process pool.
+
+    Args:
+        account_id: The ID of the account to simulate the balances of.
+        scenario: The parameters of the simulation.
+        db: The database session.
+
+    Returns:
+        Tuple of the dates (as `datetime64[D]`) and the 5th, 50th, and
+        95th percentile balance on each date (as a 3 x days array).
+    """
+
+    start_date, end_date = scenario.start_date, scenario.end_date
+    dates = np.arange(
+        np.datetime64(start_date, 'D'),
+        np.datetime64(end_date, 'D') + 1,
+    )
+
+    # Simulate every day from the starting balance, which is on or before
+    # the start date (and is the balance of every path on that day)
+    starting_balance, starting_date = get_starting_balance(
+        account_id, start_date, db
+    )
+    account = require_account(db, account_id, raise_exception=True)
+    first_date = starting_date + timedelta(days=1)
+    origin = min(starting_date, start_date).toordinal()
+    total_days = end_date.toordinal() - origin + 1
+
+    # Gather all occurrences, and which kind and Income each is from
+    context = ProjectionContext()
+    occurrences: list[tuple[int, float, int, int]] = []
+    for bill in account.bills:
+        occurrences.extend(
+            (date_.toordinal() - origin, amount, _BILL, -1)
+            for date_, amount in bill.get_occurrences(first_date, end_date)
+        )
+    for index, income in enumerate(account.incomes):
+        occurrences.extend(
+            (date_.toordinal() - origin, amount, _INCOME, index)
+            for date_, amount in income.get_occurrences(first_date, end_date)
+        )
+    for transfer in account.outgoing_transfers + account.incoming_transfers:
+        occurrences.extend(
+            (date_.toordinal() - origin, amount, _TRANSFER, -1)
+            for date_, amount in transfer.get_occurrences(
+                first_date, end_date, account.id, context
+            )
+        )
+    occurrences.sort()
+    if occurrences:
+        indices, amounts, kinds, incomes = map(np.array, zip(*occurrences))
+    else:
+        indices = kinds = incomes = np.zeros(0, dtype=np.int64)
+        amounts = np.zeros(0, dtype=np.float64)
+    years = indices / 365.25
+
+    # Real Balances after the starting balance override the simulation
+    anchors = sorted(
+        (balance.date.toordinal() - origin, balance.balance)
+        for balance in account.balances
+        if first_date <= balance.date <= end_date
+    )
+    anchor_indices = np.array([index for index, _ in anchors], dtype=np.int64)
+    anchor_values = np.array([value for _, value in anchors], dtype=np.float64)
+
+    # Divide the days into chunks, each with independent random draws
+    chunk_days = _get_chunk_days(scenario.paths, total_days, scenario.workers)
+    chunk_starts = range(0, total_days, chunk_days)
+    growth_seed, *chunk_seeds = np.random.SeedSequence(scenario.seed).spawn(
+        1 + len(chunk_starts)
+    )
+    chunks = []
+    for chunk_seed, start in zip(chunk_seeds, chunk_starts):
+        end = min(start + chunk_days, total_days)
+        occurrence_slice = slice(*np.searchsorted(indices, [start, end]))
+        anchor_slice = slice(*np.searchsorted(anchor_indices, [start, end]))
+        chunks.append(_Chunk(
+            days=end - start,
+            indices=indices[occurrence_slice] - start,
+            amounts=amounts[occurrence_slice],
+            kinds=kinds[occurrence_slice],
+            incomes=incomes[occurrence_slice],
+            years=years[occurrence_slice],
+            anchor_indices=anchor_indices[anchor_slice] - start,
+            anchor_values=anchor_values[anchor_slice],
+            seed=chunk_seed,
+        ))
+
+    paths = _Paths(
+        count=scenario.paths,
+        bill_volatility=scenario.bill_volatility,
+        income_volatility=scenario.income_volatility,
+        growth=np.random.default_rng(growth_seed).normal(
+            0.0, scenario.raise_volatility, (scenario.paths, len(account.incomes)),
+        ),
+    )
+
+    carry = np.full(paths.count, starting_balance)
+    if scenario.workers == 1 or len(chunks) == 1:
+        percentiles = []
+        for chunk in chunks:
+            chunk_percentiles, carry = _simulate_chunk(paths, chunk, carry)
+            percentiles.append(chunk_percentiles)
+    else:
+        # Simulate the end of every chunk relative to its start, then
+        # accumulate the starting balance of each chunk from these
+        with ProcessPoolExecutor(max_workers=scenario.workers) as executor:
+            carries = []
+            for resets, ending in executor.map(
+                _simulate_chunk_ending, [paths] * len(chunks), chunks,
+            ):
+                carries.append(carry)
+                carry = ending if resets else carry + ending
+            percentiles = [
+                chunk_percentiles
+                for chunk_percentiles, _ in executor.map(
+                    _simulate_chunk, [paths] * len(chunks), chunks, carries,
+                )
+            ]
+
+    # Only return the requested days
+    offset = start_date.toordinal() - origin
+
+    return dates, np.concatenate(percentiles, axis=1)[:, offset:]
+
+
+def _get_chunk_days(paths: int, total_days: int, workers: int) -> int:
+    """
+    Get how many days to simulate per chunk, so that each chunk is
+    bounded in size and every worker has at least one chunk.
+    """
+
+    return max(1, min(_CHUNK_CELLS // paths, -(-total_days // workers)))
+
+
+def _simulate_deltas(paths: _Paths, chunk: _Chunk) -> np.ndarray:
+    """Simulate the change in balance on every day of a chunk."""
+
+    deltas = np.zeros((paths.count, chunk.days))
+    if not len(chunk.indices):
+        return deltas
+
+    # Scale each Bill and Income occurrence by mean-one lognormal noise
+    rng = np.random.default_rng(chunk.seed)
+    volatility = np.select(
+        [chunk.kinds == _BILL, chunk.kinds == _INCOME],
+        [paths.bill_volatility, paths.income_volatility],
+        0.0,
+    )
+    amounts = chunk.amounts * np.exp(
+        volatility * rng.standard_normal((paths.count, len(chunk.indices)))
+        - volatility ** 2 / 2
+    )
+
+    # Grow each Income occurrence at its path's rate
+    if (is_income := chunk.kinds == _INCOME).any():
+        amounts[:, is_income] *= np.exp(
+            paths.growth[:, chunk.incomes[is_income]] * chunk.years[is_income]
+        )
+
+    # Occurrences are sorted by day, so total each day's occurrences
+    days, starts = np.unique(chunk.indices, return_index=True)
+    deltas[:, days] = np.add.reduceat(amounts, starts, axis=1)
+
+    return deltas
+
+
+def _simulate_chunk(
+    paths: _Paths,
+    chunk: _Chunk,
+    carry: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate the balance of every path on every day of a chunk, given
+    the balance of each path on the day before the chunk.
+
+    Returns:
+        Tuple of the percentile balances on each day of the chunk, and
+        the balance of each path on the last day of the chunk.
+    """
+
+    balances = carry[:, np.newaxis] + np.cumsum(
+        _simulate_deltas(paths, chunk), axis=1
+    )
+    for index, value in zip(chunk.anchor_indices, chunk.anchor_values):
+        balances[:, index:] += (value - balances[:, index])[:, np.newaxis]
+
+    return np.percentile(balances, _PERCENTILES, axis=0), balances[:, -1]
+
+
+def _simulate_chunk_ending(
+    paths: _Paths,
+    chunk: _Chunk,
+) -> tuple[bool, np.ndarray]:
+    """
+    Simulate the balance of every path on the last day of a chunk,
+    independent of the balance before the chunk.
+
+    Returns:
+        Tuple of whether the chunk resets the balance (with a real
+        Balance), and the balance of each path on the last day of the
+        chunk - either absolute if reset, or relative to the balance on
+        the day before the chunk.
+    """
+
+    deltas = _simulate_deltas(paths, chunk)
+    if not len(chunk.anchor_indices):
+        return False, deltas.sum(axis=1)
+
+    last_anchor = chunk.anchor_indices[-1]
+    return True, (
+        chunk.anchor_values[-1] + deltas[:, last_anchor + 1:].sum(axis=1)
+    )
@@ -0,0 +1,144 @@
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from app.core.dates import get_frequency_dates
+from app.schemas.bill import BillChangeItemDict
+from app.schemas.income import RaiseItemDict
+
+
+_ScheduleItem = BillChangeItemDict | RaiseItemDict
+
+# An amount transformation of `amount * multiplier + offset`
+_Transform = tuple[float, float]
+_IDENTITY: _Transform = (1.0, 0.0)
+
+
+def _compose(transform: _Transform, item: _ScheduleItem, /) -> _Transform:
+    """Apply the given schedule item after the given transformation."""
+
+    multiplier, offset = transform
+    if item['is_percentage']:
+        return multiplier * item['amount'], offset * item['amount']
+    return multiplier, offset + item['amount']
+
+
+class CompiledSchedule:
+    """
+    Change or raise schedule compiled into sorted breakpoints. Between
+    two consecutive breakpoints the same schedule items are active, so
+    the combined effect of all of those items is precomputed as a single
+    multiplier and offset, and looked up by date with a binary search.
+    """
+
+    def __init__(self, schedule: list[_ScheduleItem]) -> None:
+        # The schedule this was compiled from, to detect replacements
+        self.source = schedule
+
+        # An item is active from its start date through its end date
+        breakpoints = set()
+        for item in schedule:
+            breakpoints.add(item['start_date'])
+            if item['end_date'] is not None and item['end_date'] < date.max:
+                breakpoints.add(item['end_date'] + timedelta(days=1))
+        self._breakpoints = sorted(breakpoints)
+
+        # Items are applied in the order of the schedule
+        self._transforms: list[_Transform] = []
+        for breakpoint_ in self._breakpoints:
+            transform = _IDENTITY
+            for item in schedule:
+                if (item['start_date'] <= breakpoint_
+                    and (item['end_date'] is None
+                         or item['end_date'] >= breakpoint_)):
+                    transform = _compose(transform, item)
+            self._transforms.append(transform)
+
+
+    def apply(self, amount: float, date_: date, /) -> float:
+        """
+        Apply all schedule items active on the given date to an amount.
+
+        Args:
+            amount: The base amount to apply the schedule to.
+            date_: The date to apply the schedule on.
+
+        Returns:
+            The scheduled amount.
+        """
+
+        if (index := bisect_right(self._breakpoints, date_) - 1) < 0:
+            return amount
+
+        multiplier, offset = self._transforms[index]
+        return amount * multiplier + offset
+
+
+class CompiledRaises:
+    """
+    Raise schedule compiled into the cumulative effect of every raise
+    occurrence since a start date. Each (possibly recurring) raise is
+    applied on every date it occurs, so the occurrences are sorted and
+    prefix-composed into a multiplier and offset, and looked up by date
+    with a binary search. Occurrences are only generated as far as the
+    latest date looked up.
+    """
+
+    def __init__(self, schedule: list[RaiseItemDict], start_date: date) -> None:
+        # The schedule and start date this was compiled from
+        self.source = schedule
+        self.start_date = start_date
+
+        self._dates: list[date] = []
+        self._transforms: list[_Transform] = []
+        self._horizon = start_date - timedelta(days=1)
+
+
+    def apply(self, amount: float, date_: date, /) -> float:
+        """
+        Apply every raise occurrence from the start date through the
+        given date to an amount.
+
+        Args:
+            amount: The base amount to apply the raises to.
+            date_: The last date (inclusive) to apply raises on.
+
+        Returns:
+            The raised amount.
+        """
+
+        if date_ > self._horizon:
+            self._extend(date_)
+
+        if (index := bisect_right(self._dates, date_) - 1) < 0:
+            return amount
+
+        multiplier, offset = self._transforms[index]
+        return amount * multiplier + offset
+
+
+    def _extend(self, horizon: date) -> None:
+        """Compile all raise occurrences through the given date."""
+
+        # Raises on the same date are applied in the order of the schedule
+        occurrences = sorted(
+            (date_, index)
+            for index, raise_ in enumerate(self.source)
+            for date_ in get_frequency_dates(
+                raise_['start_date'],
+                raise_['frequency'],
+                self._horizon + timedelta(days=1),
+                horizon,
+                end_date=raise_['end_date'],
+            )
+        )
+
+        transform = self._transforms[-1] if self._transforms else _IDENTITY
+        for date_, index in occurrences:
+            transform = _compose(transform, self.source[index])
+            if self._dates and self._dates[-1] == date_:
+                self._transforms[-1] = transform
+            else:
+                self._dates.append(date_)
+                self._transforms.append(transform)
+
+        self._horizon = horizon
@@ -0,0 +1,100 @@
+from gzip import GzipFile, open as gzip_open
+from hashlib import sha256 as sha256_hash
+from os import replace
+from pathlib import Path
+from shutil import copyfileobj
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO
+
+from app.core.config import settings
+
+
+# Number of bytes of an uploaded file which are copied at a time
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _HashingReader:
+    """
+    Wraps a binary stream, hashing (and counting) every byte read from
+    it, so that a file can be hashed while it is being compressed.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.hash = sha256_hash()
+        self.size = 0
+
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.hash.update(data)
+        self.size += len(data)
+
+        return data
+
+
+def get_upload_path(sha256: str) -> Path:
+    """
+    Get the path of the stored (gzip compressed) data with the given
+    SHA-256 hash. Data is stored in a subdirectory of the first two
+    characters of the hash, so no single directory grows too large.
+    """
+
+    return Path(settings.UPLOAD_DIRECTORY) / sha256[:2] / f'{sha256}.gz'
+
+
+def store_upload_data(stream: BinaryIO) -> tuple[str, int]:
+    """
+    Store the data of an Upload in the content-addressed upload store.
+    The data is hashed and compressed in a single pass, one chunk at a
+    time, and is only moved to its final path once it is complete. Data
+    which is already stored is not stored again.
+
+    Args:
+        stream: The binary stream of the data to store. This is read
+            from its current position to the end.
+
+    Returns:
+        The SHA-256 hash (hex) and size (in bytes) of the stored data.
+    """
+
+    directory = Path(settings.UPLOAD_DIRECTORY)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    reader = _HashingReader(stream)
+    with NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as file:
+        try:
+            # The mtime is fixed so identical data compresses identically
+            with GzipFile(fileobj=file, mode='wb', mtime=0) as compressed:
+                copyfileobj(reader, compressed, _COPY_CHUNK_SIZE) # type: ignore
+        except BaseException:
+            Path(file.name).unlink(missing_ok=True)
+            raise
+
+    sha256 = reader.hash.hexdigest()
+    path = get_upload_path(sha256)
+    if path.exists():
+        Path(file.name).unlink()
+    else:
+        path.parent.mkdir(exist_ok=True)
+        replace(file.name, path)
+
+    return sha256, reader.size
+
+
+def open_upload_data(sha256: str) -> BinaryIO:
+    """
+    Open the stored data with the given SHA-256 hash, which is
+    decompressed as it is read.
+
+    Args:
+        sha256: The SHA-256 hash (hex) of the data to open.
+
+    Returns:
+        The binary stream of the (decompressed) data.
+
+    Raises:
+        FileNotFoundError: If there is no stored data with the hash.
+    """
+
+    return gzip_open(get_upload_path(sha256), 'rb') # type: ignore
@@ -1,7 +1,29 @@
-from sqlalchemy import and_, func, or_, true, false
-from sqlalchemy.orm import Query, Session
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import date
+from re import findall
+from typing import Literal
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    Row,
+    and_,
+    case,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    true,
+    false,
+    tuple_,
+)
+from sqlalchemy.orm import Query, Session, aliased, selectinload
 from sqlalchemy.sql.elements import ColumnElement
 
+from app.models.account import Account
 from app.models.bill import Bill
 from app.models.income import Income
 from app.models.expense import Expense
@@ -16,6 +38,10 @@ FIELDS = {
     'note': Transaction.note,
 }
 
+# SQLite FTS5 index of Transaction descriptions and notes, kept in sync
+# by triggers (see the add_transaction_search migration)
+TRANSACTIONS_FTS = table('transactions_fts', column('rowid'), column('rank'))
+
 
 def _get_account_filter(
     model: Bill | Expense | Income | Transfer,
@@ -166,3 +192,317 @@ def apply_transaction_filters(
                 _get_unassociated_filter(model, include_currently_selected),
             )
     )
+
+
+def get_transaction_loader_options(*, account: bool = True) -> list:
+    """
+    Get the loader options which batch load everything serialized in a
+    Transaction response, so that any number of Transactions are loaded
+    and serialized in a fixed number of queries.
+
+    Args:
+        account: Whether to load everything serialized by a
+            ReturnTransactionSchema, rather than only the related
+            Transactions serialized by ReturnTransactionSchemaNoAccount.
+
+    Returns:
+        The loader options to query Transactions with.
+    """
+
+    options = [
+        selectinload(Transaction.related_transactions),
+        selectinload(Transaction.related_to_transactions),
+    ]
+    if not account:
+        return options
+
+    # Accounts serialize their last Balance and Plaid item
+    def load_account(loader, /):
+        return loader.options(
+            selectinload(Account.balances),
+            selectinload(Account.plaid_item),
+        )
+
+    return options + [
+        load_account(selectinload(Transaction.account)),
+        load_account(selectinload(Transaction.bill).selectinload(Bill.account)),
+        selectinload(Transaction.expense),
+        load_account(
+            selectinload(Transaction.income).selectinload(Income.account)
+        ),
+    ]
+
+
+def get_search_expression(text: str) -> str | None:
+    """
+    Get the FTS5 query matching Transactions with a word starting with
+    each word of the given text.
+
+    Args:
+        text: The text to search for.
+
+    Returns:
+        The FTS5 query, or None if the text has no words.
+    """
+
+    if not (words := findall(r'\w+', text)):
+        return None
+
+    # Quote each word so it is never parsed as an FTS5 operator
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def apply_transaction_search(
+    query: Query[Transaction],
+    text: str,
+    db: Session,
+    *,
+    rank: bool = False,
+) -> Query[Transaction]:
+    """
+    Filter a query of Transactions to those whose description or note
+    contains the given text. On SQLite this uses the full-text index,
+    matching words which start with every word of the text; otherwise
+    (or if the text has no words) this falls back to a substring match.
+
+    Args:
+        query: The query of Transactions to filter.
+        text: The text to search for.
+        db: The database session.
+        rank: Whether to order the Transactions by relevance (before any
+            other ordering). Only supported with the full-text index.
+
+    Returns:
+        The filtered query.
+    """
+
+    expression = get_search_expression(text)
+    if db.get_bind().dialect.name != 'sqlite' or expression is None:
+        return query.filter(or_(
+            Transaction.description.contains(text),
+            Transaction.note.contains(text),
+        ))
+
+    query = (
+        query
+            .join(TRANSACTIONS_FTS, TRANSACTIONS_FTS.c.rowid == Transaction.id)
+            .filter(literal_column('transactions_fts').op('MATCH')(expression))
+    )
+    if rank:
+        query = query.order_by(TRANSACTIONS_FTS.c.rank)
+
+    return query
+
+
+def query_transactions(
+    account_ids: list[int] | None,
+    contains: str | None,
+    unassigned_only: bool,
+    db: Session,
+    *,
+    rank: bool = False,
+) -> Query[Transaction]:
+    """
+    Query the Transactions which match the filters of the Transaction
+    listings.
+
+    Args:
+        account_ids: Optional Account IDs to filter by.
+        contains: Optional text to search for in the description or note.
+        unassigned_only: Whether to only include Transactions which are
+            not associated with any Bill, Expense, Income, or Transfer.
+        db: The database session.
+        rank: Whether to order searched Transactions by relevance.
+
+    Returns:
+        The (otherwise unordered) query of Transactions.
+    """
+
+    filters = []
+    if account_ids is not None:
+        filters.append(Transaction.account_id.in_(account_ids))
+    if unassigned_only:
+        filters.append(and_(
+            Transaction.bill_id.is_(None),
+            Transaction.expense_id.is_(None),
+            Transaction.income_id.is_(None),
+            Transaction.transfer_id.is_(None),
+        ))
+
+    query = db.query(Transaction).filter(and_(*filters))
+    if contains is not None:
+        query = apply_transaction_search(query, contains, db, rank=rank)
+
+    return query
+
+
+def encode_transaction_cursor(transaction: Transaction, /) -> str:
+    """
+    Get the opaque cursor of the page of Transactions (ordered by date
+    and ID, descending) which follows the given Transaction.
+    """
+
+    return urlsafe_b64encode(
+        f'{transaction.date.isoformat()}:{transaction.id}'.encode()
+    ).decode()
+
+
+def decode_transaction_cursor(cursor: str, /) -> tuple[date, int]:
+    """
+    Get the date and ID of the last Transaction before a cursor.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+
+    try:
+        date_, id_ = urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return date.fromisoformat(date_), int(id_)
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=422,
+            detail='Invalid cursor'
+        )
+
+
+def paginate_transactions_by_cursor(
+    query: Query[Transaction],
+    cursor: str | None,
+    size: int,
+    *,
+    include_total: bool = False,
+) -> tuple[list[Transaction], str | None, int | None]:
+    """
+    Get a page of a query of Transactions, ordered by date and ID
+    (descending). Rather than an offset, each page starts after the
+    (date, ID) of the last Transaction of the previous page, so every
+    page is equally fast to get with the date index.
+
+    Args:
+        query: The (unordered) query of Transactions to paginate.
+        cursor: The cursor of the page to get, or None for the first.
+        size: The maximum number of Transactions in the page.
+        include_total: Whether to count the total number of Transactions
+            in the query.
+
+    Returns:
+        Tuple of the Transactions in the page (with everything they
+        serialize loaded), the cursor of
+        the next page (or None if this is the last), and the total count
+        (or None if not included).
+    """
+
+    total = query.count() if include_total else None
+
+    if cursor is not None:
+        query = query.filter(
+            tuple_(Transaction.date, Transaction.id)
+            < tuple_(*decode_transaction_cursor(cursor))
+        )
+
+    # Get one extra Transaction to determine whether there is a next page
+    transactions = (
+        query
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .options(*get_transaction_loader_options())
+            .limit(size + 1)
+            .all()
+    )
+    if len(transactions) <= size:
+        return transactions, None, total
+
+    transactions = transactions[:size]
+    return transactions, encode_transaction_cursor(transactions[-1]), total
+
+
+def get_bill_breakdown(
+    account_id: int | Literal['all'],
+    start_date: date,
+    end_date: date,
+    db: Session,
+    *,
+    monthly: bool = False,
+) -> list[Row[tuple[str | None, str, float, int]]]:
+    """
+    Get the total amount and number of outgoing Transactions of an
+    Account (or all Accounts) in a date range, by the Bill, Expense, or
+    Transfer they are for, in a single aggregate query.
+
+    Transfers are only attributed to a Transfer which is from the Account
+    and active during the period; when getting all Accounts, Transfers
+    to credit Accounts are ignored entirely (as they are not spending).
+    All other Transactions are 'Uncategorized'.
+
+    Args:
+        account_id: The ID of the Account, or 'all' for all Accounts.
+        start_date: The first date (inclusive) of the range.
+        end_date: The last date (inclusive) of the range.
+        db: The database session.
+        monthly: Whether to aggregate each calendar month of the range
+            as a separate period, rather than the whole range.
+
+    Returns:
+        List of rows of the period ('YYYY-MM' if monthly, otherwise
+        None), name, total (positive) amount, and number of Transactions,
+        in descending order of total amount.
+    """
+
+    to_account = aliased(Account)
+    all_accounts = account_id == 'all'
+
+    # A Transfer is only attributed if it is active during the period
+    if monthly:
+        period = func.strftime('%Y-%m', Transaction.date)
+        month_start = func.date(Transaction.date, 'start of month')
+        period_start = func.max(month_start, literal(start_date.isoformat()))
+        period_end = func.min(
+            func.date(month_start, '+1 month', '-1 day'),
+            literal(end_date.isoformat()),
+        )
+    else:
+        period = literal(None)
+        period_start, period_end = start_date, end_date
+
+    name = case(
+        (Bill.id.is_not(None), Bill.name),
+        (Expense.id.is_not(None), Expense.name),
+        (
+            and_(
+                Transfer.id.is_not(None),
+                true() if all_accounts else Transfer.from_account_id == account_id,
+                Transfer.start_date <= period_end,
+                or_(
+                    Transfer.end_date.is_(None),
+                    Transfer.end_date >= period_start,
+                ),
+            ),
+            literal('Transfer to ') + to_account.name,
+        ),
+        else_=literal('Uncategorized'),
+    ).label('name')
+    total = func.sum(func.abs(Transaction.amount)).label('total')
+
+    return db.execute(
+        select(period.label('period'), name, total, func.count().label('count'))
+            .select_from(Transaction)
+            .outerjoin(Bill, Bill.id == Transaction.bill_id)
+            .outerjoin(Expense, Expense.id == Transaction.expense_id)
+            .outerjoin(Transfer, Transfer.id == Transaction.transfer_id)
+            .outerjoin(to_account, to_account.id == Transfer.to_account_id)
+            .where(
+                true() if all_accounts else Transaction.account_id == account_id,
+                Transaction.date >= start_date,
+                Transaction.date <= end_date,
+                Transaction.amount < 0, # Only include Bills
+                (
+                    or_(
+                        to_account.id.is_(None),
+                        to_account.type != 'credit',
+                    )
+                    if all_accounts
+                    else true()
+                ),
+            )
+            .group_by(period, name)
+            .order_by(total.desc())
+    ).all() # type: ignore
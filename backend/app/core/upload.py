@@ -1,23 +1,70 @@
 from csv import reader as csv_reader
-from datetime import datetime
-from io import StringIO
+from datetime import date, datetime
+from io import TextIOWrapper
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
 
 from fastapi.datastructures import UploadFile
-from sqlalchemy import and_, or_
+from sqlalchemy import insert, or_, select, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm.session import Session
 
-from app.models.transaction import Transaction
+from app.core.rules import (
+    ASSOCIATION_FIELDS,
+    TransactionRuleEngine,
+    get_rule_items,
+)
+from app.core.storage import store_upload_data
+from app.core.transactions import get_transaction_loader_options
+from app.models.transaction import Transaction, get_transaction_fingerprint
 from app.models.balance import Balance
+from app.models.daily_balance import invalidate_daily_balances
 from app.models.upload import Upload
 from app.schemas.balance import NewBalanceSchema
 from app.schemas.transaction import NewTransactionSchema
+from app.services.apple import parse_apple_upload
+from app.services.capital_one import parse_capital_one_upload
+from app.services.chase import parse_chase_upload
+from app.services.citi import parse_citi_upload
+from app.services.columns import CHUNK_ROWS, TransactionColumns
+from app.services.iccu import parse_iccu_upload
+from app.services.vanguard import parse_vanguard_upload
 from app.utils.logging import log
 
 
+# Maximum number of values bound in a single IN clause
+_IN_CHUNK_SIZE = 500
+
+# Parsers of the Uploads of each bank, by the name of the bank
+UPLOAD_PARSERS: dict[
+    str, Callable[[BinaryIO, int], Iterator[TransactionColumns]]
+] = {
+    'apple': parse_apple_upload,
+    'capital-one': parse_capital_one_upload,
+    'chase': parse_chase_upload,
+    'citi': parse_citi_upload,
+    'iccu': parse_iccu_upload,
+    'vanguard': parse_vanguard_upload,
+}
+
+# Values of new Transactions which are optional
+_TRANSACTION_DEFAULTS = {
+    'note': '',
+    'plaid_transaction_id': None,
+    **dict.fromkeys(ASSOCIATION_FIELDS),
+}
+
+
 def create_upload(file: UploadFile, account_id: int, db: Session) -> Upload:
     """
-    Create a new Upload from a file. This new Upload will be added to
-    the database, but will not have any Transactions associated with it.
+    Create a new Upload from a file. The file (which is spooled to disk)
+    is stored in the upload store one chunk at a time, and is rewound so
+    that it can then be parsed. This new Upload will be added to the
+    database, but will not have any Transactions associated with it.
+
+    If an identical file was already ingested into the same Account,
+    then the existing Upload is returned instead, and the file does not
+    need to be parsed again.
 
     Args:
         file: The file to create the Upload from.
@@ -25,13 +72,30 @@ def create_upload(file: UploadFile, account_id: int, db: Session) -> Upload:
         db: The database session.
 
     Returns:
-        The created Upload.
+        The created (or already ingested) Upload.
     """
 
+    sha256, size = store_upload_data(file.file)
+    file.file.seek(0)
+
+    ingested = db.scalars(
+        select(Upload)
+            .where(
+                Upload.sha256 == sha256,
+                Upload.account_id == account_id,
+                Upload.ingest_date.is_not(None),
+            )
+            .limit(1)
+    ).first()
+    if ingested is not None:
+        log.info(f'{file.filename} was already ingested as Upload[{ingested.id}]')
+        return ingested
+
     upload = Upload(
         filename=file.filename,
-        data=file.file.read(),
         upload_date=datetime.now(),
+        sha256=sha256,
+        size=size,
         account_id=account_id,
     )
     db.add(upload)
@@ -40,36 +104,41 @@ def create_upload(file: UploadFile, account_id: int, db: Session) -> Upload:
     return upload
 
 
-def parse_generic_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_generic_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[NewTransactionSchema]:
     """
-    Parse a generic upload into a list of NewTransactionSchemas.
+    Parse a generic upload into NewTransactionSchemas, one line of the
+    Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of NewTransactionSchemas.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    reader = csv_reader(file_stream)
-
-    return [
-        NewTransactionSchema(
-            date=datetime.strptime(line[0], '%Y-%m-%d'),
-            description=line[1],
-            note=line[2],
-            amount=line[3],
-            bill_id=line[4] or None,
-            expense_id=line[6] or None,
-            income_id=line[5] or None,
-            transfer_id=line[7] or None,
-            account_id=upload.account_id,
-        )
-        for line in reader
-        if line and line[0] and line[0].lower() != 'date'
-    ]
+    text_stream = TextIOWrapper(stream, encoding='utf-8', newline='')
+    try:
+        for line in csv_reader(text_stream):
+            if not line or not line[0] or line[0].lower() == 'date':
+                continue
+            yield NewTransactionSchema(
+                date=datetime.strptime(line[0], '%Y-%m-%d'),
+                description=line[1],
+                note=line[2],
+                amount=line[3],
+                bill_id=line[4] or None,
+                expense_id=line[6] or None,
+                income_id=line[5] or None,
+                transfer_id=line[7] or None,
+                account_id=account_id,
+            )
+    finally:
+        # Do not close the stream when the wrapper is garbage collected
+        text_stream.detach()
 
 
 def remove_redundant_transactions(
@@ -78,7 +147,9 @@ def remove_redundant_transactions(
 ) -> list[NewTransactionSchema]:
     """
     Remove any transactions which already exist in the database from the
-    list of transactions.
+    list of transactions. A transaction already exists if there is a
+    Transaction with the same Plaid ID or the same fingerprint (Account,
+    date, amount, and description).
 
     Args:
         transactions: The list of NewTransactionSchemas to remove
@@ -90,42 +161,42 @@ def remove_redundant_transactions(
         removed.
     """
 
-    def is_redundant(transaction: NewTransactionSchema) -> bool:
-        """Check if a transaction is redundant."""
-
-        redundant = db.query(Transaction).filter(
-            or_(
-                Transaction.plaid_transaction_id == transaction.plaid_transaction_id,
-                and_(
-                    Transaction.date == transaction.date,
-                    Transaction.account_id == transaction.account_id,
-                    or_(
-                        Transaction.amount == transaction.amount,
-                        Transaction.description == transaction.description,
-                    ),
-                )
+    existing = _get_existing_transactions(
+        [
+            get_transaction_fingerprint(
+                transaction.account_id,
+                transaction.date,
+                transaction.amount,
+                transaction.description,
             )
-        ).first()
-
-        return redundant
+            for transaction in transactions
+        ],
+        [transaction.plaid_transaction_id for transaction in transactions],
+        db,
+    )
 
     return [
         transaction
-        for transaction in transactions
-        if not is_redundant(transaction)
+        for transaction, exists in zip(transactions, existing)
+        if not exists
     ]
 
 
 def add_transactions_to_database(
-    transactions: list[NewTransactionSchema],
+    transactions: Iterable[NewTransactionSchema],
     db: Session,
     upload_id: int | None = None,
 ) -> list[Transaction]:
     """
-    Add the list of NewTransactionSchemas to the database.
+    Add the NewTransactionSchemas to the database, skipping any which
+    already exist. The Transactions are consumed in chunks of up to
+    `CHUNK_ROWS`, and each chunk is inserted with a single bulk INSERT ..
+    RETURNING. Transactions which are not associated with a Bill,
+    Expense, Income, or Transfer are associated by the Transaction
+    filters of those.
 
     Args:
-        transactions: The list of NewTransactionSchemas to add.
+        transactions: The NewTransactionSchemas to add.
         db: The database session.
         upload_id: The ID of the Upload that the Transactions belong to.
 
@@ -133,18 +204,50 @@ def add_transactions_to_database(
         A list of Transactions.
     """
 
-    db_transactions = []
-    for transaction in remove_redundant_transactions(transactions, db):
-        new_transaction = Transaction(
-            **transaction.model_dump(exclude={'related_transaction_ids'}),
-            upload_id=upload_id,
-        )
-        db.add(new_transaction)
-        db_transactions.append(new_transaction)
+    inserter = _TransactionInserter(db, upload_id)
+    transactions = iter(transactions)
+    while chunk := list(islice(transactions, CHUNK_ROWS)):
+        inserter.insert([
+            transaction.model_dump(exclude={'related_transaction_ids'})
+            for transaction in chunk
+        ])
 
-    db.commit()
+    return inserter.load()
 
-    return db_transactions
+
+def add_transaction_columns_to_database(
+    chunks: Iterable[TransactionColumns],
+    db: Session,
+    upload_id: int | None = None,
+) -> list[Transaction]:
+    """
+    Add the columns of parsed Transactions to the database, in the same
+    way as `add_transactions_to_database`. Each chunk of columns is
+    validated in a single pass, and goes straight into the bulk INSERT
+    without creating a NewTransactionSchema for each Transaction. If the
+    columns have end of day Balances, those are added once every chunk
+    has been added.
+
+    Args:
+        chunks: The TransactionColumns of each chunk to add.
+        db: The database session.
+        upload_id: The ID of the Upload that the Transactions belong to.
+
+    Returns:
+        A list of Transactions.
+    """
+
+    inserter = _TransactionInserter(db, upload_id)
+    balances = None
+    for columns in chunks:
+        inserter.insert(columns.to_transactions())
+        balances = columns.balances
+
+    # The Balances are only complete once every chunk has been parsed
+    if balances is not None:
+        add_balances_to_database(balances.to_balances(), db)
+
+    return inserter.load()
 
 
 def add_balances_to_database(
@@ -152,11 +255,12 @@ def add_balances_to_database(
     db: Session,
 ) -> list[Balance]:
     """
-    Add the list of NewBalanceSchemas to the database.
+    Add the list of NewBalanceSchemas to the database. All Balances are
+    inserted with a single bulk INSERT, skipping any for an Account and
+    date which already has a Balance.
 
     Args:
         balances: The list of NewBalanceSchemas to add.
-        upload_id: The ID of the Upload that the Balances belong to.
         db: The database session.
 
     Returns:
@@ -164,21 +268,225 @@ def add_balances_to_database(
         if there are duplicates or existing Balances.
     """
 
-    db_balances = []
-    for balance in balances:
-        # Skip if there is already a Balance for this Account and Date
-        if not db.query(Balance).filter(
-            Balance.account_id == balance.account_id,
-            Balance.date == balance.date,
-        ).first():
-            new_balance = Balance(
-                account_id=balance.account_id,
-                date=balance.date,
-                balance=balance.balance,
-            )
-            db.add(new_balance)
-            db_balances.append(new_balance)
-
+    if not balances:
+        return []
+
+    db_balances = list(db.scalars(
+        sqlite_insert(Balance)
+            .on_conflict_do_nothing(index_elements=['account_id', 'date'])
+            .returning(Balance),
+        [balance.model_dump() for balance in balances],
+    ))
+    _invalidate_daily_balances(
+        ((balance.account_id, balance.date) for balance in db_balances), db
+    )
     db.commit()
 
     return db_balances
+
+
+def _get_existing_transactions(
+    fingerprints: list[str],
+    plaid_ids: list[str | None],
+    db: Session,
+    *,
+    upload_id: int | None = None,
+) -> list[bool]:
+    """
+    Get whether a Transaction with each of the given fingerprints (or
+    Plaid IDs) already exists, ignoring Transactions of the given Upload
+    (so that earlier chunks of the Upload are not redundant). All
+    Transactions are checked with a single query per chunk of up to
+    `_IN_CHUNK_SIZE` Transactions.
+    """
+
+    other_uploads = (
+        Transaction.upload_id.is_distinct_from(upload_id)
+        if upload_id is not None
+        else true()
+    )
+    existing_plaid_ids, existing_fingerprints = set(), set()
+    for start in range(0, len(fingerprints), _IN_CHUNK_SIZE):
+        chunk = slice(start, start + _IN_CHUNK_SIZE)
+        for plaid_id, fingerprint in db.execute(
+            select(Transaction.plaid_transaction_id, Transaction.fingerprint)
+                .where(or_(
+                    Transaction.plaid_transaction_id.in_({
+                        plaid_id
+                        for plaid_id in plaid_ids[chunk]
+                        if plaid_id is not None
+                    }),
+                    Transaction.fingerprint.in_(set(fingerprints[chunk])),
+                ), other_uploads)
+        ):
+            existing_plaid_ids.add(plaid_id)
+            existing_fingerprints.add(fingerprint)
+
+    return [
+        fingerprint in existing_fingerprints
+        or (plaid_id is not None and plaid_id in existing_plaid_ids)
+        for fingerprint, plaid_id in zip(fingerprints, plaid_ids)
+    ]
+
+
+class _TransactionInserter:
+    """
+    Bulk inserts chunks of new Transactions (as mappings of their values)
+    which do not already exist, committing each chunk as it is inserted.
+    The new Transactions are only loaded once all chunks are inserted,
+    as each commit expires everything loaded before it.
+
+    The number of rows of an Upload which were inserted is committed with
+    each chunk, so if its ingest is interrupted (and resumed by parsing
+    it again) the rows which were already inserted are skipped.
+    """
+
+    def __init__(self, db: Session, upload_id: int | None) -> None:
+        self.db = db
+        self.upload_id = upload_id
+        self._engine: TransactionRuleEngine | None = None
+        self._id_ranges: list[tuple[int, int]] = []
+        self._rows = 0
+        self._resumed_rows = (
+            db.scalar(select(Upload.ingest_rows).where(Upload.id == upload_id))
+            if upload_id is not None
+            else None
+        ) or 0
+
+
+    def insert(self, transactions: Iterable[dict[str, Any]]) -> None:
+        """Insert a chunk of new Transactions."""
+
+        # Skip the rows inserted before the ingest was resumed
+        transactions = list(transactions)
+        skipped = max(0, self._resumed_rows - self._rows)
+        self._rows += len(transactions)
+
+        # Bulk inserts bypass the flush, so set the fingerprints directly
+        rows = [
+            _TRANSACTION_DEFAULTS | transaction | {
+                'upload_id': self.upload_id,
+                'fingerprint': get_transaction_fingerprint(
+                    transaction['account_id'],
+                    transaction['date'],
+                    transaction['amount'],
+                    transaction['description'],
+                ),
+            }
+            for transaction in transactions[skipped:]
+        ]
+        existing = _get_existing_transactions(
+            [row['fingerprint'] for row in rows],
+            [row['plaid_transaction_id'] for row in rows],
+            self.db,
+            upload_id=self.upload_id,
+        )
+        if rows := [row for row, exists in zip(rows, existing) if not exists]:
+            # The rules are only compiled once for all chunks
+            if self._engine is None:
+                self._engine = TransactionRuleEngine(get_rule_items(self.db))
+            _categorize_transactions(rows, self._engine)
+
+            # A Core INSERT batches every row together, whereas the ORM
+            # batches consecutive rows by which of their values are not None
+            table = Transaction.__table__
+            ids = self.db.scalars(
+                insert(table).returning(table.c.id), rows
+            ).all()
+            _invalidate_daily_balances(
+                ((row['account_id'], row['date']) for row in rows), self.db
+            )
+            self._id_ranges.append((min(ids), max(ids)))
+
+        # Record the inserted rows of the Upload in the same commit
+        if self.upload_id is not None and self._rows > self._resumed_rows:
+            self.db.execute(
+                update(Upload)
+                    .where(Upload.id == self.upload_id)
+                    .values(ingest_rows=self._rows)
+            )
+        self.db.commit()
+
+
+    def load(self) -> list[Transaction]:
+        """
+        Load all of the inserted Transactions, and mark the Upload as
+        ingested.
+        """
+
+        # Commit before loading, as the commit would expire them
+        if self.upload_id is not None:
+            self.db.execute(
+                update(Upload)
+                    .where(Upload.id == self.upload_id)
+                    .values(ingest_date=datetime.now())
+            )
+            self.db.commit()
+
+        conditions = [
+            Transaction.id.between(first, last)
+            for first, last in self._id_ranges
+        ]
+        # Transactions inserted before the ingest was resumed
+        if self._resumed_rows:
+            conditions.append(Transaction.upload_id == self.upload_id)
+        if not conditions:
+            return []
+
+        # Load the new Transactions, and everything they serialize, in a
+        # fixed number of queries; IDs are assigned in the order of the
+        # rows of each chunk
+        return self.db.scalars(
+            select(Transaction)
+                .where(or_(*conditions))
+                .order_by(Transaction.id)
+                .options(*get_transaction_loader_options())
+        ).all() # type: ignore
+
+
+def _categorize_transactions(
+    rows: list[dict],
+    engine: TransactionRuleEngine,
+) -> None:
+    """
+    Associate each new, unassociated Transaction (as a row to insert)
+    with the first Bill, Expense, Income, or Transfer whose Transaction
+    filters it matches. Only the new Transactions are evaluated.
+    """
+
+    if not engine:
+        return
+
+    for row in rows:
+        if any(row[field] is not None for field in ASSOCIATION_FIELDS):
+            continue
+
+        rule = engine.match(
+            row['account_id'],
+            row['date'],
+            row['amount'],
+            row['description'],
+            row['note'],
+        )
+        if rule is not None:
+            row[rule.field] = rule.id
+
+
+def _invalidate_daily_balances(
+    dates: Iterable[tuple[int | None, date]],
+    db: Session,
+) -> None:
+    """
+    Invalidate the DailyBalances of every Account from the earliest of
+    the given (Account ID, date) pairs of its new Balances or
+    Transactions. This is required for bulk inserts, which bypass the
+    flush (and therefore the automatic invalidation).
+    """
+
+    earliest: dict[int, date] = {}
+    for account_id, date_ in dates:
+        if account_id is not None:
+            earliest[account_id] = min(date_, earliest.get(account_id, date_))
+
+    for account_id, date_ in earliest.items():
+        invalidate_daily_balances(db, account_id, date_)
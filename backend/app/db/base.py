@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from functools import lru_cache
 from json import loads, dumps
-from re import match as regex_match, IGNORECASE
+from re import IGNORECASE, Pattern, compile as regex_compile, error as RegexError
 from typing import Any
 
 from sqlalchemy import create_engine
@@ -9,6 +10,7 @@ from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.types import TypeDecorator, JSON
 
 from app.core.config import settings
+from app.utils.logging import log
 
 
 # Create SQLAlchemy engine
@@ -20,6 +22,38 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@lru_cache(maxsize=4096)
+def _compile_regex(pattern: str) -> Pattern[str] | None:
+    """Compile a case-insensitive regex, or None if it is invalid."""
+
+    try:
+        return regex_compile(pattern, IGNORECASE)
+    except RegexError as e:
+        log.warning(f'Invalid regex pattern {pattern!r}: {e}')
+        return None
+
+
+def regex_match(string: str | None, pattern: str | None) -> bool:
+    """
+    Determine whether the start of a string matches a regex pattern,
+    ignoring case. NULL strings and NULL or invalid patterns never
+    match.
+
+    Args:
+        string: The string to match.
+        pattern: The regex pattern to match against.
+
+    Returns:
+        Whether the string matches the pattern.
+    """
+
+    if string is None or pattern is None:
+        return False
+
+    compiled = _compile_regex(pattern)
+    return compiled is not None and compiled.match(string) is not None
+
+
 @listens_for(engine, 'connect')
 def register_custom_functions(
         dbapi_connection,
@@ -29,10 +63,12 @@ def register_custom_functions(
     When the engine is connected, register the regex match function.
     """
 
+    # Deterministic, so SQLite can reuse results within a statement
     dbapi_connection.create_function(
         'regex_match',
         2,
-        lambda s, pattern: bool(regex_match(pattern, s, flags=IGNORECASE)),
+        regex_match,
+        deterministic=True,
     )
 
 
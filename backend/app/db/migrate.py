@@ -62,6 +62,10 @@ def perform_db_migrations() -> None:
             # restore_backup(backup, log=log)
         sys_exit(1)
 
+    # Discard pooled connections opened before the migration, which would
+    # otherwise keep planning queries against the old schema
+    engine.dispose()
+
     # Perform database seeding
     if current is None:
         with next(get_database()) as db:
@@ -9,6 +9,7 @@ from app.models.account import Account
 from app.models.bill import Bill
 from app.models.expense import Expense
 from app.models.income import Income
+from app.models.job import Job
 from app.models.plaid import PlaidItem
 from app.models.transfer import Transfer
 from app.models.transaction import Transaction
@@ -244,6 +245,39 @@ def require_income(
     return _require_model(db, Income, income_id,raise_exception=raise_exception)
 
 
+@overload
+def require_job(
+    db: Session,
+    job_id: int,
+    *,
+    raise_exception: bool = True,
+) -> Job: ...
+
+@overload
+def require_job(
+    db: Session,
+    job_id: int,
+    *,
+    raise_exception: bool = False,
+) -> Job | None: ...
+
+def require_job(
+    db: Session,
+    job_id: int,
+    *,
+    raise_exception: bool = True,
+) -> Job | None:
+    """
+    Query and return a Job by ID.
+
+    Args:
+        db: The database session.
+        job_id: The ID of the Job to query.
+    """
+
+    return _require_model(db, Job, job_id, raise_exception=raise_exception)
+
+
 @overload
 def require_plaid_item(
     db: Session,
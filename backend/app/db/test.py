@@ -5,7 +5,8 @@ from random import randint, random
 from app.models.balance import Balance
 from sqlalchemy.orm import Session
 
-from app.core.upload import add_balances_to_database, add_transactions_to_database
+from app.core.storage import store_upload_data
+from app.core.upload import add_transaction_columns_to_database
 from app.models import Account, Bill, Income, Transaction, Upload
 from app.services.citi import parse_citi_upload
 from app.services.iccu import parse_iccu_upload
@@ -125,35 +126,42 @@ def upload_bank_transactions(db: Session) -> bool:
     # Checking transactions
     checking_transactions = root_dir / 'bank_upload.csv'
     if checking_transactions.exists():
-        upload = Upload(
-            filename=checking_transactions.name,
-            data=checking_transactions.read_bytes(),
-            upload_date=datetime.now(),
-            account_id=1,
-        )
-        db.add(upload)
-        balances, transactions = parse_iccu_upload(upload)
-        add_transactions_to_database(transactions, db, upload.id)
-        add_balances_to_database(balances, db)
-        log.debug(
-            f'Uploaded {len(transactions)} transactions from {upload.filename}'
-        )
+        with checking_transactions.open('rb') as stream:
+            sha256, size = store_upload_data(stream)
+            upload = Upload(
+                filename=checking_transactions.name,
+                upload_date=datetime.now(),
+                sha256=sha256,
+                size=size,
+                account_id=1,
+            )
+            db.add(upload)
+            db.flush()
+            stream.seek(0)
+            count = len(add_transaction_columns_to_database(
+                parse_iccu_upload(stream, upload.account_id), db, upload.id
+            ))
+        log.debug(f'Uploaded {count} transactions from {upload.filename}')
 
     # Credit card transactions
     credit_transactions = root_dir / 'credit_upload.csv'
     if credit_transactions.exists():
-        upload = Upload(
-            filename=credit_transactions.name,
-            data=credit_transactions.read_bytes(),
-            upload_date=datetime.now(),
-            account_id=3,
-        )
-        db.add(upload)
-        transactions = parse_citi_upload(upload)
-        add_transactions_to_database(transactions, db, upload.id)
-        log.debug(
-            f'Uploaded {len(transactions)} transactions from {upload.filename}'
-        )
+        with credit_transactions.open('rb') as stream:
+            sha256, size = store_upload_data(stream)
+            upload = Upload(
+                filename=credit_transactions.name,
+                upload_date=datetime.now(),
+                sha256=sha256,
+                size=size,
+                account_id=3,
+            )
+            db.add(upload)
+            db.flush()
+            stream.seek(0)
+            count = len(add_transaction_columns_to_database(
+                parse_citi_upload(stream, upload.account_id), db, upload.id
+            ))
+        log.debug(f'Uploaded {count} transactions from {upload.filename}')
 
     return checking_transactions.exists() or credit_transactions.exists()
 
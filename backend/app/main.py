@@ -5,6 +5,8 @@ from fastapi_pagination import add_pagination
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api import api_router
+from app.core.jobs import resume_jobs, shutdown_jobs
+from app.db.deps import get_database
 from app.db.migrate import perform_db_migrations
 
 
@@ -12,10 +14,12 @@ from app.db.migrate import perform_db_migrations
 async def lifespan(app: FastAPI):
 
     perform_db_migrations()
+    with next(get_database()) as db:
+        resume_jobs(db)
 
     yield
 
-    pass
+    shutdown_jobs()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,8 +1,10 @@
 from .account import Account
 from .balance import Balance
+from .daily_balance import DailyBalance
 from .expense import Expense
 from .bill import Bill
 from .income import Income
+from .job import Job
 from .plaid import PlaidItem
 from .transfer import Transfer
 from .transaction import Transaction, TransactionRelationship
@@ -14,8 +16,10 @@ __all__ = [
     'Account',
     'Balance',
     'Bill',
+    'DailyBalance',
     'Expense',
     'Income',
+    'Job',
     'PlaidItem',
     'Transfer',
     'Transaction',
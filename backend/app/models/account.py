@@ -1,13 +1,12 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 from datetime import date
 
 from sqlalchemy import Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
-from app.core.dates import date_range
+from app.core.projection import ProjectionContext
 from app.schemas.account import AccountType
-from app.utils.logging import log
 
 if TYPE_CHECKING:
     from app.models.balance import Balance
@@ -114,7 +113,8 @@ class Account(Base):
     def get_card_balance(self, target_date: date, /) -> float:
         """
         Get the balance for the account on a specific date. This only
-        accounts for Bills from the Account, not Incomes or Transfers.
+        accounts for Bills from the Account, not Incomes or Transfers
+        (other than payoff Transfers, which reset the balance).
 
         Args:
             target_date: The date to get the balance for
@@ -123,30 +123,34 @@ class Account(Base):
             The projected balance for the account on the given date.
         """
 
-        # Get the last balance before the target date
-        last_balance = [
-            balance for balance in self.balances
-            if balance.date <= target_date
-        ][-1]
-        starting_balance = last_balance.balance
-
-        # Check if there is an incoming Transfer which will reset the
-        # balance to 0
-        start_date = last_balance.date
-        for transfer in self.incoming_transfers:
-            if (
-                transfer.payoff_balance
-                and transfer.to_account_id == self.id
-                and transfer.start_date <= target_date
-                and (transfer.end_date is None or transfer.end_date >= target_date)
-            ):
-                if (next_date := transfer.get_next_active_date(start_date)) is not None:
-                    start_date = next_date
-                    starting_balance = 0.0
-                    break
-
-        for date_ in date_range(start_date, target_date):
-            for bill in self.bills:
-                starting_balance += bill.get_effective_amount(date_)
-        log.debug(f'  Card balance for {self.name} on {target_date} is ${starting_balance:,.2f}; stepped through {last_balance.date} -> {target_date}')
-        return starting_balance
+        return ProjectionContext().get_card_balance(self, target_date)
+
+
+    def get_occurrences(
+        self,
+        start: date,
+        end: date,
+        context: ProjectionContext | None = None,
+    ) -> Generator[tuple[date, float], None, None]:
+        """
+        Get the dates and amounts of all Bills, Incomes, and Transfers
+        (to and from) the Account between the given dates.
+
+        Args:
+            start: The start of the date range (inclusive).
+            end: The end of the date range (inclusive).
+            context: The context to evaluate payoff Transfers within.
+                If omitted, a new context is used for this Account.
+
+        Yields:
+            Tuples of (date, amount). These are chronological per model,
+            but not across models.
+        """
+
+        for bill in self.bills:
+            yield from bill.get_occurrences(start, end)
+        for income in self.incomes:
+            yield from income.get_occurrences(start, end)
+        context = context or ProjectionContext()
+        for transfer in self.outgoing_transfers + self.incoming_transfers:
+            yield from transfer.get_occurrences(start, end, self.id, context)
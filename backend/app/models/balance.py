@@ -1,7 +1,7 @@
 from datetime import date as date_type
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, ForeignKey
+from sqlalchemy import Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,15 +12,31 @@ if TYPE_CHECKING:
 
 class Balance(Base):
     __tablename__ = 'balances'
+    __table_args__ = (
+        # An Account has at most one Balance per date, which also allows
+        # bulk inserts to skip existing Balances
+        Index(
+            'ix_balances_account_id_date',
+            'account_id',
+            'date',
+            unique=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
-    date: Mapped[date_type] = mapped_column(Date, index=True)
+    # Previous dates and Accounts are needed to invalidate DailyBalances
+    date: Mapped[date_type] = mapped_column(
+        Date,
+        index=True,
+        active_history=True,
+    )
     balance: Mapped[float]
 
     account_id: Mapped[int] = mapped_column(
         ForeignKey('accounts.id', ondelete='cascade'),
         index=True,
+        active_history=True,
     )
     account: Mapped['Account'] = relationship(
         'Account',
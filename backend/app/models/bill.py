@@ -1,5 +1,5 @@
 from datetime import date
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 
 from sqlalchemy import (
     Date,
@@ -8,10 +8,12 @@ from sqlalchemy import (
     JSON,
     String,
 )
+from sqlalchemy.event import listens_for
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.dates import date_meets_frequency
+from app.core.dates import date_meets_frequency, get_frequency_dates
+from app.core.schedule import CompiledSchedule
 from app.db.base import Base, JSONWithDates
 from app.schemas.core import TransactionFilterDict
 from app.schemas.bill import (
@@ -91,15 +93,70 @@ class Bill(Base):
             if not date_meets_frequency(date, self.start_date, self.frequency):
                 return 0.0
 
-        # Apply the change schedule to the amount
-        amount = self.amount
-        for change in self.change_schedule:
-            if (change['start_date'] <= date
-                and (change['end_date'] is None or change['end_date'] >= date)):
-                if change['is_percentage']:
-                    amount *= change['amount']
-                else:
-                    amount += change['amount']
-
         # If the Bill is a recurring Bill, return the amount
-        return amount
+        return self._get_scheduled_amount(date)
+
+
+    def _get_scheduled_amount(self, date: date) -> float:
+        """
+        Get the amount of the Bill on a given date after applying the
+        change schedule. This does not check whether the Bill is due.
+        """
+
+        # Recompile if the schedule has been replaced
+        compiled = getattr(self, '_compiled_schedule', None)
+        if compiled is None or compiled.source is not self.change_schedule:
+            compiled = CompiledSchedule(self.change_schedule)
+            self._compiled_schedule = compiled
+
+        return compiled.apply(self.amount, date)
+
+
+    def get_occurrences(
+        self,
+        start: date,
+        end: date,
+    ) -> Generator[tuple[date, float], None, None]:
+        """
+        Get all the dates the Bill is due between the given dates, and
+        the effective amount on each date.
+
+        Args:
+            start: The start of the date range (inclusive).
+            end: The end of the date range (inclusive).
+
+        Yields:
+            Tuples of (date, amount) in chronological order.
+        """
+
+        # One-time Bills are only due on their start date, and their
+        # amount is not changed by the change schedule
+        if self.type == 'one_time':
+            for date_ in get_frequency_dates(
+                self.start_date, None, start, end, end_date=self.end_date,
+            ):
+                yield date_, self.amount
+            return
+
+        # Recurring Bills without a frequency are due every day
+        for date_ in get_frequency_dates(
+            self.start_date,
+            self.frequency or {'value': 1, 'unit': 'days'},
+            start,
+            end,
+            end_date=self.end_date,
+        ):
+            yield date_, self._get_scheduled_amount(date_)
+
+
+@listens_for(Bill.change_schedule, 'modified')
+def _reset_compiled_change_schedule(
+        target: Bill,
+        initiator, # pylint: disable=unused-argument
+    ) -> None:
+    """
+    When the change schedule of a Bill is modified in place, discard the
+    compiled schedule so it is recompiled on the next lookup.
+    """
+
+    target._compiled_schedule = None # pylint: disable=protected-access
@@ -0,0 +1,102 @@
+from datetime import date as date_type
+from itertools import chain
+
+from sqlalchemy import Date, ForeignKey, delete, inspect
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base import Base, SessionLocal
+from app.models.account import Account
+from app.models.balance import Balance
+from app.models.transaction import Transaction
+
+
+# Materialized end of day balance of an Account, derived from its
+# Balances and Transactions. Rows are deleted whenever a Balance or
+# Transaction on or before their date changes, and are recomputed on the
+# next read.
+class DailyBalance(Base):
+    __tablename__ = 'daily_balances'
+
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id', ondelete='cascade'),
+        primary_key=True,
+    )
+    date: Mapped[date_type] = mapped_column(Date, primary_key=True)
+    balance: Mapped[float]
+
+
+    def __repr__(self) -> str:
+        return f'DailyBalance[{self.account_id}] for ${self.balance:,.02f} on {self.date.strftime("%Y-%m-%d")}'
+
+
+def invalidate_daily_balances(
+    db: Session,
+    account_id: int,
+    date_: date_type,
+) -> None:
+    """
+    Delete all DailyBalances of an Account on or after the given date.
+
+    Args:
+        db: The database session.
+        account_id: The ID of the Account whose DailyBalances to delete.
+        date_: The earliest date to delete.
+    """
+
+    # Execute on the connection so this is safe to call during a flush
+    db.connection().execute(
+        delete(DailyBalance).where(
+            DailyBalance.account_id == account_id,
+            DailyBalance.date >= date_,
+        )
+    )
+
+
+@listens_for(SessionLocal, 'before_flush')
+def _invalidate_changed_daily_balances(
+        session: Session,
+        flush_context, # pylint: disable=unused-argument
+        instances, # pylint: disable=unused-argument
+    ) -> None:
+    """
+    Before changes are flushed, invalidate the DailyBalances affected by
+    any new, modified, or deleted Balances and Transactions.
+    """
+
+    invalid: dict[int, date_type] = {}
+    dirty, deleted = session.dirty, session.deleted
+    for item in chain(session.new, dirty, deleted):
+        if isinstance(item, Account) and item in deleted:
+            invalid[item.id] = date_type.min
+            continue
+        if not isinstance(item, (Balance, Transaction)):
+            continue
+
+        # Skip modifications which do not change the balance
+        state = inspect(item)
+        amount = 'balance' if isinstance(item, Balance) else 'amount'
+        if (item in dirty
+            and not any(
+                state.attrs[attribute].history.has_changes()
+                for attribute in ('account', 'account_id', 'date', amount)
+            )):
+            continue
+
+        # Invalidate from the earliest date for the old and new Account;
+        # an assigned Account only sets the ID once flushed
+        earliest = min([item.date, *state.attrs.date.history.deleted])
+        account_ids = {
+            item.account_id,
+            *state.attrs.account_id.history.deleted,
+            *(account.id for account in state.attrs.account.history.added
+              if account is not None),
+        }
+        for account_id in account_ids:
+            if account_id is not None:
+                invalid[account_id] = min(
+                    earliest, invalid.get(account_id, earliest)
+                )
+
+    for account_id, date_ in invalid.items():
+        invalidate_daily_balances(session, account_id, date_)
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 
 from sqlalchemy import (
     Date,
@@ -8,11 +8,13 @@ from sqlalchemy import (
     JSON,
     String,
 )
+from sqlalchemy.event import listens_for
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, JSONWithDates
-from app.core.dates import date_meets_frequency, date_range
+from app.core.dates import date_meets_frequency, get_frequency_dates
+from app.core.schedule import CompiledRaises, CompiledSchedule
 from app.schemas.core import TransactionFilterDict
 from app.schemas.income import FrequencyDict, RaiseItemDict
 
@@ -60,50 +62,27 @@ class Income(Base):
         """
         Calculate the effective amount for the current day after
         applying all defined changes.
-        
-        This property evaluates all entries in the `change_schedule` and
-        applies them in order if their effective_date is between the income's
-        start_date and today (or end_date if specified and it's before today).
-        """
 
-        # Determine the effective range
-        today = date.today()
-        start = self.start_date
-        end = min(today, self.end_date) if self.end_date else today
+        This property applies every occurrence of the entries in the
+        `raise_schedule` in chronological order if they occur between
+        the income's start_date and today. If today is outside the
+        income's start_date and end_date, this is 0.
+        """
 
         # If today is before start_date or after end_date, return 0
-        if today < start or (self.end_date and today > self.end_date):
+        today = date.today()
+        if today < self.start_date or (self.end_date and today > self.end_date):
             return 0
 
-        # Start with the base amount
-        amount = self.amount
-        
-        # Apply changes in chronological order for each day in the range
-        for current_date in date_range(start, end):
-            # Find changes that apply on this specific date
-            for raise_ in self.raise_schedule:
-                # Skip if the change is not effective on this date
-                if (raise_['start_date'] > current_date
-                    or (raise_['end_date'] and raise_['end_date'] < current_date)):
-                    continue
-
-                # One-time changes are only applied on their start date
-                if raise_['frequency'] is None:
-                    if raise_['start_date'] != current_date:
-                        continue
-                else:
-                    if not date_meets_frequency(
-                        current_date, raise_['start_date'], raise_['frequency']
-                    ):
-                        continue
-
-                # Apply each change that occurs on this date
-                if raise_['is_percentage']:
-                    amount *= raise_['amount']
-                else:
-                    amount += raise_['amount']
-
-        return amount
+        # Recompile if the schedule or start date has changed
+        compiled = getattr(self, '_compiled_raises', None)
+        if (compiled is None
+            or compiled.source is not self.raise_schedule
+            or compiled.start_date != self.start_date):
+            compiled = CompiledRaises(self.raise_schedule, self.start_date)
+            self._compiled_raises = compiled
+
+        return compiled.apply(self.amount, today)
 
 
     def get_effective_amount(self, date: date) -> float:
@@ -133,14 +112,60 @@ class Income(Base):
         if not date_meets_frequency(date, self.start_date, self.frequency):
             return 0.0
 
-        # Apply the raise schedule to the amount
-        amount = self.amount
-        for raise_ in self.raise_schedule:
-            if (raise_['start_date'] <= date
-                and (raise_['end_date'] is None or raise_['end_date'] >= date)):
-                if raise_['is_percentage']:
-                    amount *= raise_['amount']
-                else:
-                    amount += raise_['amount']
-
-        return amount
+        return self._get_scheduled_amount(date)
+
+
+    def _get_scheduled_amount(self, date: date) -> float:
+        """
+        Get the amount of the Income on a given date after applying the
+        raise schedule. This does not check whether the Income is due.
+        """
+
+        # Recompile if the schedule has been replaced
+        compiled = getattr(self, '_compiled_schedule', None)
+        if compiled is None or compiled.source is not self.raise_schedule:
+            compiled = CompiledSchedule(self.raise_schedule)
+            self._compiled_schedule = compiled
+
+        return compiled.apply(self.amount, date)
+
+
+    def get_occurrences(
+        self,
+        start: date,
+        end: date,
+    ) -> Generator[tuple[date, float], None, None]:
+        """
+        Get all the dates the Income is received between the given
+        dates, and the effective amount on each date.
+
+        Args:
+            start: The start of the date range (inclusive).
+            end: The end of the date range (inclusive).
+
+        Yields:
+            Tuples of (date, amount) in chronological order.
+        """
+
+        for date_ in get_frequency_dates(
+            self.start_date, self.frequency, start, end, end_date=self.end_date,
+        ):
+            # One-time Incomes are not changed by the raise schedule
+            if self.frequency is None:
+                yield date_, self.amount
+            else:
+                yield date_, self._get_scheduled_amount(date_)
+
+
+@listens_for(Income.raise_schedule, 'modified')
+def _reset_compiled_raise_schedule(
+        target: Income,
+        initiator, # pylint: disable=unused-argument
+    ) -> None:
+    """
+    When the raise schedule of an Income is modified in place, discard
+    the compiled schedules so they are recompiled on the next lookup.
+    """
+
+    target._compiled_schedule = None # pylint: disable=protected-access
+    target._compiled_raises = None # pylint: disable=protected-access
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.schemas.job import JobStatus, JobType
+
+
+# Work which is performed in the background (see `app.core.jobs`). Jobs
+# are stored so that their progress can be polled, and so that any
+# which were interrupted are resumed on startup.
+class Job(Base):
+    __tablename__ = 'jobs'
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    type: Mapped[JobType] = mapped_column(String, index=True)
+    status: Mapped[JobStatus] = mapped_column(
+        String,
+        index=True,
+        default='pending',
+    )
+    # Keyword arguments of the handler of the type of Job
+    arguments: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+    # Progress in units of the type of Job, out of the total if known
+    progress: Mapped[int] = mapped_column(default=0)
+    total: Mapped[int | None] = mapped_column(default=None)
+
+    # Results of the Job
+    transaction_ids: Mapped[list[int]] = mapped_column(JSON, default=[])
+    error: Mapped[str | None] = mapped_column(String, default=None)
+
+    create_date: Mapped[datetime] = mapped_column(DateTime)
+    start_date: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    end_date: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+
+
+    def __repr__(self) -> str:
+        return f'Job[{self.id}] {self.type} ({self.status})'
@@ -1,7 +1,9 @@
 from datetime import date as dt_date
+from hashlib import sha1
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, Float, ForeignKey, String
+from sqlalchemy import Date, Float, ForeignKey, Index, String
+from sqlalchemy.event import listens_for
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -16,18 +18,42 @@ if TYPE_CHECKING:
 
 class Transaction(Base):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Covers the starting balance aggregation of an Account, and any
+        # lookups by Account (and date)
+        Index(
+            'ix_transactions_account_id_date_amount',
+            'account_id',
+            'date',
+            'amount',
+        ),
+        # Lookups of the Transactions of a model, ordered by date
+        Index('ix_transactions_bill_id_date', 'bill_id', 'date'),
+        Index('ix_transactions_expense_id_date', 'expense_id', 'date'),
+        Index('ix_transactions_income_id_date', 'income_id', 'date'),
+        Index('ix_transactions_transfer_id_date', 'transfer_id', 'date'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     plaid_transaction_id: Mapped[str | None] = mapped_column(
+        String, index=True, unique=True, nullable=True
+    )
+    # Normalized identity used to detect duplicate Transactions; this is
+    # set whenever the Transaction is flushed
+    fingerprint: Mapped[str | None] = mapped_column(
         String, index=True, nullable=True
     )
 
-    date: Mapped[dt_date] = mapped_column(Date, index=True)
+    # Previous dates and Accounts are needed to invalidate DailyBalances
+    date: Mapped[dt_date] = mapped_column(Date, index=True, active_history=True)
     description: Mapped[str] = mapped_column(String)
     note: Mapped[str] = mapped_column(String, default='')
     amount: Mapped[float] = mapped_column(Float)
 
-    account_id: Mapped[int | None] = mapped_column(ForeignKey('accounts.id'))
+    account_id: Mapped[int | None] = mapped_column(
+        ForeignKey('accounts.id'),
+        active_history=True,
+    )
     account: Mapped['Account | None'] = relationship(back_populates='transactions')
 
     bill_id: Mapped[int | None] = mapped_column(ForeignKey('bills.id'))
@@ -39,7 +65,10 @@ class Transaction(Base):
     income_id: Mapped[int | None] = mapped_column(ForeignKey('incomes.id'))
     income: Mapped['Income | None'] = relationship(back_populates='transactions')
 
-    upload_id: Mapped[int | None] = mapped_column(ForeignKey('uploads.id'))
+    upload_id: Mapped[int | None] = mapped_column(
+        ForeignKey('uploads.id'),
+        index=True,
+    )
     upload: Mapped['Upload | None'] = relationship(back_populates='transactions')
 
     transfer_id: Mapped[int | None] = mapped_column(ForeignKey('transfers.id'))
@@ -57,6 +86,40 @@ class Transaction(Base):
         return [t.id for t in self.related_transactions]
 
 
+def get_transaction_fingerprint(
+    account_id: int | None,
+    date: dt_date,
+    amount: float,
+    description: str,
+) -> str:
+    """
+    Get the fingerprint of a Transaction. Transactions with the same
+    Account, date, amount (to the cent), and description (ignoring case
+    and whitespace) have the same fingerprint.
+    """
+
+    description = ' '.join(description.casefold().split())
+
+    return sha1(
+        f'{account_id}|{date.isoformat()}|{round(amount * 100)}|{description}'
+            .encode()
+    ).hexdigest()
+
+
+@listens_for(Transaction, 'before_insert')
+@listens_for(Transaction, 'before_update')
+def _set_transaction_fingerprint(
+        mapper, # pylint: disable=unused-argument
+        connection, # pylint: disable=unused-argument
+        target: Transaction,
+    ) -> None:
+    """Before a Transaction is written, update its fingerprint."""
+
+    target.fingerprint = get_transaction_fingerprint(
+        target.account_id, target.date, target.amount, target.description,
+    )
+
+
 # Association table for many-to-many relationship between transactions
 class TransactionRelationship(Base):
     __tablename__ = 'transaction_relationships'
@@ -65,5 +128,5 @@ class TransactionRelationship(Base):
         ForeignKey('transactions.id'), primary_key=True
     )
     related_transaction_id: Mapped[int] = mapped_column(
-        ForeignKey('transactions.id'), primary_key=True
+        ForeignKey('transactions.id'), primary_key=True, index=True
     )
@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 
 from sqlalchemy import (
     Date,
@@ -11,7 +11,8 @@ from sqlalchemy import (
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.dates import date_meets_frequency
+from app.core.dates import date_meets_frequency, get_frequency_dates
+from app.core.projection import ProjectionContext
 from app.db.base import Base
 from app.schemas.core import TransactionFilterDict
 from app.schemas.income import FrequencyDict
@@ -126,6 +127,42 @@ class Transfer(Base):
         return 0.0
 
 
+    def get_occurrences(
+        self,
+        start: date,
+        end: date,
+        account_id: int,
+        context: ProjectionContext | None = None,
+    ) -> Generator[tuple[date, float], None, None]:
+        """
+        Get all the dates the Transfer occurs between the given dates,
+        and the effective amount on each date.
+
+        Args:
+            start: The start of the date range (inclusive).
+            end: The end of the date range (inclusive).
+            account_id: The Account ID to get the effective amounts for.
+                This is used to determine the direction of the Transfer.
+            context: The context to evaluate the payoff balance within.
+                If omitted, a new context is used for this Transfer.
+
+        Yields:
+            Tuples of (date, amount) in chronological order.
+        """
+
+        scalar = -1 if account_id == self.to_account_id else 1
+        context = context or ProjectionContext()
+        for date_ in get_frequency_dates(
+            self.start_date, self.frequency, start, end, end_date=self.end_date,
+        ):
+            if self.payoff_balance:
+                yield date_, (
+                    context.get_card_balance(self.to_account, date_) * scalar
+                )
+            else:
+                yield date_, self.amount * scalar
+
+
     def get_next_active_date(self, start_date: date) -> date | None:
         """
         Get the next date on which the Transfer will be active.
@@ -134,12 +171,12 @@ class Transfer(Base):
         if self.frequency is None:
             return self.start_date
 
-        iterations = 1000
-        date_ = start_date
-        while iterations > 0:
-            if date_meets_frequency(date_, self.start_date, self.frequency):
-                return date_
-            date_ += timedelta(days=1)
-            iterations -= 1
-
-        return None
+        return next(
+            get_frequency_dates(
+                self.start_date,
+                self.frequency,
+                start_date,
+                start_date + timedelta(days=999),
+            ),
+            None,
+        )
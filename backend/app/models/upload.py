@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, LargeBinary, String
+from sqlalchemy import DateTime, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -17,9 +17,17 @@ class Upload(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
     filename: Mapped[str] = mapped_column(String, index=True)
-    data: Mapped[bytes] = mapped_column(LargeBinary)
     upload_date: Mapped[datetime] = mapped_column(DateTime, index=True)
 
+    # The data itself is in the upload store, addressed by its hash
+    sha256: Mapped[str] = mapped_column(String(64), index=True)
+    size: Mapped[int]
+    # When all Transactions of the Upload were added, if they have been
+    ingest_date: Mapped[datetime | None] = mapped_column(DateTime)
+    # Number of parsed rows of the data whose Transactions were added, so
+    # an interrupted ingest resumes after them
+    ingest_rows: Mapped[int] = mapped_column(default=0)
+
     account_id: Mapped[int] = mapped_column(ForeignKey('accounts.id'))
     account: Mapped['Account'] = relationship(
         'Account',
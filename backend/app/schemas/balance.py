@@ -1,8 +1,11 @@
 from datetime import date
+from typing import Literal, Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
+BalanceResolution = Literal['day', 'week', 'month']
+
 class NewBalanceSchema(BaseModel):
     account_id: int
     date: date
@@ -17,3 +20,40 @@ class ReturnBalanceSchema(BaseModel):
 class ReturnDailyBalanceSchema(BaseModel):
     date: date
     balance: float | None
+    min_balance: float | None = None
+    max_balance: float | None = None
+
+class ReturnAccountDailyBalancesSchema(BaseModel):
+    account_id: int
+    balances: list[ReturnDailyBalanceSchema]
+
+class ReturnNetWorthSchema(BaseModel):
+    accounts: list[ReturnAccountDailyBalancesSchema]
+    total: list[ReturnDailyBalanceSchema]
+
+class NewScenarioSchema(BaseModel):
+    start_date: date
+    end_date: date
+    paths: int = Field(default=1_000, ge=1, le=100_000)
+    # Relative standard deviation of each Bill and Income occurrence
+    bill_volatility: float = Field(default=0.0, ge=0.0)
+    income_volatility: float = Field(default=0.0, ge=0.0)
+    # Standard deviation of the annual growth of each Income on top of
+    # its raise schedule
+    raise_volatility: float = Field(default=0.0, ge=0.0)
+    seed: int | None = Field(default=None, ge=0)
+    workers: int = Field(default=1, ge=1, le=32)
+
+    @model_validator(mode='after')
+    def validate_dates(self) -> Self:
+        """Validate that the end date is after the start date"""
+
+        if self.start_date > self.end_date:
+            raise ValueError('End date must be after start date')
+        return self
+
+class ReturnScenarioBalanceSchema(BaseModel):
+    date: date
+    p5: float
+    p50: float
+    p95: float
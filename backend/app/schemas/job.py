@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+JobStatus = Literal['pending', 'running', 'complete', 'failed']
+JobType = Literal['upload', 'plaid_sync']
+
+class ReturnJobSchema(BaseModel):
+    id: int
+    type: JobType
+    status: JobStatus
+    progress: int
+    total: int | None
+    transaction_ids: list[int]
+    error: str | None
+    create_date: datetime
+    start_date: datetime | None
+    end_date: datetime | None
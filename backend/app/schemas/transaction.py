@@ -1,4 +1,5 @@
 from datetime import date as date_type
+from typing import TypedDict
 
 from pydantic import BaseModel
 
@@ -25,6 +26,13 @@ class NewTransactionSchema(BaseModel):
     related_transaction_ids: list[int] | None = None
     plaid_transaction_id: str | None = None
 
+class NewTransactionDict(TypedDict):
+    date: date_type
+    description: str
+    note: str
+    amount: float
+    account_id: int
+
 class UpdateTransactionSchema(BaseModel):
     date: date_type = None
     description: str = None
@@ -65,6 +73,11 @@ class ReturnTransactionSchema(ReturnTransactionSchemaNoAccount):
     expense: ReturnExpenseSchema | None
     income: ReturnIncomeSchema | None
 
+class ReturnTransactionCursorPageSchema(BaseModel):
+    items: list[ReturnTransactionSchema]
+    next_cursor: str | None
+    total: int | None = None
+
 class ReturnUpcomingTransactionSchema(BaseModel):
     name: str
     amount: float
@@ -81,3 +94,13 @@ class BillBreakdownItem(BaseModel):
 class BillBreakdownResponse(BaseModel):
     total_bill: float
     breakdown: list[BillBreakdownItem]
+
+class BillBreakdownSeries(BaseModel):
+    bill_name: str
+    total_amounts: list[float]
+    transaction_counts: list[int]
+
+class BillBreakdownMatrixResponse(BaseModel):
+    months: list[str]
+    total_bills: list[float]
+    breakdown: list[BillBreakdownSeries]
@@ -1,41 +1,52 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
 import pandas as pd
 
-from app.models.upload import Upload
-from app.schemas.transaction import NewTransactionSchema
+from app.services.columns import (
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
 
-def parse_apple_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_apple_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an Apple Card Upload into a list of NewTransactionSchemas.
+    Parse an Apple Card Upload into columns of new Transactions, one
+    chunk of the Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(file_stream)
-
-    # Convert the posting date column to a datetime object
-    df['Transaction Date'] = pd.to_datetime(df['Transaction Date'], format='%m/%d/%Y')
+    for df in read_csv_chunks(
+        stream,
+        dtype={'Description': str, 'Merchant': str, 'Category': str},
+    ):
+        # Convert the posting date column to a datetime object
+        df['Transaction Date'] = pd.to_datetime(
+            df['Transaction Date'],
+            format='%m/%d/%Y'
+        )
 
-    # Convert the Amount column to floats - convert NaN to 0 and then remove
-    df['Amount (USD)'] = df['Amount (USD)'].fillna(0).astype(float)
-    df = df.loc[(df['Amount (USD)'] != 0)]
+        # Convert the Amount column to floats - convert NaN to 0 and then
+        # remove
+        df['Amount (USD)'] = df['Amount (USD)'].fillna(0).astype(float)
+        df = df.loc[(df['Amount (USD)'] != 0)]
 
-    return [
-        NewTransactionSchema(
-            date=row['Transaction Date'],
-            description=row['Description'],
-            note=f'{row["Merchant"]} - {row["Category"]}',
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Transaction Date'],
             # Apple lists purchases as positive, and payments as negative
-            amount=-row['Amount (USD)'],
-            account_id=upload.account_id,
+            amounts=-df['Amount (USD)'],
+            descriptions=df['Description'],
+            notes=(
+                df['Merchant'].astype(str) + ' - ' + df['Category'].astype(str)
+            ),
         )
-        for _, row in df.iterrows()
-    ]
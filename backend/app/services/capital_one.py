@@ -1,45 +1,54 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
+import numpy as np
 import pandas as pd
 
-from app.models.upload import Upload
-from app.schemas.transaction import NewTransactionSchema
+from app.services.columns import (
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
 
-def parse_capital_one_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_capital_one_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an Capital One Upload into a list of NewTransactionSchemas.
+    Parse an Capital One Upload into columns of new Transactions, one
+    chunk of the Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(file_stream)
-
-    # Convert the posting date column to a datetime object
-    df['Transaction Date'] = pd.to_datetime(
-        df['Transaction Date'],
-        format='%Y-%m-%d'
-    )
-
-    # Convert the Debit and Credit columns to floats - convert NaN to 0
-    # remove rows where both are 0
-    df['Debit'] = df['Debit'].fillna(0).astype(float)
-    df['Credit'] = df['Credit'].fillna(0).astype(float)
-    df = df.loc[(df['Debit'] != 0) | (df['Credit'] != 0)]
-
-    return [
-        NewTransactionSchema(
-            date=row['Transaction Date'],
-            description=f'{row["Description"]} ({row["Category"]})',
+    for df in read_csv_chunks(
+        stream,
+        dtype={'Description': str, 'Category': str},
+    ):
+        # Convert the posting date column to a datetime object
+        df['Transaction Date'] = pd.to_datetime(
+            df['Transaction Date'],
+            format='%Y-%m-%d'
+        )
+
+        # Convert the Debit and Credit columns to floats - convert NaN to
+        # 0 and remove rows where both are 0
+        df['Debit'] = df['Debit'].fillna(0).astype(float)
+        df['Credit'] = df['Credit'].fillna(0).astype(float)
+        df = df.loc[(df['Debit'] != 0) | (df['Credit'] != 0)]
+
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Transaction Date'],
             # Purchases and payments are both positive
-            amount=(-row['Debit'] or row['Credit']),
-            account_id=upload.account_id,
+            amounts=np.where(df['Debit'] != 0, -df['Debit'], df['Credit']),
+            descriptions=(
+                df['Description'].astype(str)
+                + ' (' + df['Category'].astype(str) + ')'
+            ),
         )
-        for _, row in df.iterrows()
-    ]
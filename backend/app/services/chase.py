@@ -1,54 +1,61 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
-import numpy as np
 import pandas as pd
 
-from app.models.upload import Upload
-from app.schemas.transaction import NewTransactionSchema
+from app.services.columns import (
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
 
-def get_note(category: str, memo: str) -> str:
-    """Get a note for a transaction from a category and memo."""
+def get_notes(categories: pd.Series, memos: pd.Series) -> pd.Series:
+    """Get the notes for transactions from their categories and memos."""
 
-    if category and memo:
-        return f'{memo} - {category}'
-    if not category and not memo:
-        return ''
-    return category or memo
+    categories, memos = categories.fillna(''), memos.fillna('')
+    has_category, has_memo = categories != '', memos != ''
+
+    return (memos + ' - ' + categories).where(
+        has_category & has_memo,
+        categories.where(has_category, memos),
+    )
 
 
-def parse_chase_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_chase_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an Chase Bank Card Upload into a list of new Transactions.
+    Parse an Chase Bank Card Upload into columns of new Transactions, one
+    chunk of the Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(file_stream).replace({np.nan: None})
-
-    # Convert the posting date column to a datetime object
-    df['Transaction Date'] = pd.to_datetime(
-        df['Transaction Date'],
-        format='%m/%d/%Y'
-    )
+    for df in read_csv_chunks(
+        stream,
+        dtype={'Description': str, 'Category': str, 'Memo': str},
+    ):
+        # Convert the posting date column to a datetime object
+        df['Transaction Date'] = pd.to_datetime(
+            df['Transaction Date'],
+            format='%m/%d/%Y'
+        )
 
-    # Convert the Amount column to floats - convert NaN to 0 and then remove
-    df['Amount'] = df['Amount'].fillna(0).astype(float)
-    df = df.loc[(df['Amount'] != 0)]
-
-    return [
-        NewTransactionSchema(
-            date=row['Transaction Date'],
-            description=row['Description'],
-            note=get_note(row['Category'], row['Memo']),
-            amount=row['Amount'],
-            account_id=upload.account_id,
+        # Convert the Amount column to floats - convert NaN to 0 and then
+        # remove
+        df['Amount'] = df['Amount'].fillna(0).astype(float)
+        df = df.loc[(df['Amount'] != 0)]
+
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Transaction Date'],
+            amounts=df['Amount'],
+            descriptions=df['Description'],
+            notes=get_notes(df['Category'], df['Memo']),
         )
-        for _, row in df.iterrows()
-    ]
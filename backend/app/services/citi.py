@@ -1,43 +1,46 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
+import numpy as np
 import pandas as pd
 
-from app.models.upload import Upload
-from app.schemas.transaction import NewTransactionSchema
+from app.services.columns import (
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
 
-def parse_citi_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_citi_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an Citi Bank Upload into a list of NewTransactionSchemas.
+    Parse an Citi Bank Upload into columns of new Transactions, one chunk
+    of the Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(file_stream)
+    for df in read_csv_chunks(stream, dtype={'Description': str}):
+        # Convert the posting date column to a datetime object
+        df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y')
 
-    # Convert the posting date column to a datetime object
-    df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y')
+        # Convert the Debit and Credit columns to floats - convert NaN to
+        # 0 and remove rows where both are 0
+        df['Debit'] = df['Debit'].fillna(0).astype(float)
+        df['Credit'] = df['Credit'].fillna(0).astype(float)
+        df = df.loc[(df['Debit'] != 0) | (df['Credit'] != 0)]
 
-    # Convert the Debit and Credit columns to floats - convert NaN to 0
-    # remove rows where both are 0
-    df['Debit'] = df['Debit'].fillna(0).astype(float)
-    df['Credit'] = df['Credit'].fillna(0).astype(float)
-    df = df.loc[(df['Debit'] != 0) | (df['Credit'] != 0)]
-
-    return [
-        NewTransactionSchema(
-            date=row['Date'],
-            description=row['Description'],
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Date'],
             # Citi Bank lists purchases as Debit (positive values), and
             # payments as Credit (negative values).
-            amount=-(row['Debit'] or row['Credit']),
-            account_id=upload.account_id,
+            amounts=-np.where(df['Debit'] != 0, df['Debit'], df['Credit']),
+            descriptions=df['Description'],
         )
-        for _, row in df.iterrows()
-    ]
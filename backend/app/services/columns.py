@@ -0,0 +1,188 @@
+from datetime import date
+from typing import BinaryIO, Iterator, NamedTuple
+
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
+
+from app.schemas.balance import NewBalanceSchema
+from app.schemas.transaction import NewTransactionDict
+
+
+# Validates every row of an Upload at once, rather than one model per row
+_TRANSACTIONS_ADAPTER = TypeAdapter(list[NewTransactionDict])
+_BALANCES_ADAPTER = TypeAdapter(list[NewBalanceSchema])
+
+# Number of rows of an Upload which are parsed (and inserted) at a time
+CHUNK_ROWS = 10_000
+
+
+class BalanceSnapshots:
+    """
+    End of day Balances derived from the running balance column of an
+    Upload, which may be parsed in chunks. The end of day balance is the
+    balance after the last Transaction on each date, so only one balance
+    per date is kept, regardless of the number of rows.
+    """
+
+    def __init__(self, account_id: int) -> None:
+        self.account_id = account_id
+        self._balances: dict[date, float] = {}
+
+
+    def add(
+        self,
+        dates: pd.Series,
+        balances: pd.Series,
+        *,
+        newest_first: bool = False,
+    ) -> None:
+        """
+        Add the running balances of a chunk of Transactions, in a single
+        pass over the chunk.
+
+        Args:
+            dates: The datetime column of the Transaction dates.
+            balances: The running balance after each Transaction.
+            newest_first: Whether the Transactions are listed in reverse
+                chronological order, rather than chronological order.
+        """
+
+        # The last Transaction of each date is its first row if newest
+        # first, including across chunks
+        last = ~dates.duplicated(keep='first' if newest_first else 'last')
+        for date_, balance in zip(
+            np.asarray(dates[last], dtype='datetime64[D]').tolist(),
+            balances[last].tolist(),
+        ):
+            if not newest_first or date_ not in self._balances:
+                self._balances[date_] = balance
+
+
+    def to_balances(self) -> list[NewBalanceSchema]:
+        """
+        Get the end of day Balances, validated in a single pass.
+
+        Returns:
+            A list of NewBalanceSchemas, one for each date.
+        """
+
+        return _BALANCES_ADAPTER.validate_python([
+            {'account_id': self.account_id, 'date': date_, 'balance': balance}
+            for date_, balance in self._balances.items()
+        ])
+
+
+class TransactionColumns(NamedTuple):
+    """
+    Transactions parsed from an Upload as parallel columns, rather than
+    one object per Transaction.
+    """
+    account_id: int
+    # Dates as datetime64[D] (days since the epoch)
+    dates: np.ndarray
+    # Amounts as int64 cents
+    amounts: np.ndarray
+    descriptions: list[str | None]
+    notes: list[str | None]
+    # End of day Balances of the Upload (so far), if it has a running
+    # balance
+    balances: BalanceSnapshots | None = None
+
+
+    def to_transactions(self) -> list[NewTransactionDict]:
+        """
+        Convert the columns into new Transactions, validating all of
+        them in a single pass.
+
+        Returns:
+            A list of NewTransactionDicts.
+
+        Raises:
+            pydantic.ValidationError: If any Transaction is invalid (e.g.
+                is missing a description).
+        """
+
+        return _TRANSACTIONS_ADAPTER.validate_python([
+            {
+                'date': date_,
+                'description': description,
+                'note': note,
+                'amount': amount,
+                'account_id': self.account_id,
+            }
+            for date_, description, note, amount in zip(
+                self.dates.tolist(),
+                self.descriptions,
+                self.notes,
+                (self.amounts / 100).tolist(),
+            )
+        ])
+
+
+def get_transaction_columns(
+    account_id: int,
+    dates: pd.Series,
+    amounts: pd.Series | np.ndarray,
+    descriptions: pd.Series,
+    notes: pd.Series | str = '',
+    balances: BalanceSnapshots | None = None,
+) -> TransactionColumns:
+    """
+    Get the typed columns of Transactions from the columns of a parsed
+    Upload.
+
+    Args:
+        account_id: The ID of the Account of the Transactions.
+        dates: The datetime column of the Transaction dates.
+        amounts: The (float) amounts of the Transactions, in dollars.
+        descriptions: The descriptions of the Transactions.
+        notes: The notes of the Transactions, or a single note for all
+            of them.
+        balances: The BalanceSnapshots the running balances of the
+            Transactions have been added to, if any.
+
+    Returns:
+        The TransactionColumns.
+    """
+
+    if isinstance(notes, str):
+        notes = pd.Series(notes, index=descriptions.index)
+
+    return TransactionColumns(
+        account_id=account_id,
+        dates=np.asarray(dates, dtype='datetime64[D]'),
+        amounts=np.rint(np.asarray(amounts, dtype=np.float64) * 100)
+            .astype(np.int64),
+        descriptions=_to_list(descriptions),
+        notes=_to_list(notes),
+        balances=balances,
+    )
+
+
+def read_csv_chunks(
+    stream: BinaryIO,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a (UTF-8) CSV Upload in chunks of `CHUNK_ROWS` rows, so that
+    only a single chunk of the file is in memory at a time.
+
+    Args:
+        stream: The binary stream of the Upload.
+        **kwargs: Additional arguments to `pandas.read_csv`.
+
+    Returns:
+        An iterator of DataFrames of each chunk.
+    """
+
+    with pd.read_csv(
+        stream, encoding='utf-8', chunksize=CHUNK_ROWS, **kwargs
+    ) as reader:
+        yield from reader
+
+
+def _to_list(column: pd.Series, /) -> list[str | None]:
+    """Convert a column to a list, with None for any missing values."""
+
+    return column.astype(object).where(column.notna(), None).tolist()
@@ -1,67 +1,65 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
 import pandas as pd
 
-from app.models.upload import Upload
-from app.schemas.balance import NewBalanceSchema
-from app.schemas.transaction import NewTransactionSchema
+from app.services.columns import (
+    BalanceSnapshots,
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
 
 def parse_iccu_upload(
-    upload: Upload
-) -> tuple[list[NewBalanceSchema], list[NewTransactionSchema]]:
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an ICCU upload into a list of Balances and Transactions to add
-    to the database.
+    Parse an ICCU upload into columns of Transactions (and their end of
+    day Balances) to add to the database, one chunk of the Upload at a
+    time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A tuple of lists of NewBalanceSchemas and NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(file_stream)
+    balances = BalanceSnapshots(account_id)
 
-    # Convert the posting date column to a datetime object
-    df['Posting Date'] = pd.to_datetime(df['Posting Date'], format='%m/%d/%Y')
+    for df in read_csv_chunks(
+        stream,
+        dtype={'Description': str, 'Extended Description': str},
+    ):
+        # Convert the posting date column to a datetime object
+        df['Posting Date'] = pd.to_datetime(
+            df['Posting Date'],
+            format='%m/%d/%Y'
+        )
 
-    def clean_spaces(text):
-        if pd.isnull(text):
-            return text
-        return ' '.join(text.strip().split())
+        # Set the extended description to '' if it matches the
+        # description. Replace multiple spaces with a single space
+        for column in ('Description', 'Extended Description'):
+            cleaned = df[column].astype(str).str.split().str.join(' ')
+            df[column] = cleaned.where(df[column].notna())
+        df.loc[
+            df['Description'] == df['Extended Description'],
+            'Extended Description'
+        ] = ''
 
-    # Set the extended description to '' if it matches the description
-    # Replace multiple spaces with a single space
-    df['Description'] = df['Description'].apply(clean_spaces)
-    df['Extended Description'] = df['Extended Description'].apply(clean_spaces)
-    df.loc[
-        df['Description'] == df['Extended Description'],
-        'Extended Description'
-    ] = ''
-
-    return (
-        [
-            NewBalanceSchema(
-                account_id=upload.account_id,
-                date=date,
-                # Transactions are listed in reverse chronological 
-                # order, so the most recent EOD balance is the first
-                # balance in the list
-                balance=df.loc[df['Posting Date'] == date, 'Balance'].iloc[0],
-            )
-            for date in df['Posting Date'].unique()
-        ],
-        [
-            NewTransactionSchema(
-                date=row['Posting Date'],
-                description=row['Description'],
-                note=row['Extended Description'],
-                amount=row['Amount'],
-                account_id=upload.account_id,
-            )
-            for _, row in df.iterrows()
-        ]
-    )
+        balances.add(
+            df['Posting Date'],
+            df['Balance'],
+            # Transactions are listed in reverse chronological order
+            newest_first=True,
+        )
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Posting Date'],
+            amounts=df['Amount'],
+            descriptions=df['Description'],
+            notes=df['Extended Description'],
+            balances=balances,
+        )
@@ -1,18 +1,18 @@
-from io import StringIO
+from typing import BinaryIO, Iterator
 
-import numpy as np
-import pandas as pd
+from app.services.columns import (
+    TransactionColumns,
+    get_transaction_columns,
+    read_csv_chunks,
+)
 
-from app.models.upload import Upload
-from app.schemas.transaction import NewTransactionSchema
 
-
-def get_first_row(stream: StringIO, /) -> int:
+def get_first_row(stream: BinaryIO, /) -> int:
     """
     Get the first row of the CSV file that contains the header.
 
     Args:
-        stream: The stream to read from.
+        stream: The binary stream to read from.
 
     Returns:
         The first row of the CSV file that contains the header.
@@ -20,7 +20,7 @@ def get_first_row(stream: StringIO, /) -> int:
 
     header_row = 0
     for line_number, line in enumerate(stream):
-        columns = {col.strip() for col in line.split(',')}
+        columns = {col.strip() for col in line.decode('utf-8').split(',')}
         if set(['Trade Date', 'Transaction Type', 'Net Amount']) <= columns:
             header_row = line_number
             break
@@ -30,23 +30,26 @@ def get_first_row(stream: StringIO, /) -> int:
     return header_row
 
 
-def parse_vanguard_upload(upload: Upload) -> list[NewTransactionSchema]:
+def parse_vanguard_upload(
+    stream: BinaryIO,
+    account_id: int,
+) -> Iterator[TransactionColumns]:
     """
-    Parse an Vanguard Upload into a list of new Transactions.
+    Parse an Vanguard Upload into columns of new Transactions, one chunk
+    of the Upload at a time.
 
     Args:
-        upload: The Upload to parse.
+        stream: The binary stream of the Upload to parse.
+        account_id: The ID of the Account of the Upload.
 
     Returns:
-        A list of NewTransactionSchemas.
+        An iterator of the TransactionColumns of each chunk.
     """
 
-    # Parse the raw Upload data into a CSV stream
-    file_stream = StringIO(upload.data.decode('utf-8'))
-    df = pd.read_csv(
-        file_stream,
+    for df in read_csv_chunks(
+        stream,
         # Columns are Trade Date, Transaction Type, Net Amount
-        skiprows=get_first_row(file_stream),
+        skiprows=get_first_row(stream),
         header=0,
         usecols=[
             'Trade Date',
@@ -54,29 +57,26 @@ def parse_vanguard_upload(upload: Upload) -> list[NewTransactionSchema]:
             'Transaction Description',
             'Net Amount',
         ],
+        dtype={'Transaction Type': str, 'Transaction Description': str},
         parse_dates=['Trade Date'],
-    ).replace({np.nan: None})
-
-    # Convert the Amount column to floats - convert NaN to 0 and then remove
-    df['Net Amount'] = df['Net Amount'].fillna(0).astype(float)
-    df = df.loc[(df['Net Amount'] != 0)]
-
-    # Remove non deposit/withdrawal transactions
-    df = df.loc[
-        # These are used for brokerage transactions
-        (df['Transaction Type'] == 'Funds Received')
-        | (df['Transaction Type'] == 'Withdrawal')
-        # Contributions are used for ROTH IRA deposits
-        | (df['Transaction Type'] == 'Contribution')
-    ]
-
-    return [
-        NewTransactionSchema(
-            date=row['Trade Date'],
-            description=row['Transaction Description'],
-            note='',
-            amount=row['Net Amount'],
-            account_id=upload.account_id,
+    ):
+        # Convert the Amount column to floats - convert NaN to 0 and then
+        # remove
+        df['Net Amount'] = df['Net Amount'].fillna(0).astype(float)
+        df = df.loc[(df['Net Amount'] != 0)]
+
+        # Remove non deposit/withdrawal transactions
+        df = df.loc[
+            # These are used for brokerage transactions
+            (df['Transaction Type'] == 'Funds Received')
+            | (df['Transaction Type'] == 'Withdrawal')
+            # Contributions are used for ROTH IRA deposits
+            | (df['Transaction Type'] == 'Contribution')
+        ]
+
+        yield get_transaction_columns(
+            account_id,
+            dates=df['Trade Date'],
+            amounts=df['Net Amount'],
+            descriptions=df['Transaction Description'],
         )
-        for _, row in df.iterrows()
-    ]
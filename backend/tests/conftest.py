@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from os import environ
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Callable, ContextManager, Iterator
+
+# The settings are read when the app is first imported, so every test
+# uses its own (temporary) database and upload store
+_TEMPORARY_DIRECTORY = Path(mkdtemp(prefix='budget-tests-'))
+environ['DATABASE_URL'] = f'sqlite:///{_TEMPORARY_DIRECTORY / "budget.sqlite"}'
+environ['UPLOAD_DIRECTORY'] = str(_TEMPORARY_DIRECTORY / 'uploads')
+environ.setdefault('PLAID_CLIENT_ID', 'test')
+environ.setdefault('PLAID_SECRET', 'test')
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(scope='session')
+def migrated_database() -> None:
+    """Migrate the temporary database to head, and seed it."""
+
+    from app.db.migrate import perform_db_migrations
+
+    perform_db_migrations()
+
+
+@pytest.fixture
+def db(migrated_database) -> Session:
+    """A session to the migrated temporary database."""
+
+    from app.db.base import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(migrated_database) -> TestClient:
+    """A client of the app, which does not run its startup."""
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_statements(
+    migrated_database,
+) -> Callable[[], ContextManager[list[str]]]:
+    """
+    A context manager which collects every statement executed by the
+    engine within its block.
+    """
+
+    from sqlalchemy import event
+
+    from app.db.base import engine
+
+    @contextmanager
+    def count() -> Iterator[list[str]]:
+        statements = []
+        def record(connection, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+    return count
@@ -0,0 +1,119 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.transactions import get_bill_breakdown
+from app.models import Account, Bill, Transaction
+
+
+START_DATE, END_DATE = date(2024, 1, 15), date(2024, 3, 10)
+
+
+@pytest.fixture
+def account(db: Session) -> Account:
+    """
+    An Account with two Bills, and Transactions for them (and some
+    uncategorized ones) in and around January to March 2024.
+    """
+
+    account = Account(name='Breakdown Checking', type='checking')
+    db.add(account)
+    db.flush()
+
+    rent, power = (
+        Bill(
+            name=name,
+            description=name,
+            amount=amount,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2024, 1, 1),
+            account_id=account.id,
+        )
+        for name, amount in (('Rent', -1000.0), ('Power', -50.0))
+    )
+    db.add_all([rent, power])
+    db.flush()
+
+    db.add_all(
+        Transaction(
+            date=day,
+            description='Transaction',
+            amount=amount,
+            account_id=account.id,
+            bill_id=bill.id if bill else None,
+        )
+        for day, amount, bill in (
+            (date(2024, 1, 1), -1000.0, rent), # Before the range
+            (date(2024, 1, 20), -40.0, power),
+            (date(2024, 1, 31), -10.0, power),
+            (date(2024, 2, 1), -1000.0, rent),
+            (date(2024, 2, 20), -55.0, power),
+            (date(2024, 2, 29), -12.5, None),
+            (date(2024, 3, 1), -1000.0, rent),
+            (date(2024, 3, 5), 2000.0, None), # Incoming
+            (date(2024, 3, 31), -60.0, power), # After the range
+        )
+    )
+    db.commit()
+
+    return account
+
+
+def test_bill_breakdown_totals_each_bill(account: Account, db: Session) -> None:
+    breakdown = get_bill_breakdown(account.id, START_DATE, END_DATE, db)
+
+    assert [tuple(row) for row in breakdown] == [
+        (None, 'Rent', 2000.0, 2),
+        (None, 'Power', 105.0, 3),
+        (None, 'Uncategorized', 12.5, 1),
+    ]
+
+
+def test_bill_breakdown_buckets_by_month(account: Account, db: Session) -> None:
+    breakdown = get_bill_breakdown(
+        account.id, START_DATE, END_DATE, db, monthly=True
+    )
+
+    assert sorted(tuple(row) for row in breakdown) == [
+        ('2024-01', 'Power', 50.0, 2),
+        ('2024-02', 'Power', 55.0, 1),
+        ('2024-02', 'Rent', 1000.0, 1),
+        ('2024-02', 'Uncategorized', 12.5, 1),
+        ('2024-03', 'Rent', 1000.0, 1),
+    ]
+
+
+def test_monthly_bill_breakdown_endpoint(
+    account: Account,
+    client: TestClient,
+) -> None:
+    response = client.get(
+        f'/api/v1/transactions/account/{account.id}/bill-breakdown/monthly',
+        params={'start_date': START_DATE, 'end_date': END_DATE},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'months': ['2024-01', '2024-02', '2024-03'],
+        'total_bills': [50.0, 1067.5, 1000.0],
+        'breakdown': [
+            {
+                'bill_name': 'Rent',
+                'total_amounts': [0.0, 1000.0, 1000.0],
+                'transaction_counts': [0, 1, 1],
+            },
+            {
+                'bill_name': 'Power',
+                'total_amounts': [50.0, 55.0, 0.0],
+                'transaction_counts': [2, 1, 0],
+            },
+            {
+                'bill_name': 'Uncategorized',
+                'total_amounts': [0.0, 12.5, 0.0],
+                'transaction_counts': [0, 1, 0],
+            },
+        ],
+    }
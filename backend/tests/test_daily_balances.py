@@ -0,0 +1,138 @@
+from datetime import date, timedelta
+from typing import Callable, ContextManager
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.balance import (
+    get_account_daily_balances,
+    get_daily_projected_net_worth,
+)
+from app.models import Account, Balance, Bill, Income, Transaction
+
+
+TODAY = date.today()
+START, END = TODAY - timedelta(days=30), TODAY + timedelta(days=90)
+
+
+def _create_account(name: str, db: Session) -> Account:
+    """
+    Create an Account whose Bills and Incomes started long before its
+    last Balance and Transaction.
+    """
+
+    account = Account(name=name, type='checking')
+    db.add(account)
+    db.flush()
+
+    db.add_all([
+        Balance(
+            date=TODAY - timedelta(days=60),
+            balance=1_000.0,
+            account_id=account.id,
+        ),
+        Transaction(
+            date=TODAY - timedelta(days=45),
+            description='Groceries',
+            amount=-85.55,
+            account_id=account.id,
+        ),
+        Bill(
+            name='Gym',
+            description='Gym',
+            amount=-25.0,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'weeks'},
+            start_date=TODAY - timedelta(days=3 * 365),
+            account_id=account.id,
+        ),
+        Income(
+            name='Salary',
+            amount=1_200.0,
+            frequency={'value': 2, 'unit': 'weeks'},
+            start_date=TODAY - timedelta(days=3 * 365 + 4),
+            account_id=account.id,
+            raise_schedule=[],
+        ),
+    ])
+    db.commit()
+
+    return account
+
+
+@pytest.fixture
+def account(db: Session) -> Account:
+    return _create_account('Daily Checking', db)
+
+
+def test_projection_continues_from_today(account: Account, db: Session) -> None:
+    dates, balances = get_account_daily_balances(account.id, START, END, db)
+    today = int(np.flatnonzero(dates == np.datetime64(TODAY, 'D'))[0])
+
+    # Each projected day only changes by the occurrences on that day
+    for index in range(today + 1, len(dates)):
+        date_ = dates[index].astype(object)
+        expected = sum(
+            amount
+            for model in account.bills + account.incomes
+            for _, amount in model.get_occurrences(date_, date_)
+        )
+        assert balances[index] - balances[index - 1] \
+            == pytest.approx(expected, abs=0.005)
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    (START, END),
+    (START, TODAY),
+    # Days before the first Balance are projected
+    (TODAY - timedelta(days=90), TODAY + timedelta(days=10)),
+    (TODAY + timedelta(days=1), END),
+    (TODAY + timedelta(days=30), END),
+])
+def test_net_worth_matches_account_balances(
+    account: Account,
+    start_date: date,
+    end_date: date,
+    db: Session,
+) -> None:
+    dates, balances = get_account_daily_balances(
+        account.id, start_date, end_date, db
+    )
+    net_worth_dates, net_worth_balances, _ = get_daily_projected_net_worth(
+        [account.id], start_date, end_date, db
+    )
+
+    assert net_worth_dates.tolist() == dates.tolist()
+    assert net_worth_balances[account.id].tolist() \
+        == pytest.approx(balances.tolist(), abs=0.005)
+
+
+def test_reading_balances_does_not_commit(account: Account, db: Session) -> None:
+    account.name = 'Renamed Checking'
+
+    get_account_daily_balances(account.id, START, END, db)
+    get_daily_projected_net_worth([account.id], START, END, db)
+    db.rollback()
+
+    assert account.name == 'Daily Checking'
+
+
+def test_net_worth_statements_do_not_grow_with_accounts(
+    count_statements: Callable[[], ContextManager[list[str]]],
+    db: Session,
+) -> None:
+    account_ids = [
+        _create_account(f'Net Worth Checking {index}', db).id
+        for index in range(3)
+    ]
+
+    counts = []
+    for ids in (account_ids[:1], account_ids):
+        # Only count the reads of balances which are already materialized
+        get_daily_projected_net_worth(ids, START, END, db)
+        with count_statements() as statements:
+            get_daily_projected_net_worth(ids, START, END, db)
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
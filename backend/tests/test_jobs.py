@@ -0,0 +1,113 @@
+from datetime import datetime
+from io import BytesIO
+from time import sleep
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core import jobs, upload
+from app.core.storage import store_upload_data
+from app.models import Account, Job, Transaction, Upload
+from app.schemas.transaction import NewTransactionSchema
+
+
+# Two of the rows are identical, which are both Transactions
+_DATA = (
+    b'date,description,note,amount,bill,income,expense,transfer\n'
+    b'2025-03-01,Coffee,,-4.50,,,,\n'
+    b'2025-03-01,Coffee,,-4.50,,,,\n'
+    b'2025-03-02,Groceries,,-62.10,,,,\n'
+    b'2025-03-03,Paycheck,,1850.00,,,,\n'
+    b'2025-03-04,Rent,,-950.00,,,,\n'
+)
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def test_resumed_upload_job_adds_each_row_once(
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    account = Account(name='Resumed Checking', type='checking')
+    db.add(account)
+    db.flush()
+    sha256, size = store_upload_data(BytesIO(_DATA))
+    upload_ = Upload(
+        filename='resumed.csv',
+        upload_date=datetime.now(),
+        sha256=sha256,
+        size=size,
+        account_id=account.id,
+    )
+    db.add(upload_)
+    db.commit()
+    upload_id = upload_.id
+
+    # Interrupt the Job after the first chunk of two rows is added
+    monkeypatch.setattr(upload, 'CHUNK_ROWS', 2)
+    parse = jobs.parse_generic_upload
+    def parse_interrupted(*args) -> Iterator[NewTransactionSchema]:
+        for index, transaction in enumerate(parse(*args)):
+            if index == 3:
+                raise _Interrupted
+            yield transaction
+
+    monkeypatch.setattr(jobs, 'parse_generic_upload', parse_interrupted)
+    with pytest.raises(_Interrupted):
+        jobs._run_upload_job(
+            db, jobs.JobProgress(0), parser='generic', upload_ids=[upload_id]
+        )
+    monkeypatch.setattr(jobs, 'parse_generic_upload', parse)
+
+    transaction_ids = jobs._run_upload_job(
+        db, jobs.JobProgress(0), parser='generic', upload_ids=[upload_id]
+    )
+
+    assert db.scalar(
+        select(func.count())
+            .select_from(Transaction)
+            .where(Transaction.upload_id == upload_id)
+    ) == 5
+    assert len(transaction_ids) == 5
+    assert db.get(Upload, upload_id).ingest_date is not None
+
+
+def test_upload_of_ingested_file_creates_no_job(
+    client: TestClient,
+    db: Session,
+) -> None:
+    account = Account(name='Reuploaded Checking', type='checking')
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    files = {'file': ('reuploaded.csv', _DATA.replace(b'2025', b'2026'))}
+
+    response = client.post(
+        '/api/v1/uploads/new/generic',
+        params={'account_id': account_id},
+        files=files,
+    )
+    assert response.status_code == 202
+    job_id = response.json()['id']
+    for _ in range(100):
+        job = client.get(f'/api/v1/jobs/job/{job_id}').json()
+        if job['status'] not in ('pending', 'running'):
+            break
+        sleep(0.05)
+    assert job['status'] == 'complete'
+    assert len(job['transaction_ids']) == 5
+
+    jobs_before = db.scalar(select(func.count()).select_from(Job))
+    response = client.post(
+        '/api/v1/uploads/new/generic',
+        params={'account_id': account_id},
+        files=files,
+    )
+
+    assert response.status_code == 204
+    assert db.scalar(select(func.count()).select_from(Job)) == jobs_before
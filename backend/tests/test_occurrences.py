@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+
+from app.core.dates import date_range
+from app.models.bill import Bill
+from app.models.income import Income
+
+
+START, END = date(2024, 1, 1), date(2024, 12, 31)
+
+CHANGE_SCHEDULE = [
+    {
+        'type': 'raise',
+        'amount': 1.5,
+        'is_percentage': True,
+        'start_date': date(2024, 3, 1),
+        'end_date': None,
+        'frequency': None,
+    },
+    {
+        'type': 'bonus',
+        'amount': -10.0,
+        'is_percentage': False,
+        'start_date': date(2024, 6, 1),
+        'end_date': date(2024, 8, 31),
+        'frequency': None,
+    },
+]
+
+
+def _get_reference_occurrences(
+    model: Bill | Income,
+) -> list[tuple[date, float]]:
+    """The occurrences of the per-date loop over `get_effective_amount`."""
+
+    return [
+        (date_, amount)
+        for date_ in date_range(START, END)
+        if (amount := model.get_effective_amount(date_)) != 0.0
+    ]
+
+
+@pytest.mark.parametrize('type_, frequency, start_date, end_date', [
+    ('one_time', None, date(2024, 5, 10), None),
+    ('one_time', None, date(2023, 5, 10), None),
+    ('recurring', None, date(2024, 2, 20), date(2024, 7, 4)),
+    ('recurring', {'value': 1, 'unit': 'months'}, date(2024, 1, 31), None),
+    ('recurring', {'value': 2, 'unit': 'weeks'}, date(2023, 12, 1), None),
+])
+def test_bill_occurrences_match_reference(
+    type_: str,
+    frequency: dict | None,
+    start_date: date,
+    end_date: date | None,
+) -> None:
+    bill = Bill(
+        amount=-100.0,
+        type=type_,
+        frequency=frequency,
+        start_date=start_date,
+        end_date=end_date,
+        change_schedule=CHANGE_SCHEDULE,
+    )
+
+    assert list(bill.get_occurrences(START, END)) \
+        == _get_reference_occurrences(bill)
+
+
+@pytest.mark.parametrize('frequency, start_date', [
+    (None, date(2024, 5, 10)),
+    ({'value': 1, 'unit': 'months'}, date(2024, 1, 15)),
+    ({'value': 1, 'unit': 'years'}, date(2022, 7, 1)),
+])
+def test_income_occurrences_match_reference(
+    frequency: dict | None,
+    start_date: date,
+) -> None:
+    income = Income(
+        amount=1_000.0,
+        frequency=frequency,
+        start_date=start_date,
+        end_date=None,
+        raise_schedule=CHANGE_SCHEDULE,
+    )
+
+    assert list(income.get_occurrences(START, END)) \
+        == _get_reference_occurrences(income)
@@ -0,0 +1,145 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.balance import get_daily_projected_balances, get_projected_balance
+from app.core.dates import date_range
+from app.models import Account, Balance, Bill, Income, Transaction, Transfer
+
+
+START, END = date(2031, 1, 1), date(2031, 12, 31)
+
+
+@pytest.fixture
+def accounts(db: Session) -> list[Account]:
+    """
+    Checking, savings, and credit card Accounts with Bills, Incomes,
+    Transfers (including a credit card payoff), Transactions, and a
+    Balance in the middle of the projection.
+    """
+
+    checking = Account(name='Projected Checking', type='checking')
+    savings = Account(name='Projected Savings', type='savings')
+    credit_card = Account(name='Projected Credit Card', type='credit')
+    db.add_all([checking, savings, credit_card])
+    db.flush()
+
+    db.add_all([
+        Balance(date=date(2030, 12, 1), balance=1_500.0, account_id=checking.id),
+        Balance(date=date(2030, 12, 1), balance=0.0, account_id=savings.id),
+        Balance(date=date(2030, 12, 1), balance=-120.0, account_id=credit_card.id),
+        # A real Balance overrides the projection from its date
+        Balance(date=date(2031, 6, 15), balance=2_000.0, account_id=checking.id),
+        Transaction(
+            date=date(2030, 12, 20),
+            description='Groceries',
+            amount=-85.55,
+            account_id=checking.id,
+        ),
+        Transaction(
+            date=date(2030, 12, 31),
+            description='Interest',
+            amount=0.42,
+            account_id=savings.id,
+        ),
+        Transaction(
+            date=date(2030, 12, 12),
+            description='Coffee',
+            amount=-4.75,
+            account_id=credit_card.id,
+        ),
+        Bill(
+            name='Rent',
+            description='Rent',
+            amount=-950.0,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2030, 1, 31),
+            account_id=checking.id,
+            change_schedule=[{
+                'type': 'raise',
+                'amount': -50.0,
+                'is_percentage': False,
+                'start_date': date(2031, 7, 1),
+                'end_date': None,
+                'frequency': None,
+            }],
+        ),
+        Bill(
+            name='Vacation',
+            description='Vacation',
+            amount=-1_200.0,
+            type='one_time',
+            start_date=date(2031, 8, 3),
+            account_id=checking.id,
+        ),
+        Bill(
+            name='Streaming',
+            description='Streaming',
+            amount=-14.99,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2029, 5, 10),
+            account_id=credit_card.id,
+        ),
+        Bill(
+            name='Gas',
+            description='Gas',
+            amount=-42.5,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'weeks'},
+            start_date=date(2030, 11, 4),
+            account_id=credit_card.id,
+        ),
+        Income(
+            name='Salary',
+            amount=1_850.0,
+            frequency={'value': 2, 'unit': 'weeks'},
+            start_date=date(2030, 1, 3),
+            account_id=checking.id,
+            raise_schedule=[],
+        ),
+        Transfer(
+            name='Card Payoff',
+            amount=0.0,
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2030, 1, 25),
+            end_date=None,
+            payoff_balance=True,
+            from_account_id=checking.id,
+            to_account_id=credit_card.id,
+        ),
+        Transfer(
+            name='Savings',
+            amount=200.0,
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2030, 1, 1),
+            end_date=None,
+            payoff_balance=False,
+            from_account_id=checking.id,
+            to_account_id=savings.id,
+        ),
+    ])
+    db.commit()
+
+    return [checking, savings, credit_card]
+
+
+def test_daily_projection_matches_reference(
+    accounts: list[Account],
+    db: Session,
+) -> None:
+    for account in accounts:
+        dates, balances = get_daily_projected_balances(
+            account.id, START, END, db
+        )
+        reference = list(get_projected_balance(
+            account.id, list(date_range(START, END)), db
+        ))
+
+        assert dates.astype(object).tolist() \
+            == [date_ for date_, _ in reference]
+        assert balances.tolist() == pytest.approx(
+            [balance for _, balance in reference], abs=0.005
+        )
@@ -0,0 +1,127 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import Select, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Balance, Bill, Transaction, Upload
+from app.models.transaction import TransactionRelationship
+
+
+def _get_query_plan(statement: Select, db: Session) -> list[str]:
+    """Get the detail of each step of SQLite's plan for a statement."""
+
+    sql = statement.compile(
+        db.get_bind(), compile_kwargs={'literal_binds': True}
+    )
+
+    return [
+        row.detail
+        for row in db.execute(text(f'EXPLAIN QUERY PLAN {sql}'))
+    ]
+
+
+@pytest.mark.parametrize('statement, table, index', [
+    # Transactions of an Account between two dates
+    (
+        select(Transaction)
+            .where(
+                Transaction.account_id == 1,
+                Transaction.date >= date(2024, 1, 1),
+                Transaction.date <= date(2024, 12, 31),
+            )
+            .order_by(Transaction.date),
+        'transactions',
+        'ix_transactions_account_id_date_amount',
+    ),
+    # Transactions of a Bill (and likewise of the other models)
+    (
+        select(Transaction)
+            .where(Transaction.bill_id == 1)
+            .order_by(Transaction.date.desc()),
+        'transactions',
+        'ix_transactions_bill_id_date',
+    ),
+    (
+        select(Transaction)
+            .where(Transaction.expense_id == 1)
+            .order_by(Transaction.date.desc()),
+        'transactions',
+        'ix_transactions_expense_id_date',
+    ),
+    (
+        select(Transaction)
+            .where(Transaction.income_id == 1)
+            .order_by(Transaction.date.desc()),
+        'transactions',
+        'ix_transactions_income_id_date',
+    ),
+    (
+        select(Transaction)
+            .where(Transaction.transfer_id == 1)
+            .order_by(Transaction.date.desc()),
+        'transactions',
+        'ix_transactions_transfer_id_date',
+    ),
+    # Transactions of an Upload
+    (
+        select(Transaction.id).where(Transaction.upload_id == 1),
+        'transactions',
+        'ix_transactions_upload_id',
+    ),
+    # Transactions already synced from Plaid
+    (
+        select(Transaction.id)
+            .where(Transaction.plaid_transaction_id == 'plaid-id'),
+        'transactions',
+        'ix_transactions_plaid_transaction_id',
+    ),
+    # Reverse lookups of related Transactions
+    (
+        select(TransactionRelationship)
+            .where(TransactionRelationship.related_transaction_id == 1),
+        'transaction_relationships',
+        'ix_transaction_relationships_related_transaction_id',
+    ),
+    # An already ingested Upload of the same data
+    (
+        select(Upload)
+            .where(
+                Upload.sha256 == '0' * 64,
+                Upload.account_id == 1,
+                Upload.ingest_date.is_not(None),
+            )
+            .limit(1),
+        'uploads',
+        'ix_uploads_sha256',
+    ),
+    # Bills of an Account
+    (
+        select(Bill).where(Bill.account_id == 1),
+        'bills',
+        'ix_bills_account_id',
+    ),
+    # Balances of an Account up to a date
+    (
+        select(Balance)
+            .where(Balance.account_id == 1, Balance.date <= date(2024, 6, 1))
+            .order_by(Balance.date.desc()),
+        'balances',
+        'ix_balances_account_id_date',
+    ),
+])
+def test_query_searches_index(
+    statement: Select,
+    table: str,
+    index: str,
+    db: Session,
+) -> None:
+    plan = _get_query_plan(statement, db)
+
+    assert not [step for step in plan if step.startswith(f'SCAN {table}')], plan
+    assert [
+        step
+        for step in plan
+        if step.startswith(f'SEARCH {table} USING ')
+        and f'INDEX {index} ' in step
+    ], plan
@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1 import bills
+from app.models import Account, Balance, Bill
+
+
+@pytest.fixture
+def bill(db: Session) -> Bill:
+    """A Bill with Transaction filters."""
+
+    account = Account(name='Rules Checking', type='checking')
+    db.add(account)
+    db.flush()
+    db.add(Balance(date=date(2024, 1, 1), balance=500.0, account_id=account.id))
+
+    bill = Bill(
+        name='Internet',
+        description='Internet',
+        amount=-60.0,
+        type='recurring',
+        frequency={'value': 1, 'unit': 'months'},
+        start_date=date(2024, 1, 5),
+        account_id=account.id,
+        transaction_filters=[[
+            {'on': 'description', 'type': 'contains', 'value': 'Fiber'},
+        ]],
+    )
+    db.add(bill)
+    db.commit()
+
+    return bill
+
+
+@pytest.mark.parametrize('update, applies_rules', [
+    ({'amount': -65.0}, False),
+    ({'name': 'Home Internet', 'description': 'Fiber internet'}, False),
+    ({'start_date': '2024-02-05'}, True),
+    (
+        {'transaction_filters': [[
+            {'on': 'description', 'type': 'contains', 'value': 'Broadband'},
+        ]]},
+        True,
+    ),
+])
+def test_patch_only_applies_rules_when_they_change(
+    update: dict,
+    applies_rules: bool,
+    bill: Bill,
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    applied = []
+    monkeypatch.setattr(
+        bills,
+        'apply_transaction_rules',
+        lambda db, items: applied.append([item.id for item in items]),
+    )
+
+    response = client.patch(f'/api/v1/bills/bill/{bill.id}', json=update)
+
+    assert response.status_code == 200
+    assert applied == ([[bill.id]] if applies_rules else [])
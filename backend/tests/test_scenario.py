@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.balance import get_daily_projected_balances
+from app.core.scenario import simulate_balances
+from app.models import Account, Balance, Bill, Income
+from app.schemas.balance import NewScenarioSchema
+
+
+BALANCE_DATE = date(2032, 1, 1)
+
+
+@pytest.fixture
+def account(db: Session) -> Account:
+    """An Account with a Balance on `BALANCE_DATE`, a Bill, and an Income."""
+
+    account = Account(name='Scenario Checking', type='checking')
+    db.add(account)
+    db.flush()
+
+    db.add_all([
+        Balance(date=BALANCE_DATE, balance=2_500.0, account_id=account.id),
+        Bill(
+            name='Rent',
+            description='Rent',
+            amount=-950.0,
+            type='recurring',
+            frequency={'value': 1, 'unit': 'months'},
+            start_date=date(2031, 1, 1),
+            account_id=account.id,
+        ),
+        Income(
+            name='Salary',
+            amount=1_850.0,
+            frequency={'value': 2, 'unit': 'weeks'},
+            start_date=date(2031, 1, 2),
+            account_id=account.id,
+            raise_schedule=[],
+        ),
+    ])
+    db.commit()
+
+    return account
+
+
+@pytest.mark.parametrize('start_date, end_date, workers', [
+    (BALANCE_DATE, BALANCE_DATE, 1),
+    (BALANCE_DATE, date(2038, 2, 28), 1),
+    (BALANCE_DATE, date(2038, 2, 28), 4),
+    (date(2032, 3, 15), date(2032, 3, 15), 1),
+    (date(2032, 3, 15), date(2033, 3, 14), 2),
+])
+def test_scenario_without_volatility_matches_projection(
+    account: Account,
+    start_date: date,
+    end_date: date,
+    workers: int,
+    db: Session,
+) -> None:
+    dates, percentiles = simulate_balances(
+        account.id,
+        NewScenarioSchema(
+            start_date=start_date,
+            end_date=end_date,
+            paths=10,
+            workers=workers,
+        ),
+        db,
+    )
+    expected_dates, expected = get_daily_projected_balances(
+        account.id, start_date, end_date, db
+    )
+
+    assert dates.tolist() == expected_dates.tolist()
+    assert percentiles.shape == (3, len(dates))
+    for balances in percentiles:
+        assert balances.tolist() == pytest.approx(expected.tolist(), abs=0.005)
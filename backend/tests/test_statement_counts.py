@@ -0,0 +1,148 @@
+from datetime import date, datetime, timedelta
+from typing import Callable, ContextManager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.upload import add_transactions_to_database
+from app.models import Account, Balance, Bill, Transaction, Upload
+from app.schemas.transaction import NewTransactionSchema
+
+
+# Maximum number of statements each request may execute, for any number
+# of Transactions
+_MAX_STATEMENTS = {
+    'all': 9,
+    'filters': 9,
+    'ingest': 18,
+}
+
+# Numbers of Transactions each request is checked with
+_ROW_COUNTS = (5, 150)
+
+
+def _create_account(count: int, db: Session) -> tuple[Account, Bill]:
+    """
+    Create an Account with a Balance and a Bill, and `count` Transactions
+    of the Bill, each related to the one before it.
+    """
+
+    account = Account(name=f'Counted Checking {count}', type='checking')
+    db.add(account)
+    db.flush()
+
+    bill = Bill(
+        name='Coffee',
+        description='Coffee',
+        amount=-4.5,
+        type='recurring',
+        frequency={'value': 1, 'unit': 'days'},
+        start_date=date(2020, 1, 1),
+        account_id=account.id,
+        transaction_filters=[[
+            {'on': 'description', 'type': 'contains', 'value': 'Coffee'},
+        ]],
+    )
+    db.add_all([
+        bill,
+        Balance(date=date(2019, 12, 31), balance=100.0, account_id=account.id),
+    ])
+    db.flush()
+
+    previous = None
+    for index in range(count):
+        transaction = Transaction(
+            date=date(2020, 1, 1) + timedelta(days=index),
+            description='Coffee',
+            amount=-4.5,
+            account_id=account.id,
+            bill_id=bill.id,
+        )
+        if previous is not None:
+            transaction.related_transactions.append(previous)
+        db.add(transaction)
+        previous = transaction
+    db.commit()
+
+    return account, bill
+
+
+@pytest.mark.parametrize('count', _ROW_COUNTS)
+def test_get_all_transactions_statements(
+    count: int,
+    client: TestClient,
+    count_statements: Callable[[], ContextManager[list[str]]],
+    db: Session,
+) -> None:
+    account_id = _create_account(count, db)[0].id
+
+    with count_statements() as statements:
+        response = client.get(
+            '/api/v1/transactions/all',
+            params={'account_ids': account_id, 'size': 100},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()['items']) == min(count, 100)
+    assert len(statements) <= _MAX_STATEMENTS['all'], statements
+
+
+@pytest.mark.parametrize('count', _ROW_COUNTS)
+def test_query_transactions_from_filters_statements(
+    count: int,
+    client: TestClient,
+    count_statements: Callable[[], ContextManager[list[str]]],
+    db: Session,
+) -> None:
+    _, bill = _create_account(count, db)
+    bill_id, filters = bill.id, bill.transaction_filters
+
+    with count_statements() as statements:
+        response = client.put(
+            '/api/v1/transactions/filters',
+            params={'id': bill_id, 'type': 'bill'},
+            json=filters,
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()) == count
+    assert len(statements) <= _MAX_STATEMENTS['filters'], statements
+
+
+@pytest.mark.parametrize('count', _ROW_COUNTS)
+def test_upload_ingest_statements(
+    count: int,
+    count_statements: Callable[[], ContextManager[list[str]]],
+    db: Session,
+) -> None:
+    account_id = _create_account(0, db)[0].id
+    upload = Upload(
+        filename='counted.csv',
+        upload_date=datetime.now(),
+        sha256=f'{count:064x}',
+        size=0,
+        account_id=account_id,
+    )
+    db.add(upload)
+    db.commit()
+    upload_id = upload.id
+
+    with count_statements() as statements:
+        transactions = add_transactions_to_database(
+            (
+                NewTransactionSchema(
+                    date=date(2021, 1, 1) + timedelta(days=index),
+                    description=f'Coffee {index}',
+                    amount=-4.5,
+                    account_id=account_id,
+                )
+                for index in range(count)
+            ),
+            db,
+            upload_id,
+        )
+
+    assert len(transactions) == count
+    assert all(transaction.bill_id is not None for transaction in transactions)
+    assert len(statements) <= _MAX_STATEMENTS['ingest'], statements
@@ -14,97 +14,37 @@ import { Card, CardContent } from "@/components/ui/card";
 
 import TransactionTable from '@/components/transactions/table';
 
-import { cn } from "@/lib/utils";
-import { getAllTransactions } from '@/lib/api/transactions';
+import { getTransactionsByCursor } from '@/lib/api/transactions';
 
-// Pagination controls component
-const PaginationControls = ({ currentPage, totalPages, onPageChange }) => {
-  // Show limited number of page buttons
-  const getPageNumbers = () => {
-    const maxButtonsToShow = 5; // Adjust this number as needed
-    
-    if (totalPages <= maxButtonsToShow) {
-      // If we have fewer pages than the max, show all
-      return Array.from({ length: totalPages }, (_, i) => i + 1);
-    }
-    
-    const leftSiblingIndex = Math.max(currentPage - 1, 1);
-    const rightSiblingIndex = Math.min(currentPage + 1, totalPages);
-    
-    const shouldShowLeftDots = leftSiblingIndex > 2;
-    const shouldShowRightDots = rightSiblingIndex < totalPages - 1;
-    
-    if (!shouldShowLeftDots && shouldShowRightDots) {
-      // Show first few pages
-      const leftRange = Array.from({ length: maxButtonsToShow - 1 }, (_, i) => i + 1);
-      return [...leftRange, '...', totalPages];
-    }
-    
-    if (shouldShowLeftDots && !shouldShowRightDots) {
-      // Show last few pages
-      const rightRange = Array.from(
-        { length: maxButtonsToShow - 1 }, 
-        (_, i) => totalPages - (maxButtonsToShow - 2) + i
-      );
-      return [1, '...', ...rightRange];
-    }
-    
-    if (shouldShowLeftDots && shouldShowRightDots) {
-      // Show pages around current page with dots on both sides
-      const middleRange = Array.from(
-        { length: rightSiblingIndex - leftSiblingIndex + 1 },
-        (_, i) => leftSiblingIndex + i
-      );
-      return [1, '...', ...middleRange, '...', totalPages];
-    }
-  };
-  
-  const pages = getPageNumbers();
-  
-  return (
-    <div className="flex items-center justify-center gap-2">
-      <Button
-        variant="outline"
-        size="sm"
-        onClick={() => onPageChange(currentPage - 1)}
-        disabled={currentPage <= 1}
-      >
-        Previous
-      </Button>
-      
-      {pages.map((pageNum, i) => (
-        pageNum === '...' ? (
-          <span key={`ellipsis-${i}`} className="px-2">...</span>
-        ) : (
-          <Button
-            key={pageNum}
-            variant={pageNum === currentPage ? "default" : "outline"}
-            size="sm"
-            onClick={() => onPageChange(pageNum)}
-            className={cn(
-              "min-w-[32px]",
-              pageNum === currentPage && "bg-primary text-primary-foreground"
-            )}
-          >
-            {pageNum}
-          </Button>
-        )
-      ))}
-      
-      <Button
-        variant="outline"
-        size="sm"
-        onClick={() => onPageChange(currentPage + 1)}
-        disabled={currentPage >= totalPages}
-      >
-        Next
-      </Button>
-    </div>
-  );
-};
+// Pagination controls component. Pages are fetched by cursor, so only the
+// previous and next pages can be navigated to.
+const PaginationControls = ({ currentPage, hasNextPage, onPrevious, onNext }) => (
+  <div className="flex items-center justify-center gap-2">
+    <Button
+      variant="outline"
+      size="sm"
+      onClick={onPrevious}
+      disabled={currentPage <= 1}
+    >
+      Previous
+    </Button>
+    <span className="px-2 text-sm text-muted-foreground">
+      Page {currentPage}
+    </span>
+    <Button
+      variant="outline"
+      size="sm"
+      onClick={onNext}
+      disabled={!hasNextPage}
+    >
+      Next
+    </Button>
+  </div>
+);
 
 export default function TransactionsPage() {
-  const [page, setPage] = useState(1);
+  // The cursor of each page up to the current one (the first has none)
+  const [cursors, setCursors] = useState([null]);
   const [pageSize, setPageSize] = useState(25);
   const [searchTerm, setSearchTerm] = useState('');
   const [showUncategorizedOnly, setShowUncategorizedOnly] = useState(false);
@@ -117,12 +57,11 @@ export default function TransactionsPage() {
     error,
     isPreviousData
   } = useQuery({
-    queryKey: ['transactions', { page, pageSize, searchTerm, showUncategorizedOnly, selectedAccounts }],
-    queryFn: () => getAllTransactions(
-      page, 
-      pageSize, 
-      null, 
-      searchTerm, 
+    queryKey: ['transactions', { cursor: cursors.at(-1), pageSize, searchTerm, showUncategorizedOnly, selectedAccounts }],
+    queryFn: () => getTransactionsByCursor(
+      cursors.at(-1),
+      pageSize,
+      searchTerm,
       showUncategorizedOnly,
       selectedAccounts.length > 0 ? selectedAccounts : null
     ),
@@ -138,25 +77,33 @@ export default function TransactionsPage() {
       setSearchTerm(value);
       setSelectedAccounts(accounts);
       // Reset to page 1 when search or filters change
-      if (page !== 1) {
-        setPage(1);
-      }
+      setCursors([null]);
     }
   };
 
   const handleUncategorizedChange = (value) => {
     setShowUncategorizedOnly(value);
     // Reset to page 1 when filter changes
-    if (page !== 1) {
-      setPage(1);
-    }
+    setCursors([null]);
     // Invalidate and refetch the query
     queryClient.invalidateQueries(['transactions']);
   };
 
   const handlePageSizeChange = (value) => {
     setPageSize(Number(value));
-    setPage(1); // Reset to first page when changing page size
+    setCursors([null]); // Reset to first page when changing page size
+  };
+
+  const handleNextPage = () => {
+    if (data?.next_cursor) {
+      setCursors([...cursors, data.next_cursor]);
+    }
+  };
+
+  const handlePreviousPage = () => {
+    if (cursors.length > 1) {
+      setCursors(cursors.slice(0, -1));
+    }
   };
 
   if (error) {
@@ -181,7 +128,7 @@ export default function TransactionsPage() {
             showUncategorizedOnly={showUncategorizedOnly}
             onUncategorizedChange={handleUncategorizedChange}
           />
-          {(data?.pages > 1) && (
+          {(cursors.length > 1 || data?.next_cursor) && (
             <div className="mt-4 flex items-center justify-center gap-4">
               <div className="flex items-center gap-2">
                 <span className="text-sm text-muted-foreground">Items per page:</span>
@@ -201,9 +148,10 @@ export default function TransactionsPage() {
                 </Select>
               </div>
               <PaginationControls
-                currentPage={page}
-                totalPages={data?.pages || 1}
-                onPageChange={setPage}
+                currentPage={cursors.length}
+                hasNextPage={Boolean(data?.next_cursor)}
+                onPrevious={handlePreviousPage}
+                onNext={handleNextPage}
               />
             </div>
           )}
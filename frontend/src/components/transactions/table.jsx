@@ -551,9 +551,9 @@ export default function TransactionTable({
                 onClick={async () => {
                   try {
                     setIsSyncing(true);
-                    const result = await syncAllAccountTransactions();
+                    const job = await syncAllAccountTransactions();
                     await queryClient.invalidateQueries(['transactions']);
-                    toast.success(`Successfully synced ${result.length} transactions`);
+                    toast.success(`Successfully synced ${job?.transaction_ids.length ?? 0} transactions`);
                   } catch (error) {
                     console.error('Failed to sync transactions:', error);
                     toast.error('Failed to sync transactions');
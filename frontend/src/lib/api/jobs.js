@@ -0,0 +1,44 @@
+import { api } from '@/lib/api';
+
+import { ReturnJobSchema } from './types';
+
+
+/**
+ * Fetches a background job by ID
+ * @param {number} jobId The ID of the job to fetch
+ * @returns {Promise<ReturnJobSchema>} The job data
+ * @throws {Error} If the API request fails
+ */
+export const getJob = async (jobId) => {
+  try {
+    const { data } = await api.get(`/jobs/job/${jobId}`);
+    return data;
+  } catch (error) {
+    console.error(error.response?.data?.detail || 'Error fetching job:', error);
+    throw error;
+  }
+}
+
+/**
+ * Polls a background job until it is complete
+ * @param {?ReturnJobSchema} job The job to wait for, or nothing if there was
+ * nothing to do (and no job was created)
+ * @param {number} interval The number of milliseconds between polls
+ * @returns {Promise<?ReturnJobSchema>} The completed job data, if any
+ * @throws {Error} If the job fails or the API request fails
+ */
+export const waitForJob = async (job, interval = 1000) => {
+  if (!job) {
+    return null;
+  }
+
+  while (job.status === 'pending' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, interval));
+    job = await getJob(job.id);
+  }
+
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Job failed');
+  }
+  return job;
+}
@@ -1,6 +1,9 @@
 import { api } from '@/lib/api';
+import { waitForJob } from '@/lib/api/jobs';
 import {
   NewSplitTransactionSchema,
+  ReturnJobSchema,
+  ReturnTransactionCursorPageSchema,
   ReturnTransactionSchema,
   ReturnTransactionSchemaNoAccount,
   ReturnTransactionSchemaPage,
@@ -51,6 +54,50 @@ export const getAllTransactions = async (
   }
 }
 
+/**
+ * Fetches a page of Transactions from the API, newest first. Each page is
+ * fetched from the cursor of the page before it, so every page is as fast to
+ * fetch as the first.
+ * @param {?string} cursor The next_cursor of the previous page, or null for
+ * the first page
+ * @param {number} size The number of items per page
+ * @param {?string} contains The string to filter transactions by
+ * @param {boolean} unassigned_only Whether to only fetch unassigned transactions
+ * @param {?Array<number>} account_ids Optional array of account IDs to filter by
+ * @returns {Promise<ReturnTransactionCursorPageSchema>} The page of transaction data
+ * @throws {Error} If the API request fails
+ */
+export const getTransactionsByCursor = async (
+  cursor = null,
+  size = 25,
+  contains = null,
+  unassigned_only = false,
+  account_ids = null,
+) => {
+  try {
+    const params = new URLSearchParams({ size, unassigned_only });
+    if (cursor) {
+      params.append('cursor', cursor);
+    }
+    if (contains) {
+      params.append('contains', contains);
+    }
+
+    // Add account_ids as repeated parameters if they exist
+    if (account_ids && account_ids.length > 0) {
+      account_ids.forEach(id => {
+        params.append('account_ids', id);
+      });
+    }
+
+    const { data } = await api.get(`/transactions/all/cursor`, { params });
+    return data;
+  } catch (error) {
+    console.error(error.response?.data?.detail || 'Error fetching transactions:', error);
+    throw error;
+  }
+}
+
 /**
  * Applies all filters to all transactions
  * @returns {Promise<void>}
@@ -267,13 +314,13 @@ export const getAccountBillBreakdown = async (accountId, startDate, endDate) =>
 /**
  * Syncs Transactions for an account
  * @param {number} accountId The ID of the account to sync transactions for
- * @returns {Promise<ReturnTransactionSchema[]>} Array of transaction data
+ * @returns {Promise<ReturnJobSchema>} The completed sync job
  * @throws {Error} If the API request fails
  */
 export const syncAccountTransactions = async (accountId) => {
   try {
     const response = await api.post(`/transactions/account/${accountId}/sync`);
-    return response.data;
+    return await waitForJob(response.data);
   } catch (error) {
     console.error(error.response?.data?.detail || 'Error syncing account transactions:', error);
     throw error;
@@ -282,13 +329,13 @@ export const syncAccountTransactions = async (accountId) => {
 
 /**
  * Syncs all Transactions for all accounts
- * @returns {Promise<ReturnTransactionSchema[]>} Array of transaction data
+ * @returns {Promise<?ReturnJobSchema>} The completed sync job, if any Accounts were synced
  * @throws {Error} If the API request fails
  */
 export const syncAllAccountTransactions = async () => {
   try {
     const response = await api.post(`/transactions/sync`);
-    return response.data;
+    return await waitForJob(response.data);
   } catch (error) {
     console.error(error.response?.data?.detail || 'Error syncing all account transactions:', error);
     throw error;
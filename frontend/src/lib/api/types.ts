@@ -233,7 +233,26 @@ export interface ReturnTransactionSchemaPage extends Pagination {
   items: ReturnTransactionSchema[];
 }
 
+export interface ReturnTransactionCursorPageSchema {
+  items: ReturnTransactionSchema[];
+  next_cursor: string | null;
+  total?: number | null;
+}
+
 export interface NewSplitTransactionSchema {
   amount: number;
   note: string;
 }
+
+export interface ReturnJobSchema {
+  id: number;
+  type: "upload" | "plaid_sync";
+  status: "pending" | "running" | "complete" | "failed";
+  progress: number;
+  total: number | null;
+  transaction_ids: number[];
+  error: string | null;
+  create_date: string;
+  start_date: string | null;
+  end_date: string | null;
+}
@@ -1,14 +1,15 @@
 import { api } from '@/lib/api';
+import { waitForJob } from '@/lib/api/jobs';
 
-import { ReturnTransactionSchema } from './types';
+import { ReturnJobSchema } from './types';
 
 
 /**
- * Uploads transactions to the API
+ * Uploads transactions to the API, and waits for them to be processed
  * @param {string} type - The type of transactions to upload
  * @param {File[]} files - The files to upload
  * @param {number} accountId - The ID of the account to upload the transactions to
- * @returns {Promise<ReturnTransactionSchema[]>} Array of transaction data
+ * @returns {Promise<?ReturnJobSchema>} The completed upload job, if any files were not already uploaded
  * @throws {Error} If the API request fails
  */
 export const uploadTransactions = async (type, files, accountId) => {
@@ -47,7 +48,7 @@ export const uploadTransactions = async (type, files, accountId) => {
         'Content-Type': 'multipart/form-data',
       },
     });
-    return response.data;
+    return await waitForJob(response.data);
   } catch (error) {
     console.error(error.response?.data?.detail || 'Error uploading Transactions:', error);
     throw error;